@@ -51,7 +51,12 @@ class ConfigAdapter(ConfigPort):
 
     def get(self, key, default=None):
         " Devuelve el valor de la clave, o un valor por defecto si no existe. "
-        return getattr(self.config, key, default)
+        if hasattr(self.config, key):
+            return getattr(self.config, key)
+        # Claves de config.json (p.ej. "ALLOW_PATH_REVERSAL") no expuestas como propiedad
+        if hasattr(self.config, 'get'):
+            return self.config.get(key, default)
+        return default
 
     def get_debug_flag(self, name: str) -> bool:
         """Devuelve el flag de debug para un componente dado."""
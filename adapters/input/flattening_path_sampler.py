@@ -0,0 +1,74 @@
+"""
+FlatteningPathSampler: Flattening of SVG paths with a guaranteed maximum chord deviation.
+
+- tolerance: maximum distance between the curve and its polyline (SVG units; mm after for_scale)
+- step: chord length used only for segment types without an analytic bound
+- Lines are emitted as a single chord.
+- Quadratic and cubic Beziers use Wang's formula on the control polygon:
+  n = ceil(sqrt(d(d-1)/8 * max|P[i] - 2P[i+1] + P[i+2]| / tolerance)).
+- Elliptical arcs use the same second-derivative bound: n = ceil(|delta| * sqrt(max(rx, ry) / (8 tolerance))).
+- The t values are uniform per segment, so sampling reuses PathSampler's bulk evaluation.
+
+Usage example:
+    sampler = FlatteningPathSampler(tolerance=0.05, step=0.3).for_scale(scale)
+    buffer, offsets = sampler.sample_many(paths)
+"""
+import numpy as np
+from svgpathtools import Line, QuadraticBezier, CubicBezier, Arc
+from adapters.input.path_sampler import PathSampler
+from domain.geometry.segment_evaluator import SegmentEvaluator
+from domain.ports.logger_port import LoggerPort
+
+
+class FlatteningPathSampler(PathSampler):
+    """Samples the minimum uniform number of points per segment that keeps the chord error below tolerance."""
+
+    def __init__(self, tolerance: float, step: float, logger: LoggerPort = None):
+        if tolerance <= 0:
+            raise ValueError("tolerance must be positive")
+        super().__init__(step, logger=logger)
+        self.tolerance = tolerance
+
+    def _segment_counts(self, segments) -> np.ndarray:
+        """Number of chords per segment so that the deviation stays below tolerance."""
+        n = np.ones(len(segments), dtype=np.int64)
+        quadratic, cubic, arcs, other = [], [], [], []
+        for i, seg in enumerate(segments):
+            kind = type(seg)
+            if kind is Line:
+                continue
+            if kind is QuadraticBezier:
+                quadratic.append(i)
+            elif kind is CubicBezier:
+                cubic.append(i)
+            elif kind is Arc:
+                arcs.append(i)
+            else:
+                other.append(i)
+        if quadratic:
+            p = np.array([(segments[i].start, segments[i].control, segments[i].end) for i in quadratic], dtype=complex)
+            second = np.abs(p[:, 0] - 2 * p[:, 1] + p[:, 2])
+            n[quadratic] = self._chords(2 * 1 / 8 * second)
+        if cubic:
+            p = np.array([(segments[i].start, segments[i].control1, segments[i].control2, segments[i].end)
+                          for i in cubic], dtype=complex)
+            second = np.maximum(np.abs(p[:, 0] - 2 * p[:, 1] + p[:, 2]), np.abs(p[:, 1] - 2 * p[:, 2] + p[:, 3]))
+            n[cubic] = self._chords(3 * 2 / 8 * second)
+        if arcs:
+            radius = np.array([max(segments[i].radius.real, segments[i].radius.imag) for i in arcs])
+            delta = np.radians([segments[i].delta for i in arcs])
+            n[arcs] = self._chords(delta * delta * radius / 8)
+        if other:
+            lengths = SegmentEvaluator.lengths([segments[i] for i in other])
+            n[other] = np.maximum(1, np.ceil(lengths / self.step).astype(np.int64))
+        return n
+
+    def _chords(self, bound: np.ndarray) -> np.ndarray:
+        """Smallest n with bound / n² <= tolerance (at least 1)."""
+        return np.maximum(1, np.ceil(np.sqrt(bound / self.tolerance)).astype(np.int64))
+
+    def for_scale(self, scale: float) -> "FlatteningPathSampler":
+        """Return a sampler whose tolerance and step, measured after scaling by `scale`, equal these ones."""
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        return FlatteningPathSampler(self.tolerance / scale, self.step / scale, logger=self.logger)
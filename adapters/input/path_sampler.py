@@ -3,6 +3,11 @@ PathSampler: Utility to sample points along SVG paths at fixed intervals.
 
 - step: distance between sampled points (SVG units)
 - sample(path): receives a list of SVG segments and produces (x, y) tuples at regular intervals.
+- sample_array(path) / sample_many(paths): same samples as NumPy buffers, evaluated in bulk
+  (one (N, 2) array per path, or one concatenated buffer plus offsets for a whole job).
+- sample_buffer(paths): the sample_many result wrapped in a StrokeBuffer (one stroke per path).
+- for_scale(scale): returns a sampler whose step, measured after scaling by `scale`, equals this step
+  (e.g. step in mm at machine resolution for a drawing scaled from SVG units to mm).
 - Raises ValueError if step <= 0.
 
 Usage example:
@@ -10,9 +15,10 @@ Usage example:
     for x, y in sampler.sample(path):
         print(x, y)
 """
-import math
 import numpy as np
+from domain.geometry.segment_evaluator import SegmentEvaluator
 from domain.entities.point import Point
+from domain.entities.stroke_buffer import StrokeBuffer
 from domain.ports.path_sampler_port import PathSamplerPort
 from domain.ports.logger_port import LoggerPort
 
@@ -33,9 +39,55 @@ class PathSampler(PathSamplerPort):
         Yields:
             Point: Sampled (x, y) coordinates.
         """
-        for seg in path:
-            seg_len = seg.length()
-            n = max(1, int(math.ceil(seg_len / self.step)))
-            for t in np.linspace(0, 1, n + 1):
-                z = seg.point(t)
-                yield Point(z.real, z.imag)
+        for x, y in self.sample_array(path).tolist():
+            yield Point(x, y)
+
+    def sample_array(self, path) -> np.ndarray:
+        """Return the sampled points of one path as an (N, 2) float array.
+        Each segment contributes ceil(length / step) + 1 evenly spaced t values (both ends included),
+        evaluated in bulk by SegmentEvaluator.
+        """
+        buffer, _ = self.sample_many([path])
+        return buffer
+
+    def sample_many(self, paths):
+        """Sample several paths at once.
+        Returns:
+            (buffer, offsets): (M, 2) float array with every sampled point and an int array of
+            len(paths) + 1 offsets, so path i is buffer[offsets[i]:offsets[i + 1]].
+        """
+        segments, seg_counts = [], []
+        for path in paths:
+            path_segments = list(path)
+            segments.extend(path_segments)
+            seg_counts.append(len(path_segments))
+        if not segments:
+            return np.empty((0, 2)), np.zeros(len(seg_counts) + 1, dtype=np.int64)
+        n = self._segment_counts(segments)
+        counts = n + 1
+        seg_index = np.repeat(np.arange(len(segments)), counts)
+        first = np.cumsum(counts) - counts
+        local = np.arange(int(counts.sum())) - np.repeat(first, counts)
+        # Igual que np.linspace(0, 1, n + 1) por segmento
+        ts = local * np.repeat(1.0 / n, counts)
+        ts[first + n] = 1.0
+        buffer = SegmentEvaluator.evaluate(segments, seg_index, ts)
+        seg_offsets = np.concatenate(([0], np.cumsum(counts)))
+        offsets = seg_offsets[np.concatenate(([0], np.cumsum(seg_counts)))]
+        return buffer, offsets
+
+    def sample_buffer(self, paths) -> StrokeBuffer:
+        """Sample several paths into a StrokeBuffer (stroke i holds the samples of paths[i])."""
+        buffer, offsets = self.sample_many(paths)
+        return StrokeBuffer(buffer, offsets)
+
+    def _segment_counts(self, segments) -> np.ndarray:
+        """Number of chords per segment: ceil(length / step), at least 1."""
+        lengths = SegmentEvaluator.lengths(segments)
+        return np.maximum(1, np.ceil(lengths / self.step).astype(np.int64))
+
+    def for_scale(self, scale: float) -> "PathSampler":
+        """Return a sampler with the step expressed in SVG units for a drawing scaled by `scale`."""
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        return PathSampler(self.step / scale, logger=self.logger)
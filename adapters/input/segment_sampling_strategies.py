@@ -14,6 +14,8 @@ Todas retornan una lista de Point.
 import numpy as np
 from svgpathtools import Line, CubicBezier, QuadraticBezier, Arc
 from domain.models import Point
+from domain.geometry.segment_curvature import SegmentCurvature
+from domain.geometry.segment_evaluator import SegmentEvaluator
 from typing import List
 
 
@@ -23,30 +25,32 @@ def sample_line(line: Line) -> List[Point]:
 
 
 def sample_bezier(bezier, max_segment_length: float, curvature_factor: float) -> List[Point]:
-    """Muestreo adaptativo para curvas de Bezier basado en curvatura local."""
-    points = []
+    """
+    Muestreo adaptativo para curvas de Bezier basado en curvatura local.
+    La curvatura de todos los tramos se obtiene en una sola llamada vectorizada (SegmentCurvature).
+    """
     length = bezier.length()
     n_segments = max(int(length / max_segment_length), 2)
     ts = np.linspace(0, 1, n_segments + 1)
-    initial_points = [bezier.point(t) for t in ts]
-    points.append(Point(initial_points[0].real, initial_points[0].imag))
-    for i in range(len(initial_points) - 1):
-        p1 = initial_points[i]
-        p2 = initial_points[i + 1]
-        t_mid = (ts[i] + ts[i + 1]) / 2
-        curvature = estimate_curvature(bezier, t_mid)
-        segment_length = abs(p2 - p1)
-        density = max(1, int(curvature * segment_length * curvature_factor))
-        if density > 1:
-            sub_ts = np.linspace(ts[i], ts[i + 1], density + 1)[1:-1]
-            for t in sub_ts:
-                pt = bezier.point(t)
-                points.append(Point(pt.real, pt.imag))
-        if i < len(initial_points) - 2:
-            points.append(Point(p2.real, p2.imag))
-    last = initial_points[-1]
-    points.append(Point(last.real, last.imag))
-    return points
+    initial_points = _evaluate(bezier, ts)
+    t_mid = (ts[:-1] + ts[1:]) / 2
+    curvature = SegmentCurvature.curvature(bezier, t_mid)
+    segment_length = np.abs(np.diff(initial_points))
+    density = np.maximum(1, (curvature * segment_length * curvature_factor).astype(np.int64))
+    # Parámetros finales: extremos de cada tramo más las subdivisiones internas según densidad
+    all_ts = [ts[:1]]
+    for i, d in enumerate(density.tolist()):
+        if d > 1:
+            all_ts.append(np.linspace(ts[i], ts[i + 1], d + 1)[1:-1])
+        all_ts.append(ts[i + 1:i + 2])
+    values = _evaluate(bezier, np.concatenate(all_ts))
+    return [Point(z.real, z.imag) for z in values.tolist()]
+
+
+def _evaluate(segment, ts: np.ndarray) -> np.ndarray:
+    " Evalúa el segmento en todos los ts a la vez (array complejo). "
+    xy = SegmentEvaluator.evaluate([segment], np.zeros(len(ts), dtype=np.int64), ts)
+    return xy[:, 0] + 1j * xy[:, 1]
 
 
 def sample_arc(arc: Arc, min_segment_length: float) -> List[Point]:
@@ -67,20 +71,5 @@ def sample_uniform(segment, num_points: int) -> List[Point]:
 
 
 def estimate_curvature(curve, t: float) -> float:
-    """Estimación numérica de la curvatura local en t para Bezier/curvas SVG."""
-    dt = 1e-6
-    t1 = max(0, t - dt)
-    t2 = min(1, t + dt)
-    p0 = curve.point(t1)
-    p2 = curve.point(t2)
-    d1 = (p2 - p0) / (t2 - t1)
-    p0 = curve.point(max(0, t - 2*dt))
-    p1 = curve.point(t)
-    p2 = curve.point(min(1, t + 2*dt))
-    d2_approx = (p0 - 2*p1 + p2) / (dt*dt)
-    d1_mag = abs(d1)
-    d2_mag = abs(d2_approx)
-    if d1_mag < 1e-10:
-        return 0
-    curvature = d2_mag / (1 + d1_mag**2)**1.5
-    return curvature
+    """Curvatura local en t para Bezier/curvas SVG, calculada analíticamente (SegmentCurvature)."""
+    return float(SegmentCurvature.curvature(curve, np.array([t]))[0])
@@ -0,0 +1,62 @@
+"""
+FeedProfilePlanner: calcula el feed de todos los segmentos de los trazos en una sola pasada NumPy.
+"""
+import numpy as np
+from domain.entities.stroke_buffer import StrokeBuffer
+
+
+class FeedProfilePlanner:
+    """
+    Versión vectorizada de CurvatureFeedCalculator con anticipación de un vértice.
+
+    - El feed de cada segmento es el mínimo entre el del vértice donde empieza y el del vértice donde
+      termina (el feed_fn por punto hacía lo mismo con dos llamadas a adjust_feed).
+    - La curvatura de un vértice es el ángulo de giro / 180°; los vértices con un segmento de longitud
+      menor a MIN_SEGMENT no tienen curvatura y usan el feed base (igual que calculate_curvature).
+    - El primer segmento de un trazo usa el feed base para su vértice inicial; el último no anticipa.
+    - El ajuste por curvatura es FeedRateStrategy.adjust_feeds(), con la misma semántica que adjust_feed().
+    """
+    MIN_SEGMENT = 1e-6
+
+    def __init__(self, feed_rate_strategy):
+        self.feed_rate_strategy = feed_rate_strategy
+
+    def plan(self, coords: np.ndarray) -> np.ndarray:
+        " Feeds de los len(coords) - 1 segmentos de un trazo (array (n, 2)). "
+        return self.plan_buffer(StrokeBuffer.from_arrays([coords]))[1:]
+
+    def plan_buffer(self, strokes: StrokeBuffer) -> np.ndarray:
+        """
+        Feeds de todos los segmentos del buffer: la posición p tiene el feed del segmento que termina
+        en el punto p; el primer punto de cada trazo queda en NaN.
+        """
+        coords, offsets = strokes.coords, strokes.offsets
+        n = len(coords)
+        feeds = np.full(n, np.nan)
+        if n < 2:
+            return feeds
+        nonempty = np.diff(offsets) > 0
+        starts = np.zeros(n, dtype=bool)
+        starts[offsets[:-1][nonempty]] = True
+        ends = np.zeros(n, dtype=bool)
+        ends[offsets[1:][nonempty] - 1] = True
+        vectors = np.diff(coords, axis=0)
+        lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        # Vértice en cada punto interior p (1..n-2), entre el segmento p-1 y el p
+        vertex = self._vertex_feeds(vectors[:-1], vectors[1:], lengths[:-1], lengths[1:])
+        interior = ~starts[1:-1] & ~ends[1:-1]
+        base = float(self.feed_rate_strategy.base_feed)
+        # Segmento s (punto s -> s+1): vértice inicial en s (base si no existe), final en s+1 (sin límite si no existe)
+        at_start = np.full(n - 1, base)
+        at_start[1:] = np.where(interior, vertex, base)
+        at_end = np.full(n - 1, np.inf)
+        at_end[:-1] = np.where(interior, vertex, np.inf)
+        feeds[1:] = np.where(starts[1:], np.nan, np.minimum(at_start, at_end))
+        return feeds
+
+    def _vertex_feeds(self, v1, v2, mag1, mag2) -> np.ndarray:
+        valid = (mag1 >= self.MIN_SEGMENT) & (mag2 >= self.MIN_SEGMENT)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dot = (v1[:, 0] * v2[:, 0] + v1[:, 1] * v2[:, 1]) / (mag1 * mag2)
+        curvature = np.degrees(np.arccos(np.clip(dot, -1.0, 1.0))) / 180
+        return self.feed_rate_strategy.adjust_feeds(np.where(valid, curvature, np.nan))
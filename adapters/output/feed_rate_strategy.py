@@ -2,6 +2,7 @@
 FeedRateStrategy: Encapsula la lógica de ajuste de velocidad (feed rate) según curvatura y tipo de herramienta.
 """
 from typing import Optional
+import numpy as np
 
 class FeedRateStrategy:
     def __init__(self, base_feed: float, curvature_factor: float = 1.0, min_feed_factor: float = 0.2):
@@ -22,3 +23,14 @@ class FeedRateStrategy:
             feed *= 0.8  # Ejemplo: los marcadores requieren menor velocidad
         # Se pueden agregar más reglas según el tipo de herramienta
         return feed
+
+    def adjust_feeds(self, curvatures: np.ndarray, tool_type: Optional[str] = None) -> np.ndarray:
+        """
+        Versión vectorizada de adjust_feed(): un feed por curvatura; NaN equivale a curvature None.
+        """
+        curvatures = np.asarray(curvatures, dtype=float)
+        factor = np.maximum(self.min_feed_factor, 1.0 - self.curvature_factor * curvatures)
+        feeds = np.where(np.isnan(curvatures), self.base_feed, self.base_feed * factor)
+        if tool_type == "marker":
+            feeds = feeds * 0.8
+        return feeds
@@ -1,72 +1,142 @@
 """
-GCodeBuilderHelper: Encapsula la lógica de construcción de comandos G-code a partir de listas de puntos y parámetros de movimiento.
+GCodeBuilderHelper: Encapsula la lógica de construcción de comandos G-code a partir de trazos de puntos y parámetros de movimiento.
 """
-from typing import List, Optional
+from typing import Iterator, List, Union
+import numpy as np
 from domain.entities.point import Point
+from domain.entities.stroke_buffer import StrokeBuffer
 from domain.gcode.gcode_command_builder import GCodeCommandBuilder
-from domain.gcode.commands.arc_command import RelativeMoveCommand
+from domain.gcode.gcode_serializer import GCodeSerializer
+from domain.gcode.pen_state_machine import PenStateMachine
 
 class GCodeBuilderHelper:
-    def __init__(self, cmd_down: str, cmd_up: str, dwell_ms: int):
+    # Comandos acumulados antes de serializar y entregar un bloque de líneas en iter_lines()
+    CHUNK_COMMANDS = 50000
+
+    def __init__(self, cmd_down: str, cmd_up: str, dwell_ms: int, serializer: GCodeSerializer = None,
+                 pen_drag_max_gap_mm: float = 0.0, pen_down_dwell_ms: float = None, pen_up_dwell_ms: float = None):
         self.cmd_down = cmd_down
         self.cmd_up = cmd_up
         self.dwell_ms = dwell_ms
+        # Pausas por transición: asentamiento tras bajar y despeje tras subir (None usa dwell_ms)
+        self.pen_down_dwell_ms = dwell_ms if pen_down_dwell_ms is None else pen_down_dwell_ms
+        self.pen_up_dwell_ms = dwell_ms if pen_up_dwell_ms is None else pen_up_dwell_ms
+        self.serializer = serializer
+        # Trazos que empiezan a esta distancia (mm) o menos del final del anterior se unen con un G1
+        # sin levantar la lapicera (PEN_DRAG_MAX_GAP_MM; 0 desactiva)
+        self.pen_drag_max_gap_mm = pen_drag_max_gap_mm
+
+    def build(self, all_points: Union[StrokeBuffer, List[List[Point]]], feed_fn, use_relative_moves: bool = False):
+        """
+        Construye el G-code de los trazos. all_points puede ser un StrokeBuffer o listas de Point.
+        Antes de calcular feeds, los puntos se ajustan a la grilla de salida (decimales del serializador)
+        y se descartan los consecutivos repetidos (StrokeBuffer.snapped): no se emiten G1 de longitud cero.
+        Con use_relative_moves los desplazamientos se calculan entre posiciones absolutas ya redondeadas
+        a los decimales de salida, de modo que el redondeo no se acumula a lo largo del trabajo.
+        La lapicera sigue un PenStateMachine: solo se emiten M3/M5 que cambian su estado, cada uno seguido
+        de su pausa (pen_down_dwell_ms / pen_up_dwell_ms); no hay pausas que no acompañen un cambio.
+        feed_fn es un planificador con plan_buffer() (FeedProfilePlanner, una pasada para todos los trazos)
+        o una función feed_fn(anterior, actual, siguiente, futuro) que se llama por segmento.
+        Devuelve (líneas, métricas); con pen_drag_max_gap_mm > 0 las métricas incluyen pen_lifts_avoided.
+        """
+        metrics = {}
+        lines = list(self.iter_lines(all_points, feed_fn, use_relative_moves=use_relative_moves, metrics=metrics))
+        return lines, metrics
 
-    def build(self, all_points: List[List[Point]], feed_fn, use_relative_moves: bool = False):
+    def iter_lines(self, all_points: Union[StrokeBuffer, List[List[Point]]], feed_fn,
+                   use_relative_moves: bool = False, metrics: dict = None) -> Iterator[str]:
+        """
+        Igual que build(), pero entrega las líneas a medida que se generan: cada CHUNK_COMMANDS comandos
+        el buffer del builder se serializa y se vacía, de modo que la memoria no crece con el trabajo.
+        Si se pasa `metrics`, se completa al agotar el iterador.
+        """
         import math
-        TOLERANCIA = 1e-4
         def diferentes(p1, p2):
-            dx = p1.x - p2.x
-            dy = p1.y - p2.y
-            return math.hypot(dx, dy) > TOLERANCIA
-        builder = GCodeCommandBuilder()
+            # Los puntos ya están sobre la grilla de salida: basta la comparación exacta
+            return p1.x != p2.x or p1.y != p2.y
+        builder = GCodeCommandBuilder(serializer=self.serializer)
+        scale = 10.0 ** builder.serializer.decimals
+        strokes = StrokeBuffer.from_point_lists(all_points).snapped(builder.serializer.decimals)
+        def delta(p_from, p_to):
+            # Diferencia entre posiciones cuantizadas: la suma de los deltas emitidos es exacta
+            return ((round(p_to.x * scale) - round(p_from.x * scale)) / scale,
+                    (round(p_to.y * scale) - round(p_from.y * scale)) / scale)
+        # El programa parte con la lapicera arriba (el primer G0 ya la supone así)
+        pen = PenStateMachine(self.cmd_down, self.cmd_up, self.pen_down_dwell_ms / 1000.0, self.pen_up_dwell_ms / 1000.0,
+                              state=PenStateMachine.UP)
         builder.move_to(0, 0, rapid=True)
-        builder.dwell(self.dwell_ms / 1000.0)
         last_pos = Point(0, 0)
-        for i, points in enumerate(all_points):
-            if not points:
+        pen_drags = 0
+        # Planificador vectorizado (FeedProfilePlanner): feeds de todos los trazos en una sola pasada
+        plan_buffer = getattr(feed_fn, "plan_buffer", None)
+        planned = plan_buffer(strokes) if plan_buffer is not None else None
+        bounds = strokes.offsets.tolist()
+        for index, stroke in enumerate(strokes):
+            coords = stroke.coords
+            n = len(coords)
+            if not n:
+                continue
+            first = Point(*coords[0].tolist())
+            gap = math.hypot(first.x - last_pos.x, first.y - last_pos.y)
+            if pen.is_down and self.pen_drag_max_gap_mm > 0 and gap <= self.pen_drag_max_gap_mm:
+                # Hueco corto: se arrastra la lapicera en lugar del ciclo subir/desplazar/bajar y sus pausas
+                if diferentes(last_pos, first):
+                    if use_relative_moves:
+                        builder.relative_move(*delta(last_pos, first), rapid=False)
+                    else:
+                        builder.move_to(first.x, first.y)
+                    last_pos = first
+                pen_drags += 1
+            else:
+                self._pen_up(builder, pen)
+                if diferentes(last_pos, first):
+                    if use_relative_moves:
+                        builder.relative_move(*delta(last_pos, first), rapid=True)
+                    else:
+                        builder.move_to(first.x, first.y, rapid=True)
+                    last_pos = first
+                self._pen_down(builder, pen)
+            if n < 2:
                 continue
-            dedup_points = [points[0]]
-            for j in range(1, len(points)):
-                if diferentes(points[j], points[j-1]):
-                    dedup_points.append(points[j])
-            points = dedup_points
-            if i > 0:
-                builder.dwell(self.dwell_ms / 1000.0)
-                builder.tool_up(self.cmd_up)
-                builder.dwell(self.dwell_ms / 1000.0)
-            if diferentes(last_pos, points[0]):
-                if use_relative_moves:
-                    dx = points[0].x - last_pos.x
-                    dy = points[0].y - last_pos.y
-                    builder.commands.append(RelativeMoveCommand(dx, dy, rapid=True))
-                else:
-                    builder.move_to(points[0].x, points[0].y, rapid=True)
-                last_pos = points[0]
-            builder.dwell(self.dwell_ms / 1000.0)
-            builder.tool_down(self.cmd_down)
-            builder.dwell(self.dwell_ms / 1000.0)
-            n = len(points)
-            last_feed = None
-            for j in range(1, n):
-                prev_pt = points[j-2] if j > 1 else None
-                curr_pt = points[j-1]
-                next_pt = points[j]
-                future_pt = points[j+1] if j+1 < n else None
-                feed = feed_fn(prev_pt, curr_pt, next_pt, future_pt)
-                # Incluir feed en el primer G1 del trazo o si cambia el valor
-                feed_to_use = feed if (j == 1 or feed != last_feed) else None
-                if use_relative_moves:
-                    dx = next_pt.x - curr_pt.x
-                    dy = next_pt.y - curr_pt.y
-                    builder.commands.append(RelativeMoveCommand(dx, dy, feed=feed_to_use, rapid=False))
-                else:
-                    builder.move_to(next_pt.x, next_pt.y, feed=feed_to_use, rapid=False)
-                last_feed = feed
-                last_pos = next_pt
-        builder.dwell(self.dwell_ms / 1000.0)
-        builder.tool_up(self.cmd_up)
-        builder.dwell(self.dwell_ms / 1000.0)
+            if planned is not None:
+                feeds = planned[bounds[index] + 1:bounds[index + 1]]
+            else:
+                points = [Point(x, y) for x, y in coords.tolist()]
+                feeds = np.array([
+                    feed_fn(points[j-2] if j > 1 else None, points[j-1], points[j], points[j+1] if j+1 < n else None)
+                    for j in range(1, n)
+                ], dtype=float)
+            # Incluir feed en el primer G1 del trazo o si cambia el valor
+            emit = np.empty(n - 1, dtype=bool)
+            emit[0] = True
+            emit[1:] = feeds[1:] != feeds[:-1]
+            if use_relative_moves:
+                steps = np.diff(np.rint(coords * scale), axis=0) / scale
+                builder.relative_moves(steps[:, 0], steps[:, 1], np.where(emit, feeds, np.nan))
+            else:
+                builder.moves_to(coords[1:, 0], coords[1:, 1], np.where(emit, feeds, np.nan))
+            last_pos = Point(*coords[-1].tolist())
+            if len(builder.buffer) >= self.CHUNK_COMMANDS:
+                yield from builder.drain_lines()
+        self._pen_up(builder, pen)
         builder.move_to(0, 0, rapid=True)
-        builder.commands.append(type('EndComment', (), {'to_gcode': lambda self: "(End)"})())
-        return builder.to_gcode_lines_with_metrics()
+        builder.raw(type('EndComment', (), {'to_gcode': lambda self: "(End)"})())
+        yield from builder.drain_lines()
+        if metrics is not None and self.pen_drag_max_gap_mm > 0:
+            metrics["pen_lifts_avoided"] = pen_drags
+
+    @staticmethod
+    def _pen_down(builder: GCodeCommandBuilder, pen: PenStateMachine):
+        transition = pen.down()
+        if transition:
+            builder.tool_down(transition[0])
+            if transition[1] > 0:
+                builder.dwell(transition[1])
+
+    @staticmethod
+    def _pen_up(builder: GCodeCommandBuilder, pen: PenStateMachine):
+        transition = pen.up()
+        if transition:
+            builder.tool_up(transition[0])
+            if transition[1] > 0:
+                builder.dwell(transition[1])
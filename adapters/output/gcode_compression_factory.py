@@ -11,4 +11,4 @@ class GcodeCompressionFactory:
         if hasattr(config, 'disable_gcode_compression') and config.disable_gcode_compression:
             return None
         i18n = getattr(config, 'i18n', None)
-        return create_gcode_compression_service(logger=logger, i18n=i18n)
+        return create_gcode_compression_service(logger=logger, i18n=i18n, config=config)
@@ -18,3 +18,152 @@ class GcodeGenerationConfigHelper:
                 return config.get("USE_RELATIVE_MOVES", False)
         except Exception:
             return False
+
+    @staticmethod
+    def get_allow_path_reversal(config):
+        try:
+            return bool(config.get("ALLOW_PATH_REVERSAL", False))
+        except Exception:
+            return False
+
+    @staticmethod
+    def get_order_optimization_budget_s(config):
+        try:
+            return max(0.0, float(config.get("ORDER_OPTIMIZATION_BUDGET_S", 0.0) or 0.0))
+        except Exception:
+            return 0.0
+
+    @staticmethod
+    def get_order_tiling(config):
+        " Devuelve (tile_mm, tile_order, workers) de la sección ORDER_TILING. "
+        defaults = (50.0, "serpentine", 1)
+        try:
+            tiling = config.get("ORDER_TILING", {}) or {}
+            return (
+                float(tiling.get("TILE_MM", defaults[0])),
+                str(tiling.get("TILE_ORDER", defaults[1])).lower(),
+                max(1, int(tiling.get("WORKERS", defaults[2]))),
+            )
+        except Exception:
+            return defaults
+
+    @staticmethod
+    def get_gcode_format(config):
+        " Devuelve (decimales, punto_fijo) para el texto G-code (GCODE_DECIMALS, GCODE_FIXED_POINT). "
+        try:
+            decimals = int(config.get("GCODE_DECIMALS", 3))
+            if not 0 <= decimals <= 12:
+                decimals = 3
+            return decimals, bool(config.get("GCODE_FIXED_POINT", False))
+        except Exception:
+            return 3, False
+
+    @staticmethod
+    def get_pen_drag_max_gap_mm(config):
+        " Distancia máxima (mm) entre trazos consecutivos para unirlos sin levantar la lapicera (0 desactiva). "
+        try:
+            return max(0.0, float(config.get("PEN_DRAG_MAX_GAP_MM", 0.0) or 0.0))
+        except Exception:
+            return 0.0
+
+    @staticmethod
+    def get_pen_dwells_ms(config, dwell_ms):
+        " Devuelve (asentamiento, despeje) en ms tras bajar/subir la lapicera (PEN_DOWN_DWELL_MS, PEN_UP_DWELL_MS; sin valor usa dwell_ms). "
+        result = []
+        for key in ("PEN_DOWN_DWELL_MS", "PEN_UP_DWELL_MS"):
+            try:
+                value = config.get(key, None)
+                result.append(dwell_ms if value is None else max(0.0, float(value)))
+            except Exception:
+                result.append(dwell_ms)
+        return tuple(result)
+
+    @staticmethod
+    def get_feed_planner(config):
+        """
+        Devuelve (planificador, aceleración mm/s², desviación de esquina mm, segmentos de anticipación):
+        FEED_PLANNER ('curvature' o 'junction_deviation'), MAX_ACCEL_MM_S2, JUNCTION_DEVIATION_MM,
+        PLANNER_LOOKAHEAD_SEGMENTS (0 = todo el trazo).
+        """
+        defaults = ("curvature", 1000.0, 0.01, 16)
+        try:
+            planner = str(config.get("FEED_PLANNER", defaults[0]) or defaults[0]).lower()
+            if planner not in ("curvature", "junction_deviation"):
+                planner = defaults[0]
+            accel = float(config.get("MAX_ACCEL_MM_S2", defaults[1]))
+            deviation = float(config.get("JUNCTION_DEVIATION_MM", defaults[2]))
+            lookahead = max(0, int(config.get("PLANNER_LOOKAHEAD_SEGMENTS", defaults[3])))
+            if accel <= 0 or deviation < 0:
+                return (planner,) + defaults[1:]
+            return planner, accel, deviation, lookahead
+        except Exception:
+            return defaults
+
+    @staticmethod
+    def get_plot_time_settings(config):
+        """
+        Devuelve (avance rápido mm/min, servo al bajar ms, servo al subir ms) para la estimación del tiempo
+        de ploteo: RAPID_FEED (sin valor usa FEED), PEN_SERVO_DOWN_MS, PEN_SERVO_UP_MS.
+        """
+        try:
+            feed = float(config.get("FEED", 4000) or 4000)
+        except Exception:
+            feed = 4000.0
+        try:
+            rapid = config.get("RAPID_FEED", None)
+            rapid = feed if rapid is None or float(rapid) <= 0 else float(rapid)
+            servo = tuple(max(0.0, float(config.get(key, 0) or 0)) for key in ("PEN_SERVO_DOWN_MS", "PEN_SERVO_UP_MS"))
+            return (rapid,) + servo
+        except Exception:
+            return feed, 0.0, 0.0
+
+    @staticmethod
+    def get_arc_compression(config):
+        """
+        Devuelve (usar arcos, tolerancia mm, segmentos mínimos, giro mínimo °) de la sección COMPRESSION:
+        USE_ARCS, ARC_TOLERANCE_MM, MIN_POINTS_FOR_ARC, MIN_ARC_ANGLE_DEG.
+        """
+        defaults = (True, 0.2, 3, 2.0)
+        try:
+            compression = config.get("COMPRESSION", None) or {}
+            use_arcs = bool(compression.get("USE_ARCS", defaults[0]))
+            tolerance = float(compression.get("ARC_TOLERANCE_MM", defaults[1]))
+            min_points = int(compression.get("MIN_POINTS_FOR_ARC", defaults[2]))
+            min_angle = float(compression.get("MIN_ARC_ANGLE_DEG", defaults[3]))
+            if tolerance <= 0 or min_points < 2 or min_angle < 0:
+                return (use_arcs,) + defaults[1:]
+            return use_arcs, tolerance, min_points, min_angle
+        except Exception:
+            return defaults
+
+    @staticmethod
+    def get_corner_blending(config):
+        """
+        Devuelve (tolerancia mm, giro mínimo °, giro máximo por tramo °) para el redondeo de esquinas:
+        CORNER_BLEND_TOLERANCE_MM (0 desactiva), CORNER_BLEND_MIN_ANGLE_DEG, CORNER_BLEND_MAX_STEP_DEG.
+        """
+        defaults = (0.0, 15.0, 10.0)
+        try:
+            tolerance = max(0.0, float(config.get("CORNER_BLEND_TOLERANCE_MM", defaults[0]) or 0.0))
+            min_angle = float(config.get("CORNER_BLEND_MIN_ANGLE_DEG", defaults[1]))
+            max_step = float(config.get("CORNER_BLEND_MAX_STEP_DEG", defaults[2]))
+            if not 0 <= min_angle < 180 or max_step <= 0:
+                return (tolerance,) + defaults[1:]
+            return tolerance, min_angle, max_step
+        except Exception:
+            return defaults
+
+    @staticmethod
+    def get_gcode_compact(config):
+        " Devuelve (compacto, sin_espacios) para la emisión modal del G-code (GCODE_COMPACT, GCODE_OMIT_SPACES). "
+        try:
+            return bool(config.get("GCODE_COMPACT", False)), bool(config.get("GCODE_OMIT_SPACES", False))
+        except Exception:
+            return False, False
+
+    @staticmethod
+    def get_order_strategy(config):
+        try:
+            return str(config.get("ORDER_STRATEGY", "greedy") or "greedy").lower()
+        except Exception:
+            return "greedy"
@@ -3,32 +3,41 @@ Path: adapters/output/gcode_generator_adapter.py
 Adapter for G-code generation, implementing the GcodeGeneratorPort domain port.
 """
 
-from typing import List, Optional
+from typing import Iterator, List, Optional, Union
 from tqdm import tqdm
 
 from domain.entities.point import Point
+from domain.entities.stroke_buffer import StrokeBuffer
 from domain.ports.path_transform_strategy_port import PathTransformStrategyPort
 from domain.ports.path_sampler_port import PathSamplerPort
 from domain.ports.transform_manager_port import TransformManagerPort
 from domain.ports.gcode_generator_port import GcodeGeneratorPort
 from domain.geometry.scale_manager import ScaleManager
+from domain.geometry.bounding_box_calculator import BoundingBoxCalculator
 from domain.gcode.gcode_border_rectangle_detector import GCodeBorderRectangleDetector
 from domain.gcode.gcode_border_filter import GCodeBorderFilter
+from domain.gcode.gcode_serializer import GCodeSerializer
+from domain.geometry.corner_blender import CornerBlender
+from domain.gcode.motion_simulator import PlotEstimate
 from domain.ports.gcode_optimization_chain_port import GcodeOptimizationChainPort
 from domain.ports.config_port import ConfigPort
 from domain.ports.logger_port import LoggerPort
 from domain.ports.transform_manager_port import NullTransformManager
 from domain.services.optimization.trajectory_optimizer import TrajectoryOptimizer
+from domain.services.optimization.space_filling_curve_order import SpaceFillingCurveOrder
+from domain.services.optimization.tiled_trajectory_optimizer import TiledTrajectoryOptimizer
 from domain.compression_config import CompressionConfig
 
 from infrastructure.transform_manager import TransformManager
 from infrastructure.adapters.reference_marks_generator import ReferenceMarksGenerator
+from infrastructure.factories.motion_simulator_factory import create_motion_simulator
 from infrastructure.logger_helper import LoggerHelper
 
 from adapters.output.feed_rate_strategy import FeedRateStrategy
 from adapters.output.sample_transform_pipeline import SampleTransformPipeline
 from adapters.output.gcode_builder_helper import GCodeBuilderHelper
-from adapters.output.curvature_feed_calculator import CurvatureFeedCalculator
+from adapters.output.feed_profile_planner import FeedProfilePlanner
+from adapters.output.junction_deviation_planner import JunctionDeviationPlanner
 from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
 from adapters.output.gcode_compression_factory import GcodeCompressionFactory
 
@@ -79,30 +88,57 @@ class GCodeGeneratorAdapter(GcodeGeneratorPort, LoggerHelper):
             curvature_factor=getattr(config, 'curvature_adjustment_factor', 0.35),
             min_feed_factor=getattr(config, 'minimum_feed_factor', 0.4)
         )
-        self.curvature_feed_calculator = CurvatureFeedCalculator(self.feed_rate_strategy)
+        # Planificador de feeds según FEED_PLANNER (por defecto, reducción por curvatura de FeedProfilePlanner)
+        self.feed_profile_planner = self._create_feed_planner()
         self.i18n = i18n
+        # Métricas de la última generación (recorrido en vacío, optimizadores)
+        self.metrics = {}
         # Asegura que config tenga i18n para la compresión
         if self.i18n and not hasattr(self.config, 'i18n'):
             setattr(self.config, 'i18n', self.i18n)
 
 
-    def generate_gcode_commands(self, all_points: List[List[Point]], use_relative_moves: bool = False):
+    def generate_gcode_commands(self, all_points: Union[StrokeBuffer, List[List[Point]]], use_relative_moves: bool = False):
         " Genera los comandos G-code a partir de los puntos muestreados y transformados"
-        def feed_fn(prev_pt, curr_pt, next_pt, future_pt):
-            " Calcula el feed rate basado en la curvatura entre puntos"
-            feed = self.curvature_feed_calculator.adjust_feed(prev_pt, curr_pt, next_pt)
-            if future_pt is not None:
-                future_feed = self.curvature_feed_calculator.adjust_feed(curr_pt, next_pt, future_pt)
-                feed = min(feed, future_feed)
-            return feed
-        builder_helper = GCodeBuilderHelper(self.cmd_down, self.cmd_up, self.dwell_ms)
-        return builder_helper.build(all_points, feed_fn, use_relative_moves=use_relative_moves)
+        return self._create_builder_helper().build(all_points, self.feed_profile_planner,
+                                                   use_relative_moves=use_relative_moves)
 
-    def generate(self, paths, svg_attr: dict, context=None) -> list:  # pylint: disable=unused-argument
+    def iter_gcode_commands(self, all_points: Union[StrokeBuffer, List[List[Point]]], use_relative_moves: bool = False,
+                            metrics: Optional[dict] = None) -> Iterator[str]:
+        " Igual que generate_gcode_commands(), pero entrega las líneas por bloques a medida que se construyen "
+        return self._create_builder_helper().iter_lines(all_points, self.feed_profile_planner,
+                                                        use_relative_moves=use_relative_moves, metrics=metrics)
+
+    def _create_feed_planner(self):
+        " FeedProfilePlanner (curvatura) o JunctionDeviationPlanner (límites de la máquina) según FEED_PLANNER. "
+        planner, accel, deviation, lookahead = GcodeGenerationConfigHelper.get_feed_planner(self.config)
+        if planner == "junction_deviation":
+            return JunctionDeviationPlanner(self.feed, accel, deviation, lookahead_segments=lookahead)
+        return FeedProfilePlanner(self.feed_rate_strategy)
+
+    def _create_builder_helper(self) -> GCodeBuilderHelper:
+        decimals, fixed_point = GcodeGenerationConfigHelper.get_gcode_format(self.config)
+        compact, omit_spaces = GcodeGenerationConfigHelper.get_gcode_compact(self.config)
+        serializer = GCodeSerializer(decimals=decimals, fixed_point=fixed_point, compact=compact, omit_spaces=omit_spaces)
+        pen_drag_max_gap_mm = GcodeGenerationConfigHelper.get_pen_drag_max_gap_mm(self.config)
+        pen_down_dwell_ms, pen_up_dwell_ms = GcodeGenerationConfigHelper.get_pen_dwells_ms(self.config, self.dwell_ms)
+        return GCodeBuilderHelper(self.cmd_down, self.cmd_up, self.dwell_ms, serializer=serializer,
+                                  pen_drag_max_gap_mm=pen_drag_max_gap_mm, pen_down_dwell_ms=pen_down_dwell_ms,
+                                  pen_up_dwell_ms=pen_up_dwell_ms)
+
+    def generate(self, paths, svg_attr: dict, context=None) -> list:
         """
         Genera las líneas de G-code a partir de los paths y atributos SVG.
         El parámetro context permite pasar información adicional (por ejemplo, tool_diameter).
         """
+        return list(self.generate_stream(paths, svg_attr, context=context))
+
+    def generate_stream(self, paths, svg_attr: dict, context=None) -> Iterator[str]:  # pylint: disable=unused-argument
+        """
+        Igual que generate(), pero devuelve un iterador de líneas: la optimización de orden, el muestreo
+        y el escalado se resuelven al llamar; la construcción, compresión y filtrado de borde se hacen
+        por bloques a medida que se consume el iterador, sin materializar el programa completo.
+        """
         # Usar TARGET_WRITE_AREA_MM para todos los cálculos y logs
         # Compatibilidad con ConfigAdapter y Config
         if hasattr(self.config, 'get_target_write_area_mm'):
@@ -128,7 +164,6 @@ class GCodeGeneratorAdapter(GcodeGeneratorPort, LoggerHelper):
         if not self.path_sampler:
             self.logger.error(self.i18n.get("ERR_MISSING_PATH_SAMPLER"))
             raise ValueError("PathSamplerPort is required")
-        gcode = []  # Valor por defecto para evitar UnboundLocalError
         # --- INICIO: Incorporar marcas de referencia ---
         ref_marks_generator = ReferenceMarksGenerator(logger=self.logger, i18n=self.i18n)
         ref_marks_gcode = ref_marks_generator.generate(
@@ -137,7 +172,7 @@ class GCodeGeneratorAdapter(GcodeGeneratorPort, LoggerHelper):
         )
         # --- FIN: Incorporar marcas de referencia ---
         # Log orden y distancia antes de optimizar
-        optimizer = TrajectoryOptimizer()
+        optimizer = self._create_order_optimizer()
         # Loguear inicio de optimización
         self._debug(self.i18n.get("INFO_OPTIMIZING_PATHS"))
         # Barra de progreso con tqdm para optimización
@@ -163,136 +198,68 @@ class GCodeGeneratorAdapter(GcodeGeneratorPort, LoggerHelper):
         optimized_paths = optimizer.optimize_order(paths, progress_callback=progress_callback)
         if pbar is not None and not pbar.disable:
             pbar.close()
+        fallback = getattr(optimizer, 'metrics', {}).get("parallel_fallback")
+        if fallback:
+            self.logger.warning(fallback)
         # Loguear si la optimización no tuvo efecto
         if not optimized_paths or optimized_paths == paths:
             self.logger.warning(self.i18n.get("WARN_NO_OPTIMIZATION"))
 
-        # Usar instancia de ScaleManager para debug configurable
-        # --- INICIO: Re-escalado iterativo ---
-        MAX_ITER = 3
+        # --- INICIO: Escalado en una sola pasada ---
         TOLERANCIA = 0.5  # mm
         FACTOR_MINIMO = 0.05
-        factor_historial = []
-        # Factor inicial desde viewbox_scale
         scale_manager = ScaleManager(config_provider=self.config, logger=self.logger)
         factor = scale_manager.viewbox_scale(svg_attr)
-        scale = factor
-        for intento in range(1, MAX_ITER + 1):
-            scale = factor
-            # Aplicar escalado para alto y ancho
-            scale = scale_manager.adjust_scale_for_max_height(optimized_paths, scale, self.max_height_mm)
-            scale = scale_manager.adjust_scale_for_max_width(optimized_paths, scale, self.max_width_mm)
-            all_points = self.sample_transform_pipeline(optimized_paths, scale)
-            flat_points = [pt for sublist in all_points for pt in sublist]
-            if flat_points:
-                xs = [pt.x for pt in flat_points]
-                ys = [pt.y for pt in flat_points]
-                real_width = max(xs) - min(xs)
-                real_height = max(ys) - min(ys)
-                self.logger.info(f"[Iteración {intento}] Escala aplicada: {scale:.4g}, ancho={real_width:.4g}mm, alto={real_height:.4g}mm")
-                factor_historial.append(scale)
-                excedente = False
-                if real_width > self.max_width_mm + TOLERANCIA:
-                    nuevo_factor = scale * (self.max_width_mm / real_width)
-                    self.logger.warning(f"Excedente de ancho: {real_width:.4g}mm > {self.max_width_mm:.4g}mm. Nuevo factor: {nuevo_factor:.4g}")
-                    factor = nuevo_factor
-                    excedente = True
-                if real_height > self.max_height_mm + TOLERANCIA:
-                    nuevo_factor = scale * (self.max_height_mm / real_height)
-                    self.logger.warning(f"Excedente de alto: {real_height:.4g}mm > {self.max_height_mm:.4g}mm. Nuevo factor: {nuevo_factor:.4g}")
-                    factor = min(factor, nuevo_factor)
-                    excedente = True
-                if factor < FACTOR_MINIMO:
-                    self.logger.error(f"Factor de escala demasiado pequeño: {factor:.4g}. Abortando.")
-                    raise ValueError("No es posible ajustar el escalado sin perder calidad.")
-                if not excedente:
-                    break
-            else:
-                real_width = real_height = 0
-                factor_historial.append(scale)
-        if excedente:
-            self.logger.error("No se pudo ajustar el escalado tras el máximo de intentos.")
-            raise ValueError("No se pudo ajustar el escalado tras el máximo de intentos.")
-        # --- FIN: Re-escalado iterativo ---
+        # Escala final resuelta sobre el bbox exacto (ya transformado), antes de muestrear
+        bbox = self._transformed_bbox(BoundingBoxCalculator.get_exact_bbox(optimized_paths))
+        scale = scale_manager.fit_scale(bbox, factor, self.max_width_mm, self.max_height_mm)
+        # Muestreo único a la resolución de la máquina (step_mm medido ya escalado)
+        pipeline = self._create_sample_transform_pipeline(scale)
+        all_points = pipeline.process(optimized_paths)
+        if pipeline.bounds:
+            # Verificación de seguridad sobre los puntos: si exceden el área, se reescalan sin volver a muestrear
+            xmin, xmax, ymin, ymax = pipeline.bounds
+            real_width, real_height = xmax - xmin, ymax - ymin
+            # Ancho del G-code: incluye los desplazamientos al origen (0, 0)
+            gcode_width = max(xmax, 0.0) - min(xmin, 0.0)
+            self.logger.info(f"Escala aplicada: {scale:.4g}, ancho={real_width:.4g}mm, alto={real_height:.4g}mm")
+            correction = 1.0
+            if real_width > self.max_width_mm + TOLERANCIA:
+                correction = self.max_width_mm / real_width
+                self.logger.warning(f"Excedente de ancho: {real_width:.4g}mm > {self.max_width_mm:.4g}mm. Nuevo factor: {scale * correction:.4g}")
+            if real_height > self.max_height_mm + TOLERANCIA:
+                correction = min(correction, self.max_height_mm / real_height)
+                self.logger.warning(f"Excedente de alto: {real_height:.4g}mm > {self.max_height_mm:.4g}mm. Nuevo factor: {scale * correction:.4g}")
+            if gcode_width * correction > self.max_width_mm + TOLERANCIA:
+                correction = self.max_width_mm / gcode_width
+                self.logger.warning(f"Excedente de ancho en G-code: {gcode_width:.4g}mm > {self.max_width_mm:.4g}mm. Nuevo factor: {scale * correction:.4g}")
+            if correction < 1.0:
+                factor = scale = scale * correction
+                all_points = all_points.scaled(correction)
+            if factor < FACTOR_MINIMO:
+                self.logger.error(f"Factor de escala demasiado pequeño: {factor:.4g}. Abortando.")
+                raise ValueError("No es posible ajustar el escalado sin perder calidad.")
+        # --- FIN: Escalado en una sola pasada ---
         self._debug(self.i18n.get("DEBUG_SCALE_APPLIED", scale=f"{scale:.3f}"))
+        all_points, unblended = self._blend_corners(all_points)
         remove_border = GcodeGenerationConfigHelper.get_remove_border(self.config)
         use_relative_moves = GcodeGenerationConfigHelper.get_use_relative_moves(self.config)
-        from adapters.output.gcode_analyzer import GCodeAnalyzer
-        MAX_ITER_GCODE = 3
-        TOLERANCIA = 0.5  # mm
-        FACTOR_MINIMO = 0.05
-        gcode_factor_historial = []
-        gcode_excedente = False
-        for intento_gcode in range(1, MAX_ITER_GCODE + 1):
-            try:
-                gcode, _metrics = self.generate_gcode_commands(all_points, use_relative_moves=use_relative_moves)
-            except Exception:
-                self.logger.exception(self.i18n.get("ERR_GCODE_BUILD_FAILED"))
-                raise
-            # Only calculate width if gcode is not empty
-            gcode_width = 0
-            if gcode:
-                gcode_width = GCodeAnalyzer.get_width_from_gcode_lines(gcode)
-            self.logger.info(f"[Iteración G-code {intento_gcode}] G-code final: ancho={gcode_width:.4g}mm")
-            gcode_factor_historial.append(scale)
-            gcode_excedente = False
-            if gcode_width > self.max_width_mm + TOLERANCIA:
-                nuevo_factor = scale * (self.max_width_mm / gcode_width)
-                self.logger.warning(f"Excedente de ancho en G-code: {gcode_width:.4g}mm > {self.max_width_mm:.4g}mm. Nuevo factor: {nuevo_factor:.4g}")
-                scale = nuevo_factor
-                # Recalcular all_points con el nuevo factor
-                all_points = self.sample_transform_pipeline(optimized_paths, scale)
-                gcode_excedente = True
-            # Si quieres controlar el alto del G-code, agrega aquí lógica similar
-            if scale < FACTOR_MINIMO:
-                self.logger.error(f"Factor de escala demasiado pequeño en G-code: {scale:.4g}. Abortando.")
-                raise ValueError("No es posible ajustar el escalado del G-code sin perder calidad.")
-            if not gcode_excedente:
-                break
-        if gcode_excedente:
-            self.logger.error("No se pudo ajustar el escalado del G-code tras el máximo de intentos.")
-            raise ValueError("No se pudo ajustar el escalado del G-code tras el máximo de intentos.")
+        # Métricas de recorrido; las del builder (p. ej. pen_lifts_avoided) y las del redondeo de esquinas
+        # se agregan al agotar el flujo
+        self.metrics = self._with_travel_metrics({}, getattr(optimizer, 'metrics', None), scale)
+        gcode = self._logged_build(self.iter_gcode_commands(all_points, use_relative_moves=use_relative_moves,
+                                                            metrics=self.metrics))
         compression_service = GcodeCompressionFactory.get_compression_service(
             self.config,
             logger=self.logger
         )
-        if compression_service:
-            compression_config = CompressionConfig()
-            gcode, _ = compression_service.compress(gcode, compression_config)
+        gcode = self._compressed(gcode, compression_service)
+        if unblended is not None:
+            gcode = self._with_blend_metrics(gcode, unblended, compression_service, use_relative_moves)
         if remove_border:
             detector = GCodeBorderRectangleDetector()
             border_filter = GCodeBorderFilter(detector)
-            # Detectar borde antes de filtrar
-
-            gcode = border_filter.filter(gcode if isinstance(gcode, str) else '\n'.join(gcode))
-            if isinstance(gcode, str):
-                gcode = gcode.split('\n')
-        # --- INICIO: Incorporar marcas de referencia ---
-        ref_marks_generator = ReferenceMarksGenerator(logger=self.logger, i18n=self.i18n)
-        ref_marks_gcode = ref_marks_generator.generate(
-            width=self.max_width_mm,
-            height=self.max_height_mm
-        )
-        # Evitar duplicación de encabezados (G21, G90, cmd_up)
-        encabezados = {"G21", "G90", self.cmd_up}
-        # Ensure gcode is a list of strings
-        if isinstance(gcode, str):
-            gcode_lines = gcode.split('\n')
-        elif isinstance(gcode, list):
-            # Flatten if nested lists
-            gcode_lines = []
-            for item in gcode:
-                if isinstance(item, str):
-                    gcode_lines.append(item)
-                elif isinstance(item, list):
-                    gcode_lines.extend(str(x) for x in item)
-                else:
-                    gcode_lines.append(str(item))
-        else:
-            gcode_lines = [str(gcode)]
-        # Remove duplicate headers at the start
-        while gcode_lines and gcode_lines[0].strip() in encabezados:
-            gcode_lines.pop(0)
+            gcode = border_filter.filter_lines(gcode)
         # ref_marks_gcode may be string or list
         if isinstance(ref_marks_gcode, str):
             ref_marks_lines = ref_marks_gcode.split('\n')
@@ -300,12 +267,128 @@ class GCodeGeneratorAdapter(GcodeGeneratorPort, LoggerHelper):
             ref_marks_lines = [str(x) for x in ref_marks_gcode]
         else:
             ref_marks_lines = [str(ref_marks_gcode)]
-        # Concatenate reference marks and gcode
-        final_gcode = ref_marks_lines + gcode_lines
-        # --- FIN: Incorporar marcas de referencia ---
-        return final_gcode
+        # Marcas de referencia seguidas del G-code, sin los encabezados duplicados (G21, G90, cmd_up)
+        return self._with_reference_marks(ref_marks_lines, gcode, {"G21", "G90", self.cmd_up})
+
+    def _logged_build(self, lines: Iterator[str]) -> Iterator[str]:
+        " Registra los errores de construcción, que en modo flujo aparecen al consumir las líneas. "
+        try:
+            yield from lines
+        except Exception:
+            self.logger.exception(self.i18n.get("ERR_GCODE_BUILD_FAILED"))
+            raise
+
+    @staticmethod
+    def _with_reference_marks(ref_marks_lines: List[str], gcode, encabezados) -> Iterator[str]:
+        yield from ref_marks_lines
+        gcode = iter(gcode)
+        for line in gcode:
+            # Remove duplicate headers at the start
+            if line.strip() in encabezados:
+                continue
+            yield line
+            break
+        yield from gcode
+
+    def _create_order_optimizer(self):
+        " Crea el optimizador de orden de trazos según ORDER_STRATEGY (greedy, hilbert, morton, tiled). "
+        strategy = GcodeGenerationConfigHelper.get_order_strategy(self.config)
+        if strategy in SpaceFillingCurveOrder.CURVES:
+            optimizer = SpaceFillingCurveOrder(curve=strategy)
+        elif strategy == "tiled":
+            tile_mm, tile_order, workers = GcodeGenerationConfigHelper.get_order_tiling(self.config)
+            optimizer = TiledTrajectoryOptimizer(
+                area_mm=(self.max_width_mm, self.max_height_mm),
+                tile_mm=tile_mm,
+                tile_order=tile_order,
+                workers=workers
+            )
+        else:
+            if strategy != "greedy":
+                self.logger.warning(f"ORDER_STRATEGY desconocida: {strategy}. Se usa 'greedy'.")
+            optimizer = TrajectoryOptimizer()
+        optimizer.allow_reversal = GcodeGenerationConfigHelper.get_allow_path_reversal(self.config)
+        optimizer.improvement_budget_s = GcodeGenerationConfigHelper.get_order_optimization_budget_s(self.config)
+        return optimizer
+
+    @staticmethod
+    def _compressed(gcode, compression_service):
+        " Aplica el servicio de compresión (si hay) a las líneas G-code. "
+        if not compression_service:
+            return gcode
+        compression_config = CompressionConfig()
+        if hasattr(compression_service, 'compress_stream'):
+            gcode, _ = compression_service.compress_stream(gcode, compression_config)
+        else:
+            gcode, _ = compression_service.compress(list(gcode), compression_config)
+        return gcode
+
+    def _blend_corners(self, all_points: Union[StrokeBuffer, List[List[Point]]]):
+        """
+        Redondea las esquinas si CORNER_BLEND_TOLERANCE_MM > 0. Devuelve (puntos, trazos sin redondear);
+        los segundos son None si no se redondeó ninguna esquina.
+        """
+        tolerance, min_angle, max_step = GcodeGenerationConfigHelper.get_corner_blending(self.config)
+        if tolerance <= 0:
+            return all_points, None
+        decimals, _fixed_point = GcodeGenerationConfigHelper.get_gcode_format(self.config)
+        # Sin puntos repetidos: una esquina con un segmento nulo al lado no se puede redondear
+        strokes = StrokeBuffer.from_point_lists(all_points).snapped(decimals)
+        blender = CornerBlender(tolerance, min_angle_deg=min_angle, max_step_deg=max_step)
+        blended = blender.blend(strokes)
+        if not blender.corners_blended:
+            return blended, None
+        return blended, strokes
+
+    def _with_blend_metrics(self, gcode, unblended: StrokeBuffer, compression_service,
+                            use_relative_moves: bool) -> Iterator[str]:
+        """
+        Deja pasar el G-code ya comprimido y, al agotarse, lo compara con el de los trazos sin redondear
+        (construido y comprimido igual): la compresión puede aplanar un redondeo (LineCompressor une los
+        G1 casi horizontales) o convertirlo en arco, así que se mide lo que llega al archivo.
+        Agrega corners_blended (esquinas de al menos CORNER_BLEND_MIN_ANGLE_DEG que ya no están en la
+        salida) y blend_time_saved_s (tiempo de movimiento ahorrado según MotionSimulator).
+        """
+        _tolerance, min_angle, _max_step = GcodeGenerationConfigHelper.get_corner_blending(self.config)
+        simulator = create_motion_simulator(self.config)
+        simulator.corner_angle_deg = min_angle
+        blended = PlotEstimate()
+        yield from simulator.stream_lines(gcode, blended)
+        baseline = simulator.estimate_lines(self._compressed(
+            self.iter_gcode_commands(unblended, use_relative_moves=use_relative_moves), compression_service))
+        corners = max(0, baseline.sharp_corners - blended.sharp_corners)
+        saved = baseline.motion_time_s - blended.motion_time_s
+        self.metrics.update({"corners_blended": corners, "blend_time_saved_s": saved})
+        self.logger.info(f"Esquinas redondeadas: {corners} (tiempo estimado ahorrado: {saved:.1f}s)")
+
+    def _with_travel_metrics(self, metrics: dict, order_metrics: Optional[dict], scale: float) -> dict:
+        " Agrega a las métricas el recorrido en vacío (mm) antes y después de optimizar el orden. "
+        if not order_metrics or "travel_before" not in order_metrics:
+            return metrics
+        metrics["travel_before_mm"] = order_metrics["travel_before"] * scale
+        metrics["travel_after_mm"] = order_metrics["travel_after"] * scale
+        metrics["order_optimization_s"] = order_metrics.get("improvement_s", 0.0)
+        self.logger.info(
+            f"Recorrido en vacío: {metrics['travel_before_mm']:.1f}mm -> {metrics['travel_after_mm']:.1f}mm "
+            f"({metrics['order_optimization_s']:.2f}s de optimización)"
+        )
+        return metrics
+
+    def _transformed_bbox(self, bbox):
+        " Bbox (xmin, xmax, ymin, ymax) tras aplicar las transformaciones (afines) a sus esquinas. "
+        xmin, xmax, ymin, ymax = bbox
+        corners = [self.transform_manager.apply(x, y) for x in (xmin, xmax) for y in (ymin, ymax)]
+        xs = [c[0] for c in corners]
+        ys = [c[1] for c in corners]
+        return min(xs), max(xs), min(ys), max(ys)
+
+    def _create_sample_transform_pipeline(self, scale) -> SampleTransformPipeline:
+        " Crea el pipeline con el muestreador ajustado a la escala (resolución en mm de la máquina). "
+        sampler = self.path_sampler
+        if hasattr(sampler, 'for_scale'):
+            sampler = sampler.for_scale(scale)
+        return SampleTransformPipeline(sampler, self.transform_manager, scale)
 
-    def sample_transform_pipeline(self, paths, scale) -> List[List[Point]]:
+    def sample_transform_pipeline(self, paths, scale) -> StrokeBuffer:
         " Aplica el pipeline de muestreo y transformación a los paths"
-        pipeline = SampleTransformPipeline(self.path_sampler, self.transform_manager, scale)
-        return pipeline.process(paths)
+        return self._create_sample_transform_pipeline(scale).process(paths)
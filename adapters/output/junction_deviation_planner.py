@@ -0,0 +1,105 @@
+"""
+JunctionDeviationPlanner: planificador de velocidades con desviación de esquina y límite de aceleración.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from domain.entities.stroke_buffer import StrokeBuffer
+
+
+class JunctionDeviationPlanner:
+    """
+    Asigna a cada G1 el feed más alto que todavía permite frenar o girar con la aceleración de la máquina,
+    con el mismo modelo que los planificadores de firmware (Grbl, Marlin):
+
+    - Velocidad máxima en cada vértice por desviación de esquina (JUNCTION_DEVIATION_MM):
+      v² = a · δ · sin(θ/2) / (1 - sin(θ/2)); una recta no limita y una reversión obliga a detenerse.
+    - El trazo empieza y termina detenido (la lapicera sube y baja con la máquina quieta).
+    - Pasada hacia atrás (poder frenar a tiempo) y hacia adelante (aceleración alcanzable) con
+      v² ≤ v_vecino² + 2·a·L. Con lookahead_segments > 0 la pasada hacia atrás solo ve N segmentos
+      y supone una detención al final de esa ventana, como el buffer de un firmware.
+    - El feed del segmento es el pico alcanzable entre sus velocidades de entrada y salida,
+      limitado por nominal_feed y redondeado hacia abajo a mm/min enteros.
+
+    Las velocidades se manejan en mm/min y la aceleración en mm/min² (MAX_ACCEL_MM_S2 · 3600).
+    Tiene la misma interfaz que FeedProfilePlanner (plan, plan_buffer).
+    """
+    MIN_SEGMENT = 1e-6
+    # Cosenos a partir de los cuales el giro se toma como recta o como reversión
+    STRAIGHT_COS = -0.999999
+    REVERSAL_COS = 0.999999
+
+    def __init__(self, nominal_feed: float, max_accel_mm_s2: float, junction_deviation_mm: float,
+                 lookahead_segments: int = 0, min_feed: float = 1.0):
+        if max_accel_mm_s2 <= 0 or junction_deviation_mm < 0:
+            raise ValueError("max_accel_mm_s2 debe ser positiva y junction_deviation_mm no negativa")
+        self.nominal_feed = float(nominal_feed)
+        self.accel = float(max_accel_mm_s2) * 3600.0
+        self.junction_deviation_mm = float(junction_deviation_mm)
+        self.lookahead_segments = max(0, int(lookahead_segments))
+        self.min_feed = float(min_feed)
+
+    def plan(self, coords: np.ndarray) -> np.ndarray:
+        " Feeds de los len(coords) - 1 segmentos de un trazo (array (n, 2)). "
+        return self.plan_buffer(StrokeBuffer.from_arrays([coords]))[1:]
+
+    def plan_buffer(self, strokes: StrokeBuffer) -> np.ndarray:
+        """
+        Feeds de todos los segmentos del buffer: la posición p tiene el feed del segmento que termina
+        en el punto p; el primer punto de cada trazo queda en NaN.
+        """
+        coords, offsets = strokes.coords, strokes.offsets
+        n = len(coords)
+        feeds = np.full(n, np.nan)
+        if n < 2:
+            return feeds
+        nonempty = np.diff(offsets) > 0
+        starts = np.zeros(n, dtype=bool)
+        starts[offsets[:-1][nonempty]] = True
+        ends = np.zeros(n, dtype=bool)
+        ends[offsets[1:][nonempty] - 1] = True
+        vectors = np.diff(coords, axis=0)
+        lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        # Los "segmentos" entre el final de un trazo y el inicio del siguiente no existen
+        lengths[starts[1:]] = 0.0
+        limits = self.vertex_limits(vectors, lengths, starts, ends)
+        speeds_sq = self._plan_speeds(limits, lengths)
+        peak_sq = (speeds_sq[:-1] + speeds_sq[1:] + 2.0 * self.accel * lengths) / 2.0
+        segment = np.minimum(np.sqrt(peak_sq), self.nominal_feed)
+        segment = np.maximum(np.floor(segment), min(self.min_feed, self.nominal_feed))
+        feeds[1:] = np.where(starts[1:], np.nan, segment)
+        return feeds
+
+    def vertex_limits(self, vectors, lengths, starts, ends) -> np.ndarray:
+        " Velocidad² máxima en cada punto: 0 en los extremos de trazo, desviación de esquina en el interior. "
+        n = len(starts)
+        limits = np.full(n, self.nominal_feed ** 2)
+        prev_len, next_len = lengths[:-1], lengths[1:]
+        valid = (prev_len >= self.MIN_SEGMENT) & (next_len >= self.MIN_SEGMENT)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cos_theta = -(vectors[:-1, 0] * vectors[1:, 0] + vectors[:-1, 1] * vectors[1:, 1]) / (prev_len * next_len)
+            sin_half = np.sqrt(0.5 * (1.0 - np.clip(cos_theta, -1.0, 1.0)))
+            junction = self.accel * self.junction_deviation_mm * sin_half / (1.0 - sin_half)
+        junction = np.where(cos_theta > self.REVERSAL_COS, 0.0, junction)
+        junction = np.where(valid & (cos_theta >= self.STRAIGHT_COS), junction, np.inf)
+        limits[1:-1] = np.minimum(limits[1:-1], junction)
+        limits[starts | ends] = 0.0
+        return limits
+
+    def _plan_speeds(self, limits, lengths) -> np.ndarray:
+        """
+        Velocidad² en cada punto tras las pasadas hacia atrás y hacia adelante.
+        Con D = distancia acumulada · 2a, cada pasada es un mínimo acumulado:
+        atrás w[k] = min_{j≥k}(lím[j] + D[j]) - D[k]; adelante w[k] = D[k] + min_{j≤k}(w[j] - D[j]).
+        """
+        reach = np.concatenate(([0.0], np.cumsum(2.0 * self.accel * lengths)))
+        ahead = limits + reach
+        if self.lookahead_segments:
+            # Solo N segmentos visibles y detención supuesta al final de la ventana
+            window = self.lookahead_segments + 1
+            padded = np.concatenate((ahead, np.full(window - 1, np.inf)))
+            horizon = reach[np.minimum(np.arange(len(reach)) + self.lookahead_segments, len(reach) - 1)]
+            backward = np.minimum(sliding_window_view(padded, window).min(axis=1), horizon) - reach
+        else:
+            backward = np.minimum.accumulate(ahead[::-1])[::-1] - reach
+        forward = reach + np.minimum.accumulate(backward - reach)
+        return np.maximum(np.minimum(backward, forward), 0.0)
@@ -1,28 +1,48 @@
 """
-SampleTransformPipeline: Servicio para muestrear y transformar paths SVG en listas de puntos, aplicando escalado y transformaciones.
+SampleTransformPipeline: Servicio para muestrear y transformar paths SVG en un StrokeBuffer, aplicando escalado y transformaciones.
 """
-from typing import List, Any
-from domain.entities.point import Point
+from typing import List, Any, Optional, Tuple
+import numpy as np
+from domain.entities.stroke_buffer import StrokeBuffer
 from domain.ports.path_sampler_port import PathSamplerPort
 from domain.ports.transform_manager_port import TransformManagerPort
 
 class SampleTransformPipeline:
-    " Servicio para muestrear y transformar paths SVG en listas de puntos, aplicando escalado y transformaciones. "
+    """
+    Servicio para muestrear y transformar paths SVG en trazos de puntos, aplicando escalado y transformaciones.
+    Todos los paths se muestrean en un único StrokeBuffer (sample_buffer si el muestreador lo ofrece) y las
+    transformaciones y el escalado se aplican en bloque sobre ese buffer.
+    Tras process(), `bounds` contiene (xmin, xmax, ymin, ymax) de los puntos generados (None si no hay puntos).
+    """
     def __init__(self, path_sampler: PathSamplerPort, transform_manager: TransformManagerPort, scale: float):
         self.path_sampler = path_sampler
         self.transform_manager = transform_manager
         self.scale = scale
+        self.bounds: Optional[Tuple[float, float, float, float]] = None
 
-    def process(self, paths: List[Any]) -> List[List[Point]]:
-        " Procesa los paths, muestrea y transforma cada uno en una lista de puntos. "
-        result = []
+    def process(self, paths: List[Any]) -> StrokeBuffer:
+        " Procesa los paths: un trazo muestreado, transformado y escalado por path (mismo orden). "
         for idx, p in enumerate(paths):
             if not hasattr(p, '__iter__') or isinstance(p, (str, bytes)):
                 raise TypeError(f"[ERROR] Path {idx} no es iterable: {type(p)}. Se esperaba una lista de segmentos.")
-            points = []
-            for pt in self.path_sampler.sample(p):
-                x, y = self.transform_manager.apply(pt.x, pt.y)
-                x, y = x * self.scale, y * self.scale
-                points.append(Point(x, y))
-            result.append(points)
-        return result
+        buffer = self._sample(paths)
+        if buffer.point_count:
+            buffer = self._apply_transform(buffer)
+            buffer = buffer.with_coords(buffer.coords * self.scale)
+        self.bounds = buffer.bounds()
+        return buffer
+
+    def _sample(self, paths: List[Any]) -> StrokeBuffer:
+        " Muestrea todos los paths en un único StrokeBuffer. "
+        if hasattr(self.path_sampler, 'sample_buffer'):
+            return self.path_sampler.sample_buffer(paths)
+        return StrokeBuffer.from_point_lists(self.path_sampler.sample(p) for p in paths)
+
+    def _apply_transform(self, buffer: StrokeBuffer) -> StrokeBuffer:
+        " Aplica las transformaciones en bloque si el manager lo soporta; si no, punto a punto. "
+        if hasattr(self.transform_manager, 'apply_buffer'):
+            return self.transform_manager.apply_buffer(buffer)
+        if hasattr(self.transform_manager, 'apply_array'):
+            xs, ys = self.transform_manager.apply_array(buffer.coords[:, 0], buffer.coords[:, 1])
+            return buffer.with_coords(np.column_stack((xs, ys)))
+        return buffer.with_coords([self.transform_manager.apply(x, y) for x, y in buffer.coords.tolist()])
@@ -18,3 +18,15 @@ class CompressGcodeUseCase:
             'compression_ratio': metrics.compressed_lines / metrics.original_lines if metrics.original_lines else 0,
             'compressed_gcode': compressed
         }
+
+    def execute_stream(self, gcode_data):
+        """
+        Igual que execute(), pero sobre un flujo de líneas: 'compressed_gcode' es un iterador y
+        'metrics' (CompressionMetrics) se completa cuando el iterador se agota.
+        """
+        config = self.config_reader.get_compression_config()
+        if not hasattr(self.compression_service, 'compress_stream'):
+            compressed, metrics = self.compression_service.compress(list(gcode_data), config)
+            return {'compressed_gcode': iter(compressed), 'metrics': metrics}
+        compressed, metrics = self.compression_service.compress_stream(gcode_data, config)
+        return {'compressed_gcode': compressed, 'metrics': metrics}
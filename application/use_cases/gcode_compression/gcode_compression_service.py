@@ -3,7 +3,7 @@ Path: application/use_cases/gcode_compression/gcode_compression_service.py
 Servicio de aplicación para compresión de G-code
 """
 
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 from domain.ports.gcode_compression_port import GcodeCompressionPort
 from domain.compression_metrics import CompressionMetrics
 from domain.compression_config import CompressionConfig
@@ -76,3 +76,60 @@ class GcodeCompressionService:
 
         self._debug(self.i18n.get('INFO_COMPRESSION_SUMMARY', orig=metrics.original_lines, comp=metrics.compressed_lines, ratio=(1 - metrics.compressed_lines / metrics.original_lines) * 100))
         return compressed, metrics
+
+    def compress_stream(self, gcode_lines: Iterable[str], config: CompressionConfig) -> Tuple[Iterator[str], CompressionMetrics]:
+        """
+        Versión en flujo de compress(): devuelve (iterador de líneas comprimidas, métricas).
+        La validación y los compresores se aplican línea a línea mientras se consume el iterador;
+        las métricas quedan completas cuando se agota. Una línea inválida (o un flujo vacío)
+        lanza ValueError en el momento en que se alcanza.
+        """
+        self._debug(f"{self.i18n.get('INFO_COMPRESSION', default='Inicio de compresión.')} En flujo. Config: enabled={config.enabled}, tolerancia={getattr(config, 'geometric_tolerance', None)}")
+        metrics = CompressionMetrics(original_lines=0, compressed_lines=0)
+        stream = self._validated(gcode_lines, metrics)
+        if not config.enabled:
+            if self.logger:
+                self.logger.info(self.i18n.get('INFO_COMPRESSION', default='Compresión deshabilitada por configuración.'))
+        elif not self.compressors:
+            if self.logger:
+                self.logger.info(self.i18n.get('INFO_COMPRESSION', default='No hay compresores activos. Se omite compresión.'))
+        else:
+            for compressor in self.compressors:
+                self._debug(self.i18n.get('INFO_COMPRESSION', default=f"Ejecutando compresor: {compressor.__class__.__name__}"))
+                if hasattr(compressor, 'compress_stream'):
+                    stream = compressor.compress_stream(stream, config.geometric_tolerance, metrics)
+                else:
+                    stream = self._materialized(compressor, stream, config.geometric_tolerance, metrics)
+        return self._counted(stream, metrics), metrics
+
+    def _validated(self, gcode_lines: Iterable[str], metrics: CompressionMetrics) -> Iterator[str]:
+        " Valida cada línea al pasar y cuenta las líneas originales. "
+        for idx, line in enumerate(gcode_lines, 1):
+            error = GCodeValidator.validate_line(idx, line)
+            if error:
+                self._invalid(error)
+            metrics.original_lines = idx
+            yield line
+        if not metrics.original_lines:
+            self._invalid(GCodeValidator.EMPTY_ERROR)
+
+    def _invalid(self, error):
+        if self.logger:
+            self.logger.error(self.i18n.get('ERROR_GCODE_GENERATION', error=error) if self.i18n else f"Validación G-code fallida: {error}")
+        raise ValueError(f"Archivo G-code inválido: {error}")
+
+    @staticmethod
+    def _materialized(compressor, stream: Iterable[str], tolerance: float, metrics: CompressionMetrics) -> Iterator[str]:
+        " Compresores sin soporte de flujo: se materializa la entrada y se delega en compress(). "
+        compressed, comp_metrics = compressor.compress(list(stream), tolerance)
+        metrics.arcs_created += comp_metrics.arcs_created
+        metrics.relative_moves += comp_metrics.relative_moves
+        metrics.redundancies_removed += comp_metrics.redundancies_removed
+        yield from compressed
+
+    def _counted(self, stream: Iterable[str], metrics: CompressionMetrics) -> Iterator[str]:
+        for line in stream:
+            metrics.compressed_lines += 1
+            yield line
+        if metrics.original_lines:
+            self._debug(self.i18n.get('INFO_COMPRESSION_SUMMARY', orig=metrics.original_lines, comp=metrics.compressed_lines, ratio=(1 - metrics.compressed_lines / metrics.original_lines) * 100))
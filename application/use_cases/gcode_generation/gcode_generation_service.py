@@ -2,7 +2,7 @@
 Servicio de aplicación para generación de G-code a partir de paths y atributos SVG.
 (Movido desde domain/gcode_generation_service.py)
 """
-from typing import List, Any
+from typing import Iterator, List, Any
 from domain.ports.gcode_generator_port import GcodeGeneratorPort
 
 class GCodeGenerationService:
@@ -16,3 +16,12 @@ class GCodeGenerationService:
         """
         # Usar el método global del adaptador para optimización y logs
         return self.generator.generate(paths, svg_attr, context=context)
+
+    def generate_stream(self, paths: List[Any], svg_attr: dict, context=None) -> Iterator[str]:
+        """
+        Genera las líneas de G-code como un iterador, si el generador lo soporta
+        (si no, itera sobre la lista completa de generate()).
+        """
+        if hasattr(self.generator, 'generate_stream'):
+            return self.generator.generate_stream(paths, svg_attr, context=context)
+        return iter(self.generator.generate(paths, svg_attr, context=context))
@@ -1,4 +1,5 @@
 from domain.ports.gcode_optimization_chain_port import GcodeOptimizationChainPort
+from domain.gcode.command_buffer import CommandBuffer
 from domain.services.optimization.arc_optimizer import ArcOptimizer
 from domain.services.optimization.colinear_optimizer import ColinearOptimizer
 
@@ -11,9 +12,16 @@ class OptimizationChain(GcodeOptimizationChainPort):
         self.optimizers = optimizers or default_optimizers
 
     def optimize(self, commands):
-        current_commands = commands
+        " Aplica los optimizadores sobre un único CommandBuffer; devuelve el formato de la entrada (lista o buffer). "
+        current_commands = CommandBuffer.from_commands(commands)
         metrics = {}
         for optimizer in self.optimizers:
-            current_commands, opt_metrics = optimizer.optimize(current_commands)
+            if hasattr(optimizer, 'optimize_buffer'):
+                current_commands, opt_metrics = optimizer.optimize_buffer(current_commands)
+            else:
+                result, opt_metrics = optimizer.optimize(current_commands.to_commands())
+                current_commands = CommandBuffer.from_commands(result)
             metrics.update(opt_metrics)
-        return current_commands, metrics
+        if isinstance(commands, CommandBuffer):
+            return current_commands, metrics
+        return current_commands.to_commands(), metrics
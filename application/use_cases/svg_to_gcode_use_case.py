@@ -56,21 +56,26 @@ class SvgToGcodeUseCase(LoggerHelper):
             self.logger.error(self.i18n.get('ERROR_PROCESSING_PATHS', error=str(e)), exc_info=True)
             raise
 
+    def _apply_offset(self, processed_paths, context):
+        " Aplica el offset del contexto a las coordenadas. "
+        offset_x = context.get('offset_x', 0) if context else 0
+        offset_y = context.get('offset_y', 0) if context else 0
+        if offset_x or offset_y:
+            def apply_offset(path):
+                # Aplica offset solo a los dos primeros valores de cada punto
+                return [
+                    tuple([p[0] + offset_x, p[1] + offset_y] + list(p[2:])) if isinstance(p, (list, tuple)) and len(p) >= 2 else p
+                    for p in path
+                ]
+            processed_paths = [apply_offset(path) for path in processed_paths]
+            self._debug(f"Offset aplicado: X={offset_x}, Y={offset_y}")
+        return processed_paths
+
     def _generate_gcode(self, processed_paths, svg_attr, context):
         try:
             self._debug(self.i18n.get('DEBUG_GCODE_CONTEXT', context=context))
             # --- Aplicar offset a las coordenadas ---
-            offset_x = context.get('offset_x', 0) if context else 0
-            offset_y = context.get('offset_y', 0) if context else 0
-            if offset_x or offset_y:
-                def apply_offset(path):
-                    # Aplica offset solo a los dos primeros valores de cada punto
-                    return [
-                        tuple([p[0] + offset_x, p[1] + offset_y] + list(p[2:])) if isinstance(p, (list, tuple)) and len(p) >= 2 else p
-                        for p in path
-                    ]
-                processed_paths = [apply_offset(path) for path in processed_paths]
-                self._debug(f"Offset aplicado: X={offset_x}, Y={offset_y}")
+            processed_paths = self._apply_offset(processed_paths, context)
             gcode_lines = self.gcode_generation_service.generate(
                 processed_paths,
                 svg_attr,
@@ -100,12 +105,65 @@ class SvgToGcodeUseCase(LoggerHelper):
             self.logger.error(self.i18n.get('ERROR_GCODE_COMPRESSION', error=str(e)), exc_info=True)
             raise
 
+    def _generate_gcode_stream(self, processed_paths, svg_attr, context):
+        try:
+            self._debug(self.i18n.get('DEBUG_GCODE_CONTEXT', context=context))
+            processed_paths = self._apply_offset(processed_paths, context)
+            if hasattr(self.gcode_generation_service, 'generate_stream'):
+                return self.gcode_generation_service.generate_stream(processed_paths, svg_attr, context=context)
+            return iter(self.gcode_generation_service.generate(processed_paths, svg_attr, context=context))
+        except Exception as e:
+            self.logger.error(self.i18n.get('ERROR_GCODE_GENERATION', error=str(e)), exc_info=True)
+            raise
+
+    def _compress_gcode_stream(self, gcode_lines):
+        if hasattr(self.gcode_compression_use_case, 'execute_stream'):
+            return self.gcode_compression_use_case.execute_stream(gcode_lines)
+        compression_result = self.gcode_compression_use_case.execute(list(gcode_lines))
+        return {'compressed_gcode': iter(compression_result.get('compressed_gcode', [])), 'metrics': None}
+
     def execute(
         self,
         svg_file: Path,
         context: dict = None
     ):
         " Orquesta la conversión de SVG a G-code, incluyendo carga, procesamiento, generación y compresión. "
+        svg_attr, processed_paths = self._load_and_process(svg_file, context)
+        gcode_lines = self._generate_gcode(processed_paths, svg_attr, context)
+        compressed_gcode, compression_result = self._compress_gcode(gcode_lines, svg_file)
+        return {
+            'svg_file': svg_file,
+            'svg_attr': svg_attr,
+            'processed_paths': processed_paths,
+            'gcode_lines': gcode_lines,
+            'compressed_gcode': compressed_gcode,
+            'compression_result': compression_result
+        }
+
+    def execute_stream(
+        self,
+        svg_file: Path,
+        context: dict = None
+    ):
+        """
+        Igual que execute(), pero 'compressed_gcode' es un iterador de líneas: la generación y la
+        compresión avanzan a medida que se consume (por ejemplo, mientras se escribe el archivo).
+        No incluye 'gcode_lines' (el G-code sin comprimir no se retiene); 'compression_result'
+        trae 'metrics', que se completa al agotar el iterador.
+        """
+        svg_attr, processed_paths = self._load_and_process(svg_file, context)
+        gcode_lines = self._generate_gcode_stream(processed_paths, svg_attr, context)
+        compression_result = self._compress_gcode_stream(gcode_lines)
+        return {
+            'svg_file': svg_file,
+            'svg_attr': svg_attr,
+            'processed_paths': processed_paths,
+            'compressed_gcode': compression_result['compressed_gcode'],
+            'compression_result': compression_result
+        }
+
+    def _load_and_process(self, svg_file: Path, context: dict = None):
+        " Carga el SVG, aplica la rotación configurada y procesa los paths. Devuelve (svg_attr, processed_paths). "
         self._debug(f"Iniciando carga de SVG: {svg_file}")
         _, paths, svg_attr = self._load_svg(svg_file)
         # Rotar paths si la configuración lo indica
@@ -128,13 +186,4 @@ class SvgToGcodeUseCase(LoggerHelper):
             after = str(paths[0]) if paths else 'N/A'
             self._debug(f"Se ejecutó rotación 90°. Antes: {before} | Después: {after}")
         processed_paths = self._process_paths(paths, svg_attr, svg_file, context=context)
-        gcode_lines = self._generate_gcode(processed_paths, svg_attr, context)
-        compressed_gcode, compression_result = self._compress_gcode(gcode_lines, svg_file)
-        return {
-            'svg_file': svg_file,
-            'svg_attr': svg_attr,
-            'processed_paths': processed_paths,
-            'gcode_lines': gcode_lines,
-            'compressed_gcode': compressed_gcode,
-            'compression_result': compression_result
-        }
+        return svg_attr, processed_paths
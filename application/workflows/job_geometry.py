@@ -0,0 +1,21 @@
+"""
+Módulo auxiliar para compartir la geometría de un trabajo entre workflow, casos de uso y generador.
+"""
+from domain.geometry.bounding_box_calculator import BoundingBoxCalculator
+
+
+def job_svg_loader_factory(get_svg_loader):
+    """
+    Inicia un trabajo: vacía la caché de bounding boxes y devuelve una factory de loaders que
+    parsea cada archivo SVG una sola vez. Así el workflow y el caso de uso reciben los mismos
+    segmentos y el bbox exacto se calcula una única vez por trabajo.
+    """
+    BoundingBoxCalculator.clear_cache()
+    loaders = {}
+
+    def factory(svg_file):
+        key = str(svg_file)
+        if key not in loaders:
+            loaders[key] = get_svg_loader(svg_file)
+        return loaders[key]
+    return factory
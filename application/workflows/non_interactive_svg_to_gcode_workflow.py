@@ -4,6 +4,7 @@ Workflow para el modo no interactivo de generación de G-code desde SVG.
 
 from application.workflows.input_handler import InputHandler
 from application.workflows.processing_strategies import SvgProcessingStrategy, GcodeProcessingStrategy
+from infrastructure.factories.motion_simulator_factory import create_motion_simulator
 
 class NonInteractiveSvgToGcodeWorkflow:
     " Flujo de trabajo no interactivo para convertir SVG a G-code. "
@@ -11,6 +12,7 @@ class NonInteractiveSvgToGcodeWorkflow:
         """Método dummy para compatibilidad con flujos que lo requieran."""
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write('\n'.join(gcode_lines))
+
     def __init__(self, container, presenter, filename_service, config,
                  svg_strategy=None, gcode_strategy=None, input_handler=None):
         self.container = container
@@ -39,3 +41,10 @@ class NonInteractiveSvgToGcodeWorkflow:
             self.presenter.print("error_occurred", color='red')
             return 3
         return strategy.process(self, args, input_data, temp_path, output_path, optimize, rescale)
+
+    def report_plot_time(self, gcode_lines):
+        " Simula el G-code e informa el tiempo estimado de ploteo (opción --estimate-time). "
+        estimate = create_motion_simulator(self.config).estimate_lines(gcode_lines)
+        self.presenter.print(self.presenter.i18n.get(
+            "INFO_PLOT_ESTIMATE", time=estimate.duration_text, **vars(estimate)), color='green')
+        return estimate
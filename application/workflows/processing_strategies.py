@@ -3,6 +3,7 @@ Estrategias para el procesamiento de entrada en el workflow no interactivo.
 """
 from abc import ABC, abstractmethod
 from pathlib import Path
+from application.workflows.job_geometry import job_svg_loader_factory
 
 class ProcessingStrategy(ABC):
     " "
@@ -45,7 +46,7 @@ class SvgProcessingStrategy(ProcessingStrategy):
                 available = ', '.join(presets.keys())
                 workflow.presenter.print(f"[ERROR] El preset '{surface_preset}' no existe. Disponibles: {available}", color='red')
                 return 2
-        svg_loader_factory = workflow.container.get_svg_loader
+        svg_loader_factory = job_svg_loader_factory(workflow.container.get_svg_loader)
         workflow.presenter.print("processing_start", color='blue')
         if input_data is not None:
             # SVG desde stdin
@@ -94,6 +95,8 @@ class SvgProcessingStrategy(ProcessingStrategy):
         }
         result = svg_to_gcode_use_case.execute(temp_path, context=context)
         gcode_lines = result['compressed_gcode'] if optimize else result['gcode_lines']
+        if getattr(args, 'estimate_time', False):
+            workflow.report_plot_time(gcode_lines)
         if output_path == '-' or output_path is None:
             import sys
             sys.stdout.write("\n".join(gcode_lines) + "\n")
@@ -125,6 +128,8 @@ class GcodeProcessingStrategy(ProcessingStrategy):
             )
             result = refactor_use_case.execute(temp_path)
             gcode_out = open(result['output_file'], encoding='utf-8').read().splitlines()
+            if getattr(args, 'estimate_time', False):
+                workflow.report_plot_time(gcode_out)
             if output_path == '-' or output_path is None:
                 import sys
                 sys.stdout.write("\n".join(gcode_out) + "\n")
@@ -160,5 +165,10 @@ class GcodeProcessingStrategy(ProcessingStrategy):
                 workflow.presenter.print("rescale_factor", factor=result.get('scale_factor', 1.0))
                 workflow.presenter.print("rescale_cmds", g0g1=result['commands_rescaled']['g0g1'], g2g3=result['commands_rescaled']['g2g3'])
                 return 0
+        if getattr(args, 'estimate_time', False):
+            # Solo estimación: el G-code de entrada no se modifica
+            with open(temp_path, encoding='utf-8') as f:
+                workflow.report_plot_time(f.read().splitlines())
+            return 0
         workflow.presenter.print("error_occurred", color='red')
         return 3
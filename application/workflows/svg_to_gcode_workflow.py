@@ -14,15 +14,21 @@ from application.use_cases.gcode_generation.gcode_generation_service import GCod
 from application.use_cases.path_processing.path_processing_service import PathProcessingService
 from application.use_cases.gcode_compression.compress_gcode_use_case import CompressGcodeUseCase
 from application.use_cases.svg_to_gcode_use_case import SvgToGcodeUseCase
+from application.workflows.job_geometry import job_svg_loader_factory
 from domain.services.path_transform_strategies import VerticalFlipStrategy
-from utils.gcode_offset import calcular_offset_y, aplicar_offset_y_a_gcode
+from domain.gcode.motion_simulator import PlotEstimate
+from infrastructure.factories.motion_simulator_factory import create_motion_simulator
+from utils.gcode_offset import calcular_offset_y, iterar_offset_y_a_gcode
+from utils.gcode_writer import escribir_gcode
 
 
 class SvgToGcodeWorkflow(LoggerHelper):
     " Workflow para convertir SVG a GCODE. "
 
-    def __init__(self, container, presenter, filename_service, config, offset_x=None, offset_y=None, center=False):
+    def __init__(self, container, presenter, filename_service, config, offset_x=None, offset_y=None, center=False,
+                 estimate_time=False):
         super().__init__()
+        self.estimate_time = estimate_time
         self.offset_x = offset_x
         self.offset_y = offset_y
         self.center = center
@@ -52,7 +58,7 @@ class SvgToGcodeWorkflow(LoggerHelper):
             gcode_file = self.filename_service.next_filename(svg_file)
             gcode_file_str = str(gcode_file).replace('\\', '/')
             self._debug(self.i18n.get("INFO_GCODE_OUTPUT", filename=gcode_file_str))
-            svg_loader_factory = self.container.get_svg_loader
+            svg_loader_factory = job_svg_loader_factory(self.container.get_svg_loader)
             self._debug(self.i18n.get("INFO_PROCESSING_FILE"))
             try:
                 paths = svg_loader_factory(svg_file).get_paths()
@@ -111,7 +117,7 @@ class SvgToGcodeWorkflow(LoggerHelper):
                 i18n=self.i18n
             )
             gcode_service = GCodeGenerationService(generator)
-            compression_service = create_gcode_compression_service(logger=self.logger, i18n=self.i18n)
+            compression_service = create_gcode_compression_service(logger=self.logger, i18n=self.i18n, config=self.config)
             config_reader = AdapterFactory.create_config_adapter(self.config)
             compress_use_case = CompressGcodeUseCase(compression_service, config_reader)
             svg_to_gcode_use_case = SvgToGcodeUseCase(
@@ -171,7 +177,8 @@ class SvgToGcodeWorkflow(LoggerHelper):
             }
             self._debug(self.i18n.get("debug_executing_svg_to_gcode_usecase"))
             try:
-                result = svg_to_gcode_use_case.execute(svg_file, context=context)
+                # En flujo: las líneas se generan y comprimen mientras se escriben en disco
+                result = svg_to_gcode_use_case.execute_stream(svg_file, context=context)
             except (OSError, ValueError) as e:
                 self.logger.error(self.i18n.get("error_svg_to_gcode_usecase", error=str(e)))
                 self.logger.error(self.i18n.get("error_no_svg"))
@@ -184,45 +191,37 @@ class SvgToGcodeWorkflow(LoggerHelper):
             self._debug(f"[DEBUG] PLOTTER_MAX_AREA_MM: {plotter_max_area_mm}")
             self._debug(f"[DEBUG] TARGET_WRITE_AREA_MM: {target_write_area_mm}")
             offset_y = 0.0
+            # Rango Y escrito, para la validación de overflow (se completa durante la escritura)
+            y_range = [None, None]
             if rotate_90:
                 offset_y = calcular_offset_y(plotter_max_area_mm, target_write_area_mm)
                 self._debug(f"[DEBUG] Offset Y calculado: {offset_y}")
-                gcode_lines = aplicar_offset_y_a_gcode(gcode_lines, offset_y)
-                self._debug("[DEBUG] Offset Y aplicado a todas las líneas G-code.")
-
-                # Validación de overflow en coordenadas Y
-                y_min = None
-                y_max = None
-                for line in gcode_lines:
-                    match = re.search(r'Y([\-\d\.]+)', line)
-                    if match:
-                        y_val = float(match.group(1))
-                        if y_min is None or y_val < y_min:
-                            y_min = y_val
-                        if y_max is None or y_val > y_max:
-                            y_max = y_val
-                area_h = target_write_area_mm[1]
-                plotter_h = plotter_max_area_mm[1]
-                if y_min is not None and (y_min < 0 or y_max > plotter_h):
-                    self.logger.warning(f"[WARN] Overflow Y detectado: y_min={y_min}, y_max={y_max}, límite plotter={plotter_h}")
-                else:
-                    self._debug(f"[DEBUG] Offset Y aplicado correctamente: y_min={y_min}, y_max={y_max}, límite plotter={plotter_h}")
+                gcode_lines = self._track_y_range(iterar_offset_y_a_gcode(gcode_lines, offset_y), y_range)
             flip_vertical = getattr(self.config, 'flip_vertical', False)
             if flip_vertical:
                 self._debug("[DEBUG] FLIP_VERTICAL está activo y afecta la transformación geométrica.")
-            total_lines = len(gcode_lines)
-            for i, _ in enumerate(gcode_lines, 1):
-                if i % max(1, total_lines // 100) == 0 or i == total_lines:
-                    if i % max(1, total_lines // 10) == 0 or i == total_lines:
-                        self._debug(self.i18n.get("debug_gcode_write_progress_simple", current=i, total=total_lines))
+            # Estimación del tiempo de ploteo, simulada mientras se escribe el archivo
+            plot_estimate = None
+            if self.estimate_time:
+                plot_estimate = PlotEstimate()
+                gcode_lines = create_motion_simulator(self.config).stream_lines(gcode_lines, plot_estimate)
             try:
-                with gcode_file.open("w", encoding="utf-8") as f:
-                    f.write("\n".join(gcode_lines))
+                total_lines = escribir_gcode(gcode_file, gcode_lines)
+                self._debug(self.i18n.get("debug_gcode_write_progress_simple", current=total_lines, total=total_lines))
                 self._debug(self.i18n.get("INFO_GCODE_WRITTEN", filename=gcode_file_str))
-            except (OSError, IOError) as e:
+            except (OSError, IOError, ValueError) as e:
                 self.logger.error(self.i18n.get("error_gcode_write", error=str(e)))
                 self.logger.error(self.i18n.get("error_no_svg"))
                 return False
+            if rotate_90:
+                self._debug("[DEBUG] Offset Y aplicado a todas las líneas G-code.")
+                # Validación de overflow en coordenadas Y
+                y_min, y_max = y_range
+                plotter_h = plotter_max_area_mm[1]
+                if y_min is not None and (y_min < 0 or y_max > plotter_h):
+                    self.logger.warning(f"[WARN] Overflow Y detectado: y_min={y_min}, y_max={y_max}, límite plotter={plotter_h}")
+                else:
+                    self._debug(f"[DEBUG] Offset Y aplicado correctamente: y_min={y_min}, y_max={y_max}, límite plotter={plotter_h}")
             # Separador visual antes de logs técnicos si modo dev
             self.container.event_bus.publish(
                 'gcode_generated',
@@ -232,5 +231,20 @@ class SvgToGcodeWorkflow(LoggerHelper):
                 }
             )
             self.logger.info(self.i18n.get("INFO_GCODE_SUCCESS", filename=gcode_file_str))
+            if plot_estimate is not None:
+                self.logger.info(self.i18n.get("INFO_PLOT_ESTIMATE", time=plot_estimate.duration_text, **vars(plot_estimate)))
             self._debug(self.i18n.get("info_workflow_completed"))
             return True
+
+    @staticmethod
+    def _track_y_range(gcode_lines, y_range):
+        " Deja pasar las líneas y acumula en y_range [mínimo, máximo] las coordenadas Y encontradas. "
+        for line in gcode_lines:
+            match = re.search(r'Y([\-\d\.]+)', line)
+            if match:
+                y_val = float(match.group(1))
+                if y_range[0] is None or y_val < y_range[0]:
+                    y_range[0] = y_val
+                if y_range[1] is None or y_val > y_range[1]:
+                    y_range[1] = y_val
+            yield line
@@ -63,6 +63,17 @@ def create_parser() -> argparse.ArgumentParser:
         default=None,
         help="Offset vertical en mm (desplazamiento Y del dibujo en el área útil)"
     )
+    parser.add_argument(
+        "--order-strategy",
+        choices=["greedy", "hilbert", "morton", "tiled"],
+        default=None,
+        help=get_message('ARG_ORDER_STRATEGY')
+    )
+    parser.add_argument(
+        "--estimate-time",
+        action="store_true",
+        help=get_message('ARG_ESTIMATE_TIME')
+    )
     parser.add_argument(
         "--center",
         action="store_true",
@@ -63,6 +63,10 @@ class SvgToGcodeApp:
         self.offset_x = getattr(args, 'offset_x', None)
         self.offset_y = getattr(args, 'offset_y', None)
         self.center = getattr(args, 'center', False)
+        # Estrategia de orden de trazos indicada por CLI (sobrescribe ORDER_STRATEGY)
+        order_strategy = getattr(args, 'order_strategy', None)
+        if order_strategy:
+            self.config.set("ORDER_STRATEGY", order_strategy)
         self.svg_to_gcode_workflow = SvgToGcodeWorkflow(
             self.container,
             self.presenter,
@@ -70,7 +74,8 @@ class SvgToGcodeApp:
             self.config,
             offset_x=self.offset_x,
             offset_y=self.offset_y,
-            center=self.center
+            center=self.center,
+            estimate_time=getattr(args, 'estimate_time', False)
         )
         self.gcode_to_gcode_workflow = GcodeToGcodeWorkflow(
             self.container,
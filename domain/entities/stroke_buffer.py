@@ -0,0 +1,143 @@
+"""
+Entidades PointArray y StrokeBuffer: geometría muestreada respaldada por arrays contiguos float64.
+"""
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from domain.entities.point import Point
+
+
+class PointArray:
+    """
+    Vista de solo lectura sobre un array (n, 2) de coordenadas de un trazo.
+    Se comporta como una secuencia de Point (len, índice, iteración) sin crear los Point por adelantado.
+    """
+    __slots__ = ("coords",)
+
+    def __init__(self, coords: np.ndarray):
+        self.coords = coords
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self.coords[:, 0]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self.coords[:, 1]
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PointArray(self.coords[index])
+        x, y = self.coords[index].tolist()
+        return Point(x, y)
+
+    def __iter__(self) -> Iterator[Point]:
+        for x, y in self.coords.tolist():
+            yield Point(x, y)
+
+    def __repr__(self) -> str:
+        return f"PointArray({len(self)} puntos)"
+
+
+class StrokeBuffer:
+    """
+    Conjunto de trazos (polilíneas) en un único buffer contiguo.
+
+    - coords: array (N, 2) float64 con los puntos de todos los trazos, uno tras otro.
+    - offsets: array int64 de len(trazos) + 1; el trazo i es coords[offsets[i]:offsets[i + 1]].
+    - Indexar o iterar devuelve un PointArray por trazo (los trazos vacíos tienen longitud 0).
+    """
+    __slots__ = ("coords", "offsets")
+
+    def __init__(self, coords: np.ndarray, offsets: np.ndarray):
+        coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(coords):
+            raise ValueError("offsets debe empezar en 0 y terminar en la cantidad de puntos")
+        if np.any(np.diff(offsets) < 0):
+            raise ValueError("offsets debe ser no decreciente")
+        self.coords = coords
+        self.offsets = offsets
+
+    @classmethod
+    def empty(cls, strokes: int = 0) -> "StrokeBuffer":
+        " Buffer sin puntos con `strokes` trazos vacíos. "
+        return cls(np.empty((0, 2)), np.zeros(strokes + 1, dtype=np.int64))
+
+    @classmethod
+    def from_arrays(cls, chunks: Iterable[np.ndarray]) -> "StrokeBuffer":
+        " Construye el buffer concatenando un array (n, 2) por trazo. "
+        chunks = [np.asarray(c, dtype=np.float64).reshape(-1, 2) for c in chunks]
+        if not chunks:
+            return cls.empty()
+        offsets = np.concatenate(([0], np.cumsum([len(c) for c in chunks])))
+        return cls(np.concatenate(chunks), offsets)
+
+    @classmethod
+    def from_point_lists(cls, strokes: Iterable[Iterable[Point]]) -> "StrokeBuffer":
+        " Construye el buffer a partir de listas de Point (o de objetos con .x y .y). "
+        if isinstance(strokes, StrokeBuffer):
+            return strokes
+        return cls.from_arrays(
+            s.coords if isinstance(s, PointArray) else [(pt.x, pt.y) for pt in s] for s in strokes
+        )
+
+    @property
+    def point_count(self) -> int:
+        return len(self.coords)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> PointArray:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de trazo fuera de rango")
+        return PointArray(self.coords[self.offsets[index]:self.offsets[index + 1]])
+
+    def __iter__(self) -> Iterator[PointArray]:
+        bounds = self.offsets.tolist()
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            yield PointArray(self.coords[a:b])
+
+    def __repr__(self) -> str:
+        return f"StrokeBuffer({len(self)} trazos, {self.point_count} puntos)"
+
+    def bounds(self) -> Optional[Tuple[float, float, float, float]]:
+        " (xmin, xmax, ymin, ymax) de todos los puntos, o None si el buffer está vacío. "
+        if not self.point_count:
+            return None
+        lo = self.coords.min(axis=0).tolist()
+        hi = self.coords.max(axis=0).tolist()
+        return lo[0], hi[0], lo[1], hi[1]
+
+    def with_coords(self, coords: np.ndarray) -> "StrokeBuffer":
+        " Nuevo buffer con las mismas divisiones de trazos y otras coordenadas (misma cantidad de puntos). "
+        return StrokeBuffer(coords, self.offsets)
+
+    def scaled(self, factor: float) -> "StrokeBuffer":
+        " Nuevo buffer con todas las coordenadas multiplicadas por `factor`. "
+        return self.with_coords(self.coords * factor)
+
+    def snapped(self, decimals: int) -> "StrokeBuffer":
+        """
+        Nuevo buffer con las coordenadas redondeadas a la grilla de salida (10^-decimals mm) y sin los
+        puntos que repiten a su predecesor en el mismo trazo (segmentos de longitud cero en la salida).
+        El primer punto de cada trazo se conserva siempre; los trazos no cambian de cantidad.
+        """
+        scale = 10.0 ** decimals
+        # + 0.0 normaliza -0.0 (evita "-0.000" en la salida)
+        grid = np.rint(self.coords * scale) + 0.0
+        keep = np.ones(len(grid), dtype=bool)
+        keep[1:] = np.any(grid[1:] != grid[:-1], axis=1)
+        starts = self.offsets[:-1][np.diff(self.offsets) > 0]
+        keep[starts] = True
+        offsets = np.concatenate(([0], np.cumsum(keep)))[self.offsets]
+        return StrokeBuffer(grid[keep] / scale, offsets)
+
+    def to_point_lists(self) -> List[List[Point]]:
+        " Convierte el buffer a listas de Point (para APIs pequeñas o compatibilidad). "
+        return [list(stroke) for stroke in self]
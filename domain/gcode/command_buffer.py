@@ -0,0 +1,208 @@
+"""
+CommandBuffer: Secuencia de comandos G-code almacenada por columnas (struct-of-arrays) en arrays NumPy.
+"""
+from typing import Any, Iterable, List
+import numpy as np
+from domain.gcode.commands.base_command import BaseCommand
+from domain.gcode.commands.move_command import MoveCommand
+from domain.gcode.commands.arc_command import ArcCommand, RelativeMoveCommand
+from domain.gcode.commands.dwell_command import DwellCommand
+from domain.gcode.commands.tool_up_command import ToolUpCommand
+from domain.gcode.commands.tool_down_command import ToolDownCommand
+
+
+class CommandBuffer:
+    """
+    Comandos G-code como columnas paralelas: op (opcode), x, y, i, j, feed, dwell y ref.
+
+    - Las columnas numéricas son float64; NaN indica "sin valor" (por ejemplo, un G1 sin F).
+    - ref indexa la lista `refs`: texto de ToolUp/ToolDown u objeto original de un comando RAW
+      (comandos sin columnas propias, como comentarios); -1 si el comando no tiene referencia.
+    - append() acumula filas sueltas y extend_moves() agrega bloques de movimientos ya vectorizados;
+      las columnas se consolidan en arrays contiguos la primera vez que se leen.
+    - from_commands() / to_commands() convierten desde y hacia objetos BaseCommand.
+    """
+    RAPID, LINEAR, ARC_CW, ARC_CCW, DWELL, TOOL_UP, TOOL_DOWN, REL_RAPID, REL_LINEAR, RAW = range(10)
+    COLUMNS = ("x", "y", "i", "j", "feed", "dwell")
+
+    def __init__(self, op=None, x=None, y=None, i=None, j=None, feed=None, dwell=None, ref=None, refs=None):
+        self._op = np.asarray(op if op is not None else [], dtype=np.int8)
+        n = len(self._op)
+        self._cols = {}
+        for name, values in zip(self.COLUMNS, (x, y, i, j, feed, dwell)):
+            self._cols[name] = np.full(n, np.nan) if values is None else np.asarray(values, dtype=np.float64)
+        self._ref = np.full(n, -1, dtype=np.int32) if ref is None else np.asarray(ref, dtype=np.int32)
+        self.refs: List[Any] = list(refs) if refs is not None else []
+        self._rows = []
+        self._chunks = []
+        self._size = n
+
+    # --- Construcción ---
+    def append(self, op: int, x=np.nan, y=np.nan, i=np.nan, j=np.nan, feed=None, dwell=np.nan, ref=None):
+        " Agrega un comando. feed None se guarda como NaN; ref (texto u objeto) se agrega a refs. "
+        ref_index = -1
+        if ref is not None:
+            ref_index = len(self.refs)
+            self.refs.append(ref)
+        self._rows.append((op, x, y, i, j, np.nan if feed is None else feed, dwell, ref_index))
+        self._size += 1
+        return self
+
+    def extend_moves(self, op: int, xs, ys, feeds=None):
+        " Agrega un bloque de movimientos del mismo opcode a partir de arrays de coordenadas (y feed opcional). "
+        xs = np.asarray(xs, dtype=np.float64)
+        n = len(xs)
+        if not n:
+            return self
+        self._flush_rows()
+        nan = np.full(n, np.nan)
+        feeds = nan if feeds is None else np.asarray(feeds, dtype=np.float64)
+        self._chunks.append((np.full(n, op, dtype=np.int8), xs, np.asarray(ys, dtype=np.float64), nan, nan, feeds,
+                             nan, np.full(n, -1, dtype=np.int32)))
+        self._size += n
+        return self
+
+    def _flush_rows(self):
+        if not self._rows:
+            return
+        cols = list(zip(*self._rows))
+        self._rows = []
+        self._chunks.append((np.array(cols[0], dtype=np.int8),) +
+                            tuple(np.array(c, dtype=np.float64) for c in cols[1:7]) +
+                            (np.array(cols[7], dtype=np.int32),))
+
+    def _consolidate(self):
+        self._flush_rows()
+        if not self._chunks:
+            return
+        current = (self._op,) + tuple(self._cols[name] for name in self.COLUMNS) + (self._ref,)
+        merged = [np.concatenate(parts) for parts in zip(current, *self._chunks)]
+        self._chunks = []
+        self._op = merged[0]
+        for name, values in zip(self.COLUMNS, merged[1:7]):
+            self._cols[name] = values
+        self._ref = merged[7]
+        self._size = len(self._op)
+
+    # --- Columnas ---
+    @property
+    def op(self) -> np.ndarray:
+        self._consolidate()
+        return self._op
+
+    @property
+    def ref(self) -> np.ndarray:
+        self._consolidate()
+        return self._ref
+
+    def column(self, name: str) -> np.ndarray:
+        self._consolidate()
+        return self._cols[name]
+
+    x = property(lambda self: self.column("x"))
+    y = property(lambda self: self.column("y"))
+    i = property(lambda self: self.column("i"))
+    j = property(lambda self: self.column("j"))
+    feed = property(lambda self: self.column("feed"))
+    dwell = property(lambda self: self.column("dwell"))
+
+    def __len__(self) -> int:
+        # No consolida: se puede consultar después de cada append sin copiar columnas
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"CommandBuffer({len(self)} comandos)"
+
+    # --- Máscaras frecuentes ---
+    def is_linear(self) -> np.ndarray:
+        " Movimientos G1 absolutos (los que consolidan los optimizadores). "
+        return self.op == self.LINEAR
+
+    def has_xy(self) -> np.ndarray:
+        " Comandos con coordenadas X/Y (movimientos absolutos, relativos y arcos). "
+        return np.isin(self.op, (self.RAPID, self.LINEAR, self.ARC_CW, self.ARC_CCW, self.REL_RAPID, self.REL_LINEAR))
+
+    @staticmethod
+    def runs(mask: np.ndarray):
+        " Devuelve (inicios, fines exclusivos) de los tramos consecutivos donde mask es True. "
+        edges = np.diff(np.concatenate(([0], np.asarray(mask, dtype=np.int8), [0])))
+        return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    # --- Operaciones en bloque ---
+    def copy(self) -> "CommandBuffer":
+        return CommandBuffer(self.op.copy(), *(self.column(n).copy() for n in self.COLUMNS),
+                             ref=self.ref.copy(), refs=self.refs)
+
+    def take(self, indices) -> "CommandBuffer":
+        " Nuevo buffer con los comandos en `indices` (array de índices o máscara booleana). "
+        return CommandBuffer(self.op[indices], *(self.column(n)[indices] for n in self.COLUMNS),
+                             ref=self.ref[indices], refs=self.refs)
+
+    @staticmethod
+    def concatenate(buffers: Iterable["CommandBuffer"]) -> "CommandBuffer":
+        " Une varios buffers en uno (las referencias se reindexan). "
+        result = CommandBuffer()
+        for buf in buffers:
+            ref = buf.ref.copy()
+            ref[ref >= 0] += len(result.refs)
+            result.refs.extend(buf.refs)
+            result._chunks.append((buf.op,) + tuple(buf.column(n) for n in buf.COLUMNS) + (ref,))
+        result._consolidate()
+        return result
+
+    # --- Conversión desde/hacia objetos ---
+    @classmethod
+    def from_commands(cls, commands: Iterable[BaseCommand]) -> "CommandBuffer":
+        " Convierte una lista de BaseCommand en un CommandBuffer (los tipos desconocidos quedan como RAW). "
+        if isinstance(commands, CommandBuffer):
+            return commands
+        buf = cls()
+        nan = np.nan
+        for cmd in commands:
+            kind = type(cmd)
+            if kind is MoveCommand:
+                buf.append(cls.RAPID if cmd.rapid else cls.LINEAR, cmd.x, cmd.y, feed=cmd.feed)
+            elif kind is ArcCommand:
+                buf.append(cls.ARC_CW if cmd.clockwise else cls.ARC_CCW, cmd.x, cmd.y, cmd.i, cmd.j, feed=cmd.feed)
+            elif kind is RelativeMoveCommand:
+                buf.append(cls.REL_RAPID if cmd.rapid else cls.REL_LINEAR, cmd.x, cmd.y, feed=cmd.feed)
+            elif kind is DwellCommand:
+                buf.append(cls.DWELL, dwell=cmd.dwell_seconds)
+            elif kind is ToolUpCommand:
+                buf.append(cls.TOOL_UP, ref=cmd.cmd_up)
+            elif kind is ToolDownCommand:
+                buf.append(cls.TOOL_DOWN, ref=cmd.cmd_down)
+            else:
+                buf.append(cls.RAW, nan, nan, ref=cmd)
+        return buf
+
+    def to_commands(self) -> List[BaseCommand]:
+        " Reconstruye los objetos BaseCommand (compatibilidad con código que trabaja con listas de comandos). "
+        ops = self.op.tolist()
+        xs, ys, is_, js, feeds, dwells = (self.column(n).tolist() for n in self.COLUMNS)
+        refs, ref = self.refs, self.ref.tolist()
+        result = []
+        # Feed entero como int: to_gcode() escribe F4000 y no F4000.0, igual que GCodeSerializer
+        feeds = [None if f != f else int(f) if f.is_integer() else f for f in feeds]
+        for k, op in enumerate(ops):
+            feed = feeds[k]
+            if op == self.LINEAR or op == self.RAPID:
+                result.append(MoveCommand(xs[k], ys[k], feed, op == self.RAPID))
+            elif op == self.ARC_CW or op == self.ARC_CCW:
+                result.append(ArcCommand(xs[k], ys[k], is_[k], js[k], op == self.ARC_CW, feed=feed))
+            elif op == self.REL_LINEAR or op == self.REL_RAPID:
+                result.append(RelativeMoveCommand(xs[k], ys[k], feed=feed, rapid=op == self.REL_RAPID))
+            elif op == self.DWELL:
+                result.append(DwellCommand(dwells[k]))
+            elif op == self.TOOL_UP:
+                result.append(ToolUpCommand(refs[ref[k]]))
+            elif op == self.TOOL_DOWN:
+                result.append(ToolDownCommand(refs[ref[k]]))
+            else:
+                result.append(refs[ref[k]])
+        return result
+
+    def to_gcode_lines(self) -> List[str]:
+        " Líneas G-code del buffer con el formato por defecto (GCodeSerializer con 3 decimales). "
+        from domain.gcode.gcode_serializer import GCodeSerializer
+        return GCodeSerializer().lines(self)
@@ -1,8 +1,25 @@
+from itertools import islice
+
+
 class GCodeBorderFilter:
     """Filtra el rectángulo-borde del G-code generado."""
     def __init__(self, detector):
         self.detector = detector
 
+    def filter_lines(self, gcode_lines):
+        """
+        Versión en flujo de filter(): recibe un iterable de líneas (que pueden contener '\\n') y
+        genera las líneas filtradas. Solo retiene las primeras líneas que examina el detector (max_position).
+        """
+        lines = (line for item in gcode_lines for line in item.split('\n'))
+        window = getattr(self.detector, 'max_position', None)
+        head = list(islice(lines, window)) if window is not None else list(lines)
+        border_indices = self.detector.detect_border_pattern(head)
+        if border_indices:
+            head = [l for i, l in enumerate(head) if i not in border_indices]
+        yield from head
+        yield from lines
+
     def filter(self, gcode_content):
         lines = gcode_content.split('\n')
         border_indices = self.detector.detect_border_pattern(lines)
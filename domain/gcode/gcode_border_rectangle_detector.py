@@ -9,54 +9,59 @@ class GCodeBorderRectangleDetector:
         Retorna los índices de las líneas que conforman el rectángulo-borde o None si no se detecta.
         Detecta un bloque inicial con:
         - G0 (inicio)
-        - G4 (pausa)
+        - G4 (pausa, opcional)
         - G0 (mover a esquina opuesta)
-        - G4 (pausa)
+        - G4 (pausa, opcional)
         - M3 (bajar lapicera)
-        - G4 (pausa)
+        - G4 (pausa, opcional)
         - >=4 líneas G1 (trazando rectángulo)
-        - G4 (pausa)
+        - G4 (pausa, opcional)
         - M5 (subir lapicera)
-        - G4 (pausa)
+        - G4 (pausa, opcional)
+        Las pausas son opcionales: el builder solo emite el G4 que sigue a cada cambio de lapicera.
         """
         lines = gcode_lines[:self.max_position]
-        if len(lines) < 10:
+        if len(lines) < 3 + self.min_g1 + 1:
             return None
-        # Buscar secuencia: G0, G4, G0, G4, M3, G4, >=4xG1, G4, M5, G4
+        # Buscar secuencia: G0, [G4], G0, [G4], M3, [G4], >=4xG1, [G4], M5, [G4]
         idx = 0
-        if not lines[idx].startswith("G0 "):
+        if not self._is_word(lines[idx], "G0"):
             return None
-        idx += 1
-        if not lines[idx].startswith("G4 "):
+        idx = self._skip_dwell(lines, idx + 1)
+        # El segundo G0 puede venir sin la palabra G (G-code compacto/modal)
+        if idx >= len(lines) or not (self._is_word(lines[idx], "G0") or self._is_modal(lines[idx])):
             return None
-        idx += 1
-        if not lines[idx].startswith("G0 "):
+        idx = self._skip_dwell(lines, idx + 1)
+        if idx >= len(lines) or not lines[idx].startswith("M3"):
             return None
-        idx += 1
-        if not lines[idx].startswith("G4 "):
-            return None
-        idx += 1
-        if not lines[idx].startswith("M3"):
-            return None
-        idx += 1
-        if not lines[idx].startswith("G4 "):
-            return None
-        idx += 1
-        g1_start = idx
+        idx = self._skip_dwell(lines, idx + 1)
         g1_count = 0
-        while idx < len(lines) and lines[idx].startswith("G1 "):
+        while idx < len(lines) and (self._is_word(lines[idx], "G1") or (g1_count and self._is_modal(lines[idx]))):
             g1_count += 1
             idx += 1
         if g1_count < self.min_g1:
             return None
-        if idx >= len(lines) or not lines[idx].startswith("G4 "):
-            return None
-        idx += 1
+        idx = self._skip_dwell(lines, idx)
         if idx >= len(lines) or not lines[idx].startswith("M5"):
             return None
-        idx += 1
-        # Opcional: G4 tras M5
-        if idx < len(lines) and lines[idx].startswith("G4 "):
-            idx += 1
+        idx = self._skip_dwell(lines, idx + 1)
         # Retornar los índices del bloque detectado
         return list(range(idx))
+
+    @classmethod
+    def _skip_dwell(cls, lines, idx):
+        " Índice siguiente a un G4 opcional en la posición idx. "
+        if idx < len(lines) and cls._is_word(lines[idx], "G4"):
+            return idx + 1
+        return idx
+
+    @staticmethod
+    def _is_word(line, word):
+        " La línea empieza con `word` seguido de un espacio o de otra palabra (G0 X1 o G0X1, pero no G01). "
+        rest = line[len(word):len(word) + 1]
+        return line.startswith(word) and bool(rest) and not rest.isdigit()
+
+    @staticmethod
+    def _is_modal(line):
+        " Movimiento que repite el G anterior (modo compacto): empieza directamente con un eje o F. "
+        return line[:1] in ("X", "Y", "F")
@@ -2,46 +2,82 @@
 GCodeCommandBuilder: Permite construir secuencias de comandos G-code de forma fluida.
 """
 from typing import List
+from domain.gcode.command_buffer import CommandBuffer
+from domain.gcode.gcode_serializer import GCodeSerializer, ModalState
 from domain.gcode.commands.base_command import BaseCommand
-from domain.gcode.commands.tool_up_command import ToolUpCommand
-from domain.gcode.commands.tool_down_command import ToolDownCommand
-from domain.gcode.commands.move_command import MoveCommand
-from domain.gcode.commands.dwell_command import DwellCommand
 from domain.ports.gcode_optimization_port import GcodeOptimizationPort
 
 class GCodeCommandBuilder:
-    def __init__(self, optimizer: GcodeOptimizationPort = None):
-        self.commands: List[BaseCommand] = []
+    """
+    Acumula los comandos en un CommandBuffer (columnas NumPy) en lugar de un objeto por línea.
+    `commands` reconstruye la lista de BaseCommand para el código que la necesita.
+    El texto se genera con `serializer` (GCodeSerializer con 3 decimales si no se indica otro).
+    drain_lines() serializa lo acumulado y vacía el buffer, para emitir el programa por bloques;
+    el estado modal del serializador (modo compacto) se conserva entre bloques.
+    """
+    def __init__(self, optimizer: GcodeOptimizationPort = None, serializer: GCodeSerializer = None):
+        self.buffer = CommandBuffer()
         self.optimizer = optimizer
+        self.serializer = serializer or GCodeSerializer()
+        self.modal_state = ModalState()
+
+    @property
+    def commands(self) -> List[BaseCommand]:
+        return self.buffer.to_commands()
 
     def tool_up(self, cmd_up: str):
-        self.commands.append(ToolUpCommand(cmd_up))
+        self.buffer.append(CommandBuffer.TOOL_UP, ref=cmd_up)
         return self
 
     def tool_down(self, cmd_down: str):
-        self.commands.append(ToolDownCommand(cmd_down))
+        self.buffer.append(CommandBuffer.TOOL_DOWN, ref=cmd_down)
         return self
 
     def move_to(self, x: float, y: float, feed: float = None, rapid: bool = False):
-        self.commands.append(MoveCommand(x, y, feed, rapid))
+        self.buffer.append(CommandBuffer.RAPID if rapid else CommandBuffer.LINEAR, x, y, feed=feed)
+        return self
+
+    def moves_to(self, xs, ys, feeds=None):
+        " Agrega un bloque de G1 desde arrays de coordenadas; feeds usa NaN donde no se emite F. "
+        self.buffer.extend_moves(CommandBuffer.LINEAR, xs, ys, feeds)
+        return self
+
+    def relative_move(self, dx: float, dy: float, feed: float = None, rapid: bool = False):
+        self.buffer.append(CommandBuffer.REL_RAPID if rapid else CommandBuffer.REL_LINEAR, dx, dy, feed=feed)
+        return self
+
+    def relative_moves(self, dxs, dys, feeds=None):
+        " Agrega un bloque de G1 relativos (desplazamientos dx, dy); el serializador los agrupa en un solo G91. "
+        self.buffer.extend_moves(CommandBuffer.REL_LINEAR, dxs, dys, feeds)
         return self
 
     def dwell(self, seconds: float):
-        self.commands.append(DwellCommand(seconds))
+        self.buffer.append(CommandBuffer.DWELL, dwell=seconds)
         return self
 
+    def raw(self, command: BaseCommand):
+        " Agrega un comando sin columnas propias (comentarios u otros BaseCommand). "
+        self.buffer.append(CommandBuffer.RAW, ref=command)
+        return self
+
+    def drain_lines(self) -> List[str]:
+        " Devuelve las líneas de los comandos acumulados y vacía el buffer (no aplica el optimizador). "
+        lines = self.serializer.lines(self.buffer, modal=self.modal_state)
+        self.buffer = CommandBuffer()
+        return lines
+
     def build(self) -> List[BaseCommand]:
         return self.commands
 
     def to_gcode_lines_with_metrics(self):
         " Genera las líneas G-code y métricas de optimización si se usa un optimizador. "
-        cmds = self.commands
         metrics = {}
-        if self.optimizer:
-            # Si el optimizador devuelve (cmds, metrics)
-            result = self.optimizer(cmds)
-            if isinstance(result, tuple) and len(result) == 2:
-                cmds, metrics = result
-            else:
-                cmds = result
-        return [cmd.to_gcode() for cmd in cmds], metrics
+        if not self.optimizer:
+            return self.serializer.lines(self.buffer), metrics
+        # Si el optimizador devuelve (cmds, metrics)
+        result = self.optimizer(self.commands)
+        if isinstance(result, tuple) and len(result) == 2:
+            cmds, metrics = result
+        else:
+            cmds = result
+        return self.serializer.lines(CommandBuffer.from_commands(cmds)), metrics
@@ -0,0 +1,255 @@
+"""
+GCodeSerializer: Serializa un CommandBuffer a texto G-code formateando columnas completas en bloque.
+"""
+import io
+from typing import List
+import numpy as np
+from domain.gcode.command_buffer import CommandBuffer
+
+
+class ModalState:
+    """
+    Estado modal al final de lo ya emitido en modo compacto: último G de movimiento (word, 0..3),
+    posición en unidades de la precisión de salida (x, y) y último F redondeado (feed).
+    -1 / NaN indican "desconocido". Permite continuar el modo compacto entre llamadas sucesivas.
+    relative indica que quedó abierto un bloque G91 (en todos los modos).
+    """
+    def __init__(self):
+        self.word = -1
+        self.x = np.nan
+        self.y = np.nan
+        self.feed = np.nan
+        self.relative = False
+
+
+class GCodeSerializer:
+    """
+    Convierte un CommandBuffer en líneas o texto G-code sin crear un objeto ni un f-string por comando.
+
+    - decimals: decimales de las coordenadas X, Y, I, J (GCODE_DECIMALS; por defecto 3, como to_gcode()).
+    - fixed_point: si es True, las coordenadas se escriben como enteros en unidades de 10^-decimals
+      (formato de punto decimal implícito: con decimals=3, X12.345 se escribe X12345).
+    - El feed se escribe con su representación completa (igual que to_gcode()), sin '.0' si es entero
+      (F4000, como el feed entero de la configuración), y el dwell con 3 decimales.
+    - Modo de distancia: los movimientos relativos consecutivos comparten un solo bloque G91 ... G90.
+      Las pausas y los comandos de herramienta no cierran el bloque; el G90 se emite antes del siguiente
+      movimiento absoluto, arco o comando RAW, o al final si no se pasó un `modal` para continuar.
+    - compact (GCODE_COMPACT): modo modal para enviar menos bytes por serie. Omite el G de movimiento
+      si repite el anterior, los ejes de G0/G1 que no cambian a la precisión de salida (y el movimiento
+      entero si no queda nada que emitir) y el F si su valor redondeado a feed_decimals no cambia.
+      Los comandos de herramienta y RAW reinician el estado modal: cada trazo queda autocontenido y los
+      pases que eliminan trazos completos (como el filtro de borde) siguen produciendo G-code válido.
+    - omit_spaces (GCODE_OMIT_SPACES): escribe las palabras sin espacios (G1X1.000Y2.000), para
+      controladores que lo aceptan.
+    - Para cada fila se elige una plantilla según opcode y palabras presentes; todas las plantillas del
+      bloque se unen en una sola cadena de formato que se aplica de una vez sobre los valores aplanados.
+    - write() escribe directamente en un stream de texto o binario, por bloques de CHUNK_ROWS comandos.
+    """
+    CHUNK_ROWS = 100000
+    MAX_DECIMALS = 12
+    _SEPARATOR = "\x1e"
+    # Filas que no dependen del modo de distancia: no abren ni cierran un bloque G91
+    _DISTANCE_NEUTRAL = (CommandBuffer.DWELL, CommandBuffer.TOOL_UP, CommandBuffer.TOOL_DOWN)
+    # Bits del índice de plantilla: op * 16 + G * 8 + X * 4 + Y * 2 + F
+    _WORD, _X, _Y, _F = 8, 4, 2, 1
+    _MOTION_WORDS = {
+        CommandBuffer.RAPID: 0, CommandBuffer.LINEAR: 1, CommandBuffer.ARC_CW: 2, CommandBuffer.ARC_CCW: 3,
+        CommandBuffer.REL_RAPID: 0, CommandBuffer.REL_LINEAR: 1,
+    }
+
+    def __init__(self, decimals: int = 3, fixed_point: bool = False, encoding: str = "utf-8",
+                 compact: bool = False, omit_spaces: bool = False, feed_decimals: int = 0):
+        if int(decimals) != decimals or not 0 <= decimals <= self.MAX_DECIMALS:
+            raise ValueError(f"decimals debe ser un entero entre 0 y {self.MAX_DECIMALS}")
+        if int(feed_decimals) != feed_decimals or not 0 <= feed_decimals <= self.MAX_DECIMALS:
+            raise ValueError(f"feed_decimals debe ser un entero entre 0 y {self.MAX_DECIMALS}")
+        self.decimals = int(decimals)
+        self.fixed_point = bool(fixed_point)
+        self.encoding = encoding
+        self.compact = bool(compact)
+        self.omit_spaces = bool(omit_spaces)
+        self.feed_decimals = int(feed_decimals)
+        coord = "%d" if self.fixed_point else f"%.{self.decimals}f"
+        feed = f"%.{self.feed_decimals}f" if self.compact else "%r"
+        space = "" if self.omit_spaces else " "
+        size = 16 * (CommandBuffer.RAW + 1)
+        # Tabla indexada por op * 16 + bits de palabras presentes; TOOL_UP/TOOL_DOWN/RAW se completan por fila
+        self._templates = np.empty(size, dtype=object)
+        self._templates[:] = ""
+        # Las mismas plantillas con el feed entero (%d), para las filas cuyo feed no tiene parte decimal
+        self._integral_feed_templates = np.empty(size, dtype=object)
+        self._integral_feed_templates[:] = ""
+        # Columnas usadas por cada plantilla, en el orden en que aparecen: x, y, i, j, feed, dwell
+        self._uses = np.zeros((size, 6), dtype=bool)
+        for op, word in self._MOTION_WORDS.items():
+            arc = op in (CommandBuffer.ARC_CW, CommandBuffer.ARC_CCW)
+            for bits in range(16):
+                words, uses = [], [False] * 6
+                if bits & self._WORD:
+                    words.append(f"G{word}")
+                if bits & self._X:
+                    words.append(f"X{coord}")
+                    uses[0] = True
+                if bits & self._Y:
+                    words.append(f"Y{coord}")
+                    uses[1] = True
+                if arc:
+                    words += [f"I{coord}", f"J{coord}"]
+                    uses[2] = uses[3] = True
+                if bits & self._F:
+                    words.append(f"F{feed}")
+                    uses[4] = True
+                self._templates[16 * op + bits] = space.join(words)
+                self._integral_feed_templates[16 * op + bits] = space.join(words).replace("F%r", "F%d")
+                self._uses[16 * op + bits] = uses
+        self._templates[16 * CommandBuffer.DWELL:16 * (CommandBuffer.DWELL + 1)] = f"G4{space}P%.3f"
+        self._uses[16 * CommandBuffer.DWELL:16 * (CommandBuffer.DWELL + 1), 5] = True
+        self._word_of = np.full(CommandBuffer.RAW + 1, -1, dtype=np.int64)
+        for op, word in self._MOTION_WORDS.items():
+            self._word_of[op] = word
+
+    def lines(self, buffer: CommandBuffer, modal: ModalState = None) -> List[str]:
+        """
+        Devuelve una línea por comando, más una línea G91 / G90 en cada cambio de modo de distancia.
+        En modo compacto los movimientos sin nada que emitir no generan línea; `modal` permite
+        continuar el estado de una llamada anterior (por defecto se parte de un estado desconocido
+        y un bloque G91 abierto al final se cierra con G90).
+        """
+        text = self._format(buffer, 0, len(buffer), self._SEPARATOR, modal or ModalState(), close=modal is None)
+        return text.split(self._SEPARATOR) if text else []
+
+    def text(self, buffer: CommandBuffer, modal: ModalState = None) -> str:
+        " Devuelve el programa completo como texto, con las líneas separadas por '\\n'. "
+        return self._format(buffer, 0, len(buffer), "\n", modal or ModalState(), close=modal is None)
+
+    def write(self, buffer: CommandBuffer, stream, modal: ModalState = None) -> int:
+        """
+        Escribe el programa en `stream` (texto o binario), sin salto de línea final.
+        Devuelve la cantidad de caracteres escritos.
+        """
+        binary = isinstance(stream, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(stream, "mode", "")
+        close = modal is None
+        modal = modal or ModalState()
+        written = 0
+        for start in range(0, len(buffer), self.CHUNK_ROWS):
+            stop = min(len(buffer), start + self.CHUNK_ROWS)
+            chunk = self._format(buffer, start, stop, "\n", modal, close=close and stop == len(buffer))
+            if not chunk:
+                continue
+            if written:
+                chunk = "\n" + chunk
+            stream.write(chunk.encode(self.encoding) if binary else chunk)
+            written += len(chunk)
+        return written
+
+    def _format(self, buffer: CommandBuffer, start: int, stop: int, separator: str, modal: ModalState,
+                close: bool = False) -> str:
+        op = buffer.op[start:stop]
+        if not len(op):
+            return ""
+        values = np.column_stack([buffer.column(name)[start:stop] for name in CommandBuffer.COLUMNS])
+        has_feed = ~np.isnan(values[:, 4]) & (op != CommandBuffer.RAPID)
+        bits = np.full(len(op), self._WORD | self._X | self._Y, dtype=np.int64)
+        bits += has_feed
+        keep = None
+        if self.compact:
+            bits, keep = self._modal_bits(op, values, has_feed, modal)
+        index = 16 * op.astype(np.int64) + bits
+        templates = self._templates[index]
+        if not self.compact:
+            integral = np.flatnonzero(has_feed & (np.mod(values[:, 4], 1.0) == 0))
+            templates[integral] = self._integral_feed_templates[index[integral]]
+        # Texto literal por fila: comandos de herramienta y comandos RAW (con % escapado)
+        literal = np.flatnonzero((op == CommandBuffer.TOOL_UP) | (op == CommandBuffer.TOOL_DOWN) | (op == CommandBuffer.RAW))
+        if len(literal):
+            refs, ref = buffer.refs, buffer.ref[start:stop]
+            for k in literal.tolist():
+                item = refs[ref[k]]
+                text = item if isinstance(item, str) else item.to_gcode()
+                templates[k] = text.replace("%", "%%")
+        uses = self._uses[index]
+        if self.fixed_point:
+            values[:, :4] = np.rint(values[:, :4] * 10.0 ** self.decimals)
+        if keep is not None:
+            op, templates, uses, values = op[keep], templates[keep], uses[keep], values[keep]
+        templates, uses, values = self._distance_blocks(op, templates, uses, values, modal, close)
+        if not len(templates):
+            return ""
+        return separator.join(templates.tolist()) % tuple(values[uses].tolist())
+
+    def _distance_blocks(self, op, templates, uses, values, modal: ModalState, close: bool):
+        """
+        Inserta G91 antes del primer movimiento relativo de cada tramo y G90 antes de la primera fila
+        que necesita modo absoluto (o al final, con `close`). Actualiza modal.relative.
+        """
+        relative = (op == CommandBuffer.REL_RAPID) | (op == CommandBuffer.REL_LINEAR)
+        if not modal.relative and not relative.any():
+            return templates, uses, values
+        if not len(op):
+            if close:
+                modal.relative = False
+                return np.array(["G90"], dtype=object), np.zeros((1, uses.shape[1]), dtype=bool), np.zeros((1, values.shape[1]))
+            return templates, uses, values
+        sets = ~np.isin(op, self._DISTANCE_NEUTRAL)
+        before, after = self._previous(relative.astype(np.float64), sets, float(modal.relative))
+        opens = relative & (before == 0)
+        closes = sets & ~relative & (before == 1)
+        positions = np.flatnonzero(opens | closes)
+        labels = np.where(opens[positions], "G91", "G90").astype(object)
+        if close and after == 1:
+            positions = np.append(positions, len(op))
+            labels = np.append(labels, "G90")
+            after = 0
+        modal.relative = bool(after)
+        if not len(positions):
+            return templates, uses, values
+        return (np.insert(templates, positions, labels), np.insert(uses, positions, False, axis=0),
+                np.insert(values, positions, 0.0, axis=0))
+
+    def _modal_bits(self, op, values, has_feed, modal: ModalState):
+        """
+        Palabras a emitir por fila en modo compacto y máscara de filas que generan línea.
+        Actualiza `modal` con el estado al final del bloque.
+        """
+        scale = 10.0 ** self.decimals
+        absolute = (op == CommandBuffer.RAPID) | (op == CommandBuffer.LINEAR)
+        arc = (op == CommandBuffer.ARC_CW) | (op == CommandBuffer.ARC_CCW)
+        relative = (op == CommandBuffer.REL_RAPID) | (op == CommandBuffer.REL_LINEAR)
+        reset = (op == CommandBuffer.TOOL_UP) | (op == CommandBuffer.TOOL_DOWN) | (op == CommandBuffer.RAW)
+        qx = np.rint(values[:, 0] * scale)
+        qy = np.rint(values[:, 1] * scale)
+        # Posición conocida: la fijan los movimientos absolutos y los arcos; los relativos y los reinicios la invalidan
+        sets_position = absolute | arc | relative | reset
+        known = absolute | arc
+        prev_x, modal.x = self._previous(np.where(known, qx, np.nan), sets_position, modal.x)
+        prev_y, modal.y = self._previous(np.where(known, qy, np.nan), sets_position, modal.y)
+        x_on = np.where(relative, qx != 0, ~(qx == prev_x)) | arc
+        y_on = np.where(relative, qy != 0, ~(qy == prev_y)) | arc
+        # F modal: el redondeo a feed_decimals define si cambió
+        feed = np.round(values[:, 4], self.feed_decimals)
+        values[:, 4] = feed
+        prev_f, modal.feed = self._previous(np.where(reset, np.nan, feed), has_feed | reset, modal.feed)
+        f_on = has_feed & ~(feed == prev_f)
+        # Movimientos sin ejes ni F que emitir no generan línea (ni fijan el G modal)
+        keep = ~((absolute | relative) & ~x_on & ~y_on & ~f_on)
+        word = self._word_of[op]
+        prev_w, last_w = self._previous(np.where(reset, -1, word).astype(np.float64),
+                                        ((absolute | arc | relative) & keep) | reset, float(modal.word))
+        modal.word = int(last_w)
+        word_on = word != prev_w
+        bits = word_on * self._WORD + x_on * self._X + y_on * self._Y + f_on * self._F
+        return bits, keep
+
+    @staticmethod
+    def _previous(values, sets, initial):
+        """
+        Para cada fila, el último valor fijado por una fila anterior con `sets` (o `initial` si no hubo),
+        y el valor vigente después de la última fila.
+        """
+        index = np.where(sets, np.arange(len(values)), -1)
+        np.maximum.accumulate(index, out=index)
+        after = np.where(index >= 0, values[index], initial)
+        before = np.empty_like(after)
+        before[0] = initial
+        before[1:] = after[:-1]
+        return before, after[-1].item()
@@ -0,0 +1,303 @@
+"""
+MotionSimulator: simulación cinemática del G-code para estimar el tiempo real de ploteo.
+"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+import numpy as np
+from domain.gcode.command_buffer import CommandBuffer
+
+
+@dataclass
+class PlotEstimate:
+    """Resultado de la simulación: tiempos en segundos y distancias en mm."""
+    motion_time_s: float = 0.0
+    dwell_time_s: float = 0.0
+    pen_time_s: float = 0.0
+    pen_down_mm: float = 0.0
+    travel_mm: float = 0.0
+    pen_lifts: int = 0
+    moves: int = 0
+    # Uniones con la lapicera abajo que giran al menos corner_angle_deg
+    sharp_corners: int = 0
+
+    @property
+    def estimated_time_s(self) -> float:
+        """Tiempo total: movimientos, pausas G4 y recorrido del servo de la lapicera"""
+        return self.motion_time_s + self.dwell_time_s + self.pen_time_s
+
+    @property
+    def duration_text(self) -> str:
+        """Tiempo total como H:MM:SS"""
+        minutes, seconds = divmod(int(round(self.estimated_time_s)), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class MotionSimulator:
+    """
+    Ejecuta el G-code (G0/G1/G2/G3/G4/G90/G91/M3/M5) sobre una máquina con perfil de velocidad trapezoidal:
+
+    - Cada movimiento acelera y frena con max_accel_mm_s2 hasta su velocidad nominal: G0 a rapid_feed,
+      G1/G2/G3 al F modal (default_feed hasta el primer F); en los arcos además v² ≤ a·r.
+    - La velocidad en la unión entre movimientos se limita por desviación de esquina (mismo modelo que
+      JunctionDeviationPlanner) y la máquina se detiene en M3/M5, en G4 y al final del programa; entre
+      esas detenciones se planifica con anticipación completa (pasadas hacia atrás y hacia adelante).
+    - M3/M4 bajan y M5 sube la lapicera (arranca arriba); cada cambio de estado suma el tiempo del servo
+      (pen_down_time_s / pen_up_time_s) y cada subida cuenta como levantada. G4 P<segundos> suma a las pausas.
+    - Entiende el formato compacto (palabras modales omitidas) y coordinate_scale pasa a mm las
+      coordenadas en punto fijo (GCODE_FIXED_POINT).
+    - Cuenta en sharp_corners las uniones entre movimientos con la lapicera abajo que giran al menos
+      corner_angle_deg (tangentes de entrada y salida, también en los arcos).
+
+    estimate_lines() simula texto G-code, estimate() un CommandBuffer o lista de comandos, y stream_lines()
+    mide un flujo de líneas mientras se escribe. fastest() compara candidatos por tiempo real en lugar de
+    cantidad de líneas.
+    """
+    MIN_SEGMENT = 1e-6
+    STRAIGHT_COS = -0.999999
+    REVERSAL_COS = 0.999999
+    # Movimientos acumulados como máximo antes de planificar (acota la memoria en trazos enormes)
+    MAX_PENDING = 65536
+    _COMMENT = re.compile(r"\(.*?\)|;.*")
+    _WORD = re.compile(r"([A-Z])\s*([-+]?(?:\d+\.?\d*|\.\d+))")
+
+    def __init__(self, max_accel_mm_s2: float = 1000.0, junction_deviation_mm: float = 0.01,
+                 rapid_feed: float = 4000.0, default_feed: float = 4000.0, pen_down_time_s: float = 0.0,
+                 pen_up_time_s: float = 0.0, coordinate_scale: float = 1.0, corner_angle_deg: float = 15.0):
+        if max_accel_mm_s2 <= 0 or junction_deviation_mm < 0:
+            raise ValueError("max_accel_mm_s2 debe ser positiva y junction_deviation_mm no negativa")
+        if rapid_feed <= 0 or default_feed <= 0:
+            raise ValueError("rapid_feed y default_feed deben ser positivos")
+        self.accel = float(max_accel_mm_s2)
+        self.junction_deviation_mm = float(junction_deviation_mm)
+        self.rapid_speed = float(rapid_feed) / 60.0
+        self.default_feed = float(default_feed)
+        self.pen_down_time_s = max(0.0, float(pen_down_time_s))
+        self.pen_up_time_s = max(0.0, float(pen_up_time_s))
+        self.coordinate_scale = float(coordinate_scale)
+        self.corner_angle_deg = float(corner_angle_deg)
+        self.reset()
+
+    # --- API ---
+    def estimate_lines(self, lines: Iterable[str]) -> PlotEstimate:
+        " Simula un programa G-code dado como líneas de texto. "
+        estimate = PlotEstimate()
+        for _ in self.stream_lines(lines, estimate):
+            pass
+        return estimate
+
+    def estimate(self, commands) -> PlotEstimate:
+        " Simula un CommandBuffer o una lista de comandos (formato por defecto del serializador). "
+        return self.estimate_lines(CommandBuffer.from_commands(commands).to_gcode_lines())
+
+    def fastest(self, candidates):
+        " Devuelve (índice, estimación) del candidato (buffer o lista de comandos) con menor tiempo estimado. "
+        best = None
+        for index, candidate in enumerate(candidates):
+            estimate = self.estimate(candidate)
+            if best is None or estimate.estimated_time_s < best[1].estimated_time_s:
+                best = (index, estimate)
+        if best is None:
+            raise ValueError("No hay candidatos para comparar")
+        return best
+
+    def stroke_time(self, strokes, feeds=None) -> float:
+        """
+        Tiempo (s) de recorrer los trazos de un StrokeBuffer con la lapicera abajo, cada uno arrancando y
+        terminando detenido. feeds (mm/min) es por punto, como lo devuelve plan_buffer(): la posición p
+        tiene el feed del segmento que termina en p; sin feeds (o NaN) se usa default_feed.
+        """
+        coords, offsets = strokes.coords, strokes.offsets
+        if len(coords) < 2:
+            return 0.0
+        vectors = np.diff(coords, axis=0)
+        lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        starts = np.zeros(len(coords), dtype=bool)
+        starts[offsets[:-1][np.diff(offsets) > 0]] = True
+        # Segmentos reales: dentro de un trazo y de longitud no nula
+        keep = ~starts[1:] & (lengths >= self.MIN_SEGMENT)
+        if not keep.any():
+            return 0.0
+        feeds = np.full(len(coords), np.nan) if feeds is None else np.asarray(feeds, dtype=np.float64)
+        speeds = np.where(np.isnan(feeds[1:]), self.default_feed, feeds[1:])[keep] / 60.0
+        dirs = vectors[keep] / lengths[keep][:, None]
+        # Trazo al que pertenece cada segmento: cambiar de trazo es detenerse
+        stroke_ids = np.cumsum(starts)[1:][keep]
+        return self.plan_time(lengths[keep], speeds * speeds, dirs, dirs, stops=stroke_ids[1:] != stroke_ids[:-1])
+
+    def stream_lines(self, lines: Iterable[str], estimate: PlotEstimate) -> Iterator[str]:
+        " Deja pasar las líneas y completa `estimate` cuando el flujo se agota. "
+        self.reset()
+        for line in lines:
+            self.feed(line)
+            yield line
+        self.result(estimate)
+
+    # --- Simulación incremental ---
+    def reset(self):
+        " Vuelve al estado inicial: origen, modo absoluto, G0, lapicera arriba. "
+        self._pos = (0.0, 0.0)
+        self._motion = 0
+        self._relative = False
+        self._feed = self.default_feed
+        self._pen_down = False
+        self._estimate = PlotEstimate()
+        self._pending = []
+
+    def feed(self, line: str):
+        " Consume una línea (o un bloque con varias líneas separadas por saltos de línea). "
+        if "\n" in line:
+            for part in line.split("\n"):
+                self.feed(part)
+            return
+        words = self._WORD.findall(self._COMMENT.sub("", line.upper()))
+        if not words:
+            return
+        values = {}
+        dwell = False
+        pen = None
+        for letter, number in words:
+            if letter == "G":
+                code = float(number)
+                if code in (0, 1, 2, 3):
+                    self._motion = int(code)
+                elif code == 4:
+                    dwell = True
+                elif code == 90:
+                    self._relative = False
+                elif code == 91:
+                    self._relative = True
+            elif letter == "M":
+                code = float(number)
+                if code in (3, 4):
+                    pen = True
+                elif code == 5:
+                    pen = False
+            else:
+                values[letter] = float(number)
+        if "F" in values and values["F"] > 0:
+            self._feed = values["F"]
+        if dwell:
+            self._stop()
+            self._estimate.dwell_time_s += max(0.0, values.get("P", 0.0))
+            return
+        if pen is not None:
+            self._set_pen(pen)
+        if "X" in values or "Y" in values:
+            self._move(values)
+
+    def result(self, estimate: PlotEstimate = None) -> PlotEstimate:
+        " Cierra la simulación (la máquina se detiene) y devuelve la estimación (copiada en `estimate` si se pasa). "
+        self._stop()
+        if estimate is None:
+            return PlotEstimate(**vars(self._estimate))
+        vars(estimate).update(vars(self._estimate))
+        return estimate
+
+    # --- Internos ---
+    def _set_pen(self, down: bool):
+        self._stop()
+        if down == self._pen_down:
+            return
+        self._pen_down = down
+        if down:
+            self._estimate.pen_time_s += self.pen_down_time_s
+        else:
+            self._estimate.pen_time_s += self.pen_up_time_s
+            self._estimate.pen_lifts += 1
+
+    def _move(self, values):
+        scale = self.coordinate_scale
+        x0, y0 = self._pos
+        if self._relative:
+            x1 = x0 + values.get("X", 0.0) * scale
+            y1 = y0 + values.get("Y", 0.0) * scale
+        else:
+            x1 = values["X"] * scale if "X" in values else x0
+            y1 = values["Y"] * scale if "Y" in values else y0
+        self._pos = (x1, y1)
+        speed = self.rapid_speed if self._motion == 0 else self._feed / 60.0
+        if self._motion in (2, 3):
+            block = self._arc_block(x0, y0, x1, y1, values.get("I", 0.0) * scale, values.get("J", 0.0) * scale, speed)
+        else:
+            dx, dy = x1 - x0, y1 - y0
+            length = math.hypot(dx, dy)
+            if length < self.MIN_SEGMENT:
+                return
+            ux, uy = dx / length, dy / length
+            block = (length, speed * speed, ux, uy, ux, uy)
+        if block is None:
+            return
+        if self._pen_down:
+            self._estimate.pen_down_mm += block[0]
+        else:
+            self._estimate.travel_mm += block[0]
+        self._estimate.moves += 1
+        self._pending.append(block)
+        if len(self._pending) >= self.MAX_PENDING:
+            self._stop()
+
+    def _arc_block(self, x0, y0, x1, y1, i, j, speed):
+        " (longitud, v², tangente inicial, tangente final) de un G2/G3; None si el arco es degenerado. "
+        cx, cy = x0 + i, y0 + j
+        r0 = math.hypot(x0 - cx, y0 - cy)
+        r1 = math.hypot(x1 - cx, y1 - cy)
+        if r0 < self.MIN_SEGMENT or r1 < self.MIN_SEGMENT:
+            return None
+        a0 = math.atan2(y0 - cy, x0 - cx)
+        a1 = math.atan2(y1 - cy, x1 - cx)
+        clockwise = self._motion == 2
+        sweep = (a0 - a1 if clockwise else a1 - a0) % (2.0 * math.pi)
+        if sweep < 1e-9:
+            # Mismo punto inicial y final: círculo completo
+            sweep = 2.0 * math.pi
+        radius = 0.5 * (r0 + r1)
+        sign = -1.0 if clockwise else 1.0
+        speed_sq = min(speed * speed, self.accel * radius)
+        return (radius * sweep, speed_sq, -sign * (y0 - cy) / r0, sign * (x0 - cx) / r0,
+                -sign * (y1 - cy) / r1, sign * (x1 - cx) / r1)
+
+    def _stop(self):
+        " Planifica los movimientos acumulados, que empiezan y terminan detenidos, y suma su tiempo. "
+        if not self._pending:
+            return
+        blocks = np.array(self._pending, dtype=np.float64)
+        self._pending = []
+        if self._pen_down and len(blocks) > 1:
+            turn_cos = np.einsum("ij,ij->i", blocks[:-1, 4:6], blocks[1:, 2:4])
+            limit = math.cos(math.radians(self.corner_angle_deg))
+            self._estimate.sharp_corners += int(np.count_nonzero(turn_cos <= limit))
+        self._estimate.motion_time_s += self.plan_time(blocks[:, 0], blocks[:, 1], blocks[:, 2:4], blocks[:, 4:6])
+
+    def plan_time(self, lengths, speeds_sq, start_dirs, end_dirs, stops=None) -> float:
+        """
+        Tiempo (s) de una secuencia de movimientos que arranca y termina detenida.
+        lengths y speeds_sq (v nominal², mm²/s²) tienen un valor por movimiento; start_dirs / end_dirs
+        las tangentes unitarias (n, 2) al inicio y al final de cada uno. stops (opcional, n - 1 valores)
+        marca las uniones donde la máquina también se detiene.
+        """
+        accel = self.accel
+        n = len(lengths)
+        limits = np.zeros(n + 1)
+        if n > 1:
+            cos_theta = -np.einsum("ij,ij->i", end_dirs[:-1], start_dirs[1:])
+            sin_half = np.sqrt(0.5 * (1.0 - np.clip(cos_theta, -1.0, 1.0)))
+            with np.errstate(divide="ignore"):
+                junction = accel * self.junction_deviation_mm * sin_half / (1.0 - sin_half)
+            junction = np.where(cos_theta > self.REVERSAL_COS, 0.0, junction)
+            junction = np.where(cos_theta < self.STRAIGHT_COS, np.inf, junction)
+            limits[1:-1] = np.minimum(junction, np.minimum(speeds_sq[:-1], speeds_sq[1:]))
+            if stops is not None:
+                limits[1:-1][stops] = 0.0
+        # Pasadas hacia atrás y hacia adelante como mínimos acumulados (ver JunctionDeviationPlanner)
+        reach = np.concatenate(([0.0], np.cumsum(2.0 * accel * lengths)))
+        backward = np.minimum.accumulate((limits + reach)[::-1])[::-1] - reach
+        forward = reach + np.minimum.accumulate(backward - reach)
+        entry_sq = np.maximum(np.minimum(backward, forward), 0.0)
+        v0_sq, v1_sq = entry_sq[:-1], entry_sq[1:]
+        peak_sq = np.minimum(speeds_sq, (v0_sq + v1_sq + 2.0 * accel * lengths) / 2.0)
+        v0, v1, peak = np.sqrt(v0_sq), np.sqrt(v1_sq), np.sqrt(peak_sq)
+        cruise = np.maximum(lengths - (2.0 * peak_sq - v0_sq - v1_sq) / (2.0 * accel), 0.0)
+        return float(np.sum((2.0 * peak - v0 - v1) / accel + cruise / peak))
@@ -0,0 +1,46 @@
+"""
+PenStateMachine: Estado de la lapicera para emitir solo los cambios reales y sus pausas.
+"""
+from typing import Optional, Tuple
+
+
+class PenStateMachine:
+    """
+    Sigue el estado de la lapicera (arriba, abajo o desconocido al inicio del programa).
+
+    - down()/up() devuelven (comando, pausa_s) si hay un cambio de estado, o None si la lapicera
+      ya está en el estado pedido (el M3/M5 sería redundante).
+    - Cada transición lleva una sola pausa, después del comando: asentamiento tras bajar
+      (PEN_DOWN_DWELL_MS) y despeje tras subir (PEN_UP_DWELL_MS). No hace falta un G4 antes del
+      comando: el controlador ejecuta M3/M5 recién al terminar el movimiento anterior.
+    - Una pausa de 0 s no se emite (pausa_s queda en 0).
+    """
+    UNKNOWN, UP, DOWN = None, "up", "down"
+
+    def __init__(self, cmd_down: str, cmd_up: str, down_dwell_s: float = 0.0, up_dwell_s: float = 0.0,
+                 state: Optional[str] = None):
+        self.cmd_down = cmd_down
+        self.cmd_up = cmd_up
+        self.down_dwell_s = max(0.0, float(down_dwell_s or 0.0))
+        self.up_dwell_s = max(0.0, float(up_dwell_s or 0.0))
+        self.state = state
+        self.toggles_skipped = 0
+
+    @property
+    def is_down(self) -> bool:
+        return self.state == self.DOWN
+
+    def down(self) -> Optional[Tuple[str, float]]:
+        " Transición a lapicera abajo: (cmd_down, pausa de asentamiento) o None si ya estaba abajo. "
+        return self._transition(self.DOWN, self.cmd_down, self.down_dwell_s)
+
+    def up(self) -> Optional[Tuple[str, float]]:
+        " Transición a lapicera arriba: (cmd_up, pausa de despeje) o None si ya estaba arriba. "
+        return self._transition(self.UP, self.cmd_up, self.up_dwell_s)
+
+    def _transition(self, target: str, command: str, dwell_s: float):
+        if self.state == target:
+            self.toggles_skipped += 1
+            return None
+        self.state = target
+        return command, dwell_s
@@ -5,6 +5,7 @@ Lógica de dominio para generar el G-code de una marca de referencia (cruz + cí
 def reference_mark_gcode(x, y, direction, feed):
     """
     Devuelve el G-code (sin comandos de máquina) para una marca de referencia en la esquina indicada.
+    CMD_DOWN / CMD_UP marcan los cambios de lapicera; las pausas las agrega quien los reemplaza.
     direction: 'bottomleft', 'bottomright', 'topleft', 'topright'
     """
     if direction == 'bottomleft':
@@ -33,16 +34,13 @@ def reference_mark_gcode(x, y, direction, feed):
         "CMD_DOWN",
         f"G1 X{xh+10*sign_x} Y{yh} F{feed}",
         "CMD_UP",
-        "DWELL",
         f"G0 X{xv} Y{yv}",
         "CMD_DOWN",
         f"G1 X{xv} Y{yv+10*sign_y} F{feed}",
         "CMD_UP",
-        "DWELL",
         f"G0 X{xc+5*sign_x} Y{yc}",
         "CMD_DOWN",
         f"G2 X{xc+5*sign_x} Y{yc} I{(-5)*sign_x} J0 F{feed}",
-        "CMD_UP",
-        "DWELL"
+        "CMD_UP"
     ]
     return gcode
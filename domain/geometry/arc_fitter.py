@@ -0,0 +1,184 @@
+"""
+ArcFitter: Busca en polilíneas los tramos de puntos consecutivos que se pueden reemplazar por arcos.
+"""
+from typing import List, Tuple
+import numpy as np
+
+
+class ArcFitter:
+    """
+    Ajusta arcos a polilíneas de forma codiciosa: desde cada punto de inicio busca el tramo más largo de
+    al menos min_points segmentos que entra en una circunferencia, lo reemplaza y sigue desde su último punto.
+
+    - Ajuste algebraico de Kasa restringido a pasar por los extremos del tramo: el centro queda sobre la
+      mediatriz de la cuerda, de modo que el arco termina exactamente en el último punto y los radios al
+      inicio y al final coinciden (lo que exigen los controladores para G2/G3). Sobre esa recta el ajuste
+      tiene solución cerrada, y se evalúa a la vez para muchas ventanas con operaciones vectorizadas.
+    - Un tramo es válido si el desvío radial máximo de sus puntos más la flecha de la cuerda más larga no
+      supera tolerance_mm (el arco queda dentro de la tolerancia de la polilínea) y si todos los puntos
+      avanzan en el mismo sentido, con un giro total menor a una vuelta. Se reemplaza si además gira al
+      menos min_angle_deg.
+    - Las ventanas de min_points, 2·min_points, 4·min_points, ... segmentos se evalúan para todos los
+      inicios de todas las polilíneas de una vez. Los inicios cuyo giro no llega a min_angle_deg ni con la
+      ventana más larga (tramos rectos) se descartan. Después todas las polilíneas avanzan a la par: en
+      cada vuelta, el inicio en curso de cada una se refina entre su ventana válida y la siguiente,
+      probando REFINE_SAMPLES longitudes por vez y achicando el intervalo alrededor de la mejor.
+    - max_points limita la cantidad de segmentos de un arco.
+    """
+    BLOCK_WINDOWS = 4096
+    REFINE_SAMPLES = 16
+    MIN_CHORD = 1e-9
+
+    def __init__(self, tolerance_mm: float, min_points: int = 3, min_angle_deg: float = 2.0, max_points: int = 256):
+        if tolerance_mm <= 0 or max_points < 2:
+            raise ValueError("tolerance_mm debe ser positiva y max_points al menos 2")
+        self.tolerance_mm = float(tolerance_mm)
+        self.min_points = max(2, int(min_points))
+        self.min_angle = np.radians(max(0.0, float(min_angle_deg)))
+        self.max_points = max(self.min_points, int(max_points))
+
+    def fit(self, points) -> List[Tuple[int, int, float, float, bool]]:
+        """
+        Arcos de una polilínea (n + 1 puntos) como (inicio, fin, cx, cy, horario): cada uno reemplaza los
+        segmentos de points[inicio] a points[fin], con centro (cx, cy) en las mismas unidades que points.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return self.fit_many(points, np.array([0, len(points)]))
+
+    def fit_many(self, points, offsets) -> List[Tuple[int, int, float, float, bool]]:
+        " Como fit(), para varias polilíneas concatenadas (la r-ésima es points[offsets[r]:offsets[r + 1]]). "
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        total = len(points)
+        if not total:
+            return []
+        # Segmentos disponibles desde cada punto hasta el final de su polilínea
+        last = np.repeat(offsets[1:] - 1, np.diff(offsets))
+        available = last - np.arange(total)
+        top = self._window_levels(points, available)
+        # Próximo inicio con ventana válida desde cada punto (total si no hay)
+        eligible = np.where(top >= self.min_points, np.arange(total), total)
+        following = np.append(np.minimum.accumulate(eligible[::-1])[::-1], total)
+        current = offsets[:-1].copy()
+        run_last = offsets[1:] - 1
+        arcs = []
+        while True:
+            current = following[np.minimum(current, total)]
+            alive = np.flatnonzero(current <= run_last - self.min_points)
+            if not len(alive):
+                break
+            starts = current[alive]
+            high = np.minimum(np.minimum(2 * top[starts] - 1, self.max_points), available[starts])
+            lengths, sweep, centers, clockwise = self._longest(points, starts, top[starts], high)
+            accepted = sweep >= self.min_angle
+            for start, length, (cx, cy), cw in zip(starts[accepted].tolist(), lengths[accepted].tolist(),
+                                                   (centers[accepted] + points[starts[accepted]]).tolist(),
+                                                   clockwise[accepted].tolist()):
+                arcs.append((start, start + length, cx, cy, cw))
+            current[alive] = np.where(accepted, starts + lengths, starts + 1)
+        arcs.sort()
+        return arcs
+
+    def _window_levels(self, points: np.ndarray, available: np.ndarray) -> np.ndarray:
+        """
+        Para cada inicio, la ventana válida más larga de la escalera min_points·2^k (0 si ni la primera
+        es válida o si el tramo no puede girar min_angle_deg).
+        """
+        top = np.zeros(len(points), dtype=np.int64)
+        active = available >= self.min_points
+        length = self.min_points
+        while length <= self.max_points and active.any():
+            candidates = np.flatnonzero(active & (available >= length))
+            if not len(candidates):
+                break
+            active[:] = False
+            windows_of = np.lib.stride_tricks.sliding_window_view(points, (length + 1, 2))[:, 0]
+            step = max(1, self.BLOCK_WINDOWS * 16 // (length + 1))
+            for block in range(0, len(candidates), step):
+                chosen = candidates[block:block + step]
+                windows = windows_of[chosen]
+                valid, sweep, _centers, _clockwise = self._evaluate(windows - windows[:, :1],
+                                                                    np.full(len(chosen), length + 1))
+                # Giro que alcanzaría la ventana más larga posible desde ese inicio, a la misma curvatura
+                reach = sweep * (np.minimum(self.max_points, available[chosen]) / length)
+                top[chosen[valid]] = length
+                top[chosen[valid & (reach < self.min_angle)]] = 0
+                active[chosen] = valid & (reach >= self.min_angle)
+            length *= 2
+        return top
+
+    def _longest(self, points: np.ndarray, starts: np.ndarray, low: np.ndarray, high: np.ndarray):
+        """
+        Para cada inicio, la longitud válida más larga entre low (válida) y high.
+        Devuelve (longitudes, giros, centros relativos al inicio, horario).
+        """
+        count = len(starts)
+        lengths = low.copy()
+        sweep = np.zeros(count)
+        centers = np.zeros((count, 2))
+        clockwise = np.zeros(count, dtype=bool)
+        samples = self.REFINE_SAMPLES
+        fractions = np.linspace(0.0, 1.0, samples)
+        step = max(1, self.BLOCK_WINDOWS // samples)
+        pending = np.arange(count)
+        while len(pending):
+            narrowed = []
+            for block in range(0, len(pending), step):
+                rows = pending[block:block + step]
+                width = int(high[rows].max()) + 1
+                # Longitudes repartidas entre low y high (incluidos) para cada inicio
+                tried = np.rint(low[rows, None] + fractions * (high[rows] - low[rows])[:, None]).astype(np.int64)
+                index = np.minimum(starts[rows, None] + np.arange(width), len(points) - 1)
+                windows = points[index] - points[starts[rows], None]
+                valid, tried_sweep, tried_centers, tried_clockwise = self._evaluate(
+                    np.repeat(windows, samples, axis=0), tried.ravel() + 1)
+                valid = valid.reshape(-1, samples)
+                # Última longitud válida de cada inicio (la primera, low, siempre lo es)
+                best = samples - 1 - np.argmax(valid[:, ::-1], axis=1)
+                ok = valid[np.arange(len(rows)), best]
+                flat = (np.arange(len(rows)) * samples + best)[ok]
+                found = rows[ok]
+                lengths[found] = tried[ok, best[ok]]
+                sweep[found] = tried_sweep[flat]
+                centers[found] = tried_centers[flat]
+                clockwise[found] = tried_clockwise[flat]
+                # Si la siguiente longitud probada no era válida, el óptimo está entre ambas
+                following = tried[np.arange(len(rows)), np.minimum(best + 1, samples - 1)]
+                gap = ok & (best < samples - 1) & (following - lengths[rows] > 1)
+                low[rows[gap]] = lengths[rows[gap]]
+                high[rows[gap]] = following[gap] - 1
+                narrowed.append(rows[gap])
+            pending = np.concatenate(narrowed)
+        return lengths, sweep, centers, clockwise
+
+    def _evaluate(self, windows: np.ndarray, counts: np.ndarray):
+        """
+        Ajusta cada ventana (b, k, 2), con su primer punto en el origen y `counts` puntos válidos.
+        Devuelve (válida, giro absoluto en radianes, centro relativo al primer punto, horario).
+        """
+        b, k, _ = windows.shape
+        mask = np.arange(k)[None, :] < counts[:, None]
+        end = windows[np.arange(b), counts - 1]
+        chord = np.hypot(end[:, 0], end[:, 1])
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            middle = end / 2.0
+            normal = np.column_stack((-end[:, 1], end[:, 0])) / chord[:, None]
+            # Residuo algebraico f = |q|² - r² con el centro en middle + t·normal: f = a - 2·t·b
+            a = np.where(mask, np.einsum("bkd,bkd->bk", windows, windows) - 2.0 * np.einsum("bkd,bd->bk", windows, middle), 0.0)
+            bb = np.where(mask, np.einsum("bkd,bd->bk", windows, normal), 0.0)
+            t = np.einsum("bk,bk->b", a, bb) / (2.0 * np.einsum("bk,bk->b", bb, bb))
+            center = middle + normal * t[:, None]
+            radius = np.hypot(center[:, 0], center[:, 1])
+            rel = windows - center[:, None, :]
+            residual = np.where(mask, np.abs(np.hypot(rel[..., 0], rel[..., 1]) - radius[:, None]), 0.0).max(axis=1)
+            # Ángulo entre radios consecutivos: mismo signo en todo el tramo
+            cross = rel[:, :-1, 0] * rel[:, 1:, 1] - rel[:, :-1, 1] * rel[:, 1:, 0]
+            dot = np.einsum("bkd,bkd->bk", rel[:, :-1], rel[:, 1:])
+            steps = np.where(mask[:, 1:], np.arctan2(cross, dot), 0.0)
+            total = steps.sum(axis=1)
+            direction = np.where(total < 0, -1.0, 1.0)
+            forward = ((steps * direction[:, None] > 0) | ~mask[:, 1:]).all(axis=1)
+            sagitta = radius * (1.0 - np.cos(np.abs(steps).max(axis=1) / 2.0))
+            valid = (np.isfinite(radius) & (chord > self.MIN_CHORD) & forward &
+                     (residual + sagitta <= self.tolerance_mm) & (np.abs(total) < 2.0 * np.pi - 1e-6))
+        return valid, np.abs(total), center, total < 0
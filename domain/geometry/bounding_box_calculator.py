@@ -1,22 +1,93 @@
 """
 BoundingBoxCalculator: Calcula el bounding box, centro, dimensiones y área de rutas SVG.
 """
-from typing import Tuple
+from typing import Optional, Tuple
 import numpy as np
+from domain.geometry.segment_bounds import SegmentBounds
 
 class BoundingBoxCalculator:
-    "Calcula el bounding box, centro, dimensiones y área de rutas SVG."
+    """
+    Calcula el bounding box, centro, dimensiones y área de rutas SVG.
+
+    El bbox es exacto (SegmentBounds) y se cachea por segmento durante el trabajo en curso, de modo que
+    el workflow, GeometryService, ScaleManager y el generador comparten un único cálculo aunque los paths
+    se dividan o reordenen. clear_cache() se llama al iniciar cada trabajo; la caché conserva una referencia
+    a cada segmento para que su id no se reutilice.
+    """
+    MAX_CACHED_SEGMENTS = 500000
+    _cache = {}
+
     @staticmethod
     def get_svg_bbox(paths) -> Tuple[float, float, float, float]:
         """Calcula el bounding box de los paths SVG."""
-        xs, ys = [], []
-        for p in paths:
+        return BoundingBoxCalculator.get_exact_bbox(paths)
+
+    @staticmethod
+    def get_exact_bbox(paths) -> Tuple[float, float, float, float]:
+        """
+        Calcula el bounding box exacto (xmin, xmax, ymin, ymax) de los paths SVG.
+        Devuelve (0, 0, 0, 0) si no hay segmentos.
+        """
+        bbox = BoundingBoxCalculator.combine_bounds(BoundingBoxCalculator.path_bounds(paths))
+        return bbox if bbox is not None else (0.0, 0.0, 0.0, 0.0)
+
+    @staticmethod
+    def combine_bounds(bounds: np.ndarray) -> Optional[Tuple[float, float, float, float]]:
+        " Une los bbox (n, 4) de path_bounds() en (xmin, xmax, ymin, ymax); None si todas las filas son NaN. "
+        bounds = bounds[~np.isnan(bounds[:, 0])]
+        if not len(bounds):
+            return None
+        return (float(bounds[:, 0].min()), float(bounds[:, 1].max()),
+                float(bounds[:, 2].min()), float(bounds[:, 3].max()))
+
+    @staticmethod
+    def path_bounds(paths) -> np.ndarray:
+        """
+        Devuelve un array (n, 4) con el bbox de cada path (fila NaN para paths sin segmentos).
+        Los segmentos ya calculados en el trabajo actual se leen de la caché; el resto se calcula en bloque.
+        """
+        paths = list(paths)
+        result = np.full((len(paths), 4), np.nan)
+        segments, owners = [], []
+        for i, p in enumerate(paths):
             for seg in p:
-                for t in np.linspace(0, 1, 20):
-                    z = seg.point(t)
-                    xs.append(z.real)
-                    ys.append(z.imag)
-        if not xs or not ys:
-            return 0.0, 0.0, 0.0, 0.0
-        return min(xs), max(xs), min(ys), max(ys)
+                segments.append(seg)
+                owners.append(i)
+        if not segments:
+            return result
+        seg_bounds = BoundingBoxCalculator.segment_bounds(segments)
+        owners = np.array(owners)
+        # Los segmentos de cada path son contiguos: reducción por tramos
+        starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+        rows = owners[starts]
+        result[rows, 0] = np.minimum.reduceat(seg_bounds[:, 0], starts)
+        result[rows, 1] = np.maximum.reduceat(seg_bounds[:, 1], starts)
+        result[rows, 2] = np.minimum.reduceat(seg_bounds[:, 2], starts)
+        result[rows, 3] = np.maximum.reduceat(seg_bounds[:, 3], starts)
+        return result
 
+    @staticmethod
+    def segment_bounds(segments) -> np.ndarray:
+        " Bbox (n, 4) de cada segmento, usando la caché del trabajo y calculando los faltantes en bloque. "
+        cache = BoundingBoxCalculator._cache
+        bounds = np.empty((len(segments), 4))
+        missing = []
+        for k, seg in enumerate(segments):
+            entry = cache.get(id(seg))
+            if entry is not None and entry[0] is seg:
+                bounds[k] = entry[1]
+            else:
+                missing.append(k)
+        if missing:
+            computed = SegmentBounds.compute([segments[k] for k in missing])
+            bounds[missing] = computed
+            if len(cache) + len(missing) > BoundingBoxCalculator.MAX_CACHED_SEGMENTS:
+                cache.clear()
+            for k, row in zip(missing, computed):
+                cache[id(segments[k])] = (segments[k], row)
+        return bounds
+
+    @staticmethod
+    def clear_cache():
+        """Vacía la caché de bounding boxes (al iniciar un nuevo trabajo)."""
+        BoundingBoxCalculator._cache.clear()
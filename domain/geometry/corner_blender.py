@@ -0,0 +1,87 @@
+"""
+CornerBlender: Redondea las esquinas de los trazos muestreados con arcos tangentes dentro de una tolerancia.
+"""
+import numpy as np
+from domain.entities.stroke_buffer import StrokeBuffer
+
+
+class CornerBlender:
+    """
+    Reemplaza cada vértice interior con un giro de al menos min_angle_deg por un arco tangente a sus dos
+    segmentos, aproximado con tramos cortos que giran como máximo max_step_deg cada uno (como el G64 de
+    LinuxCNC, pero resuelto en el generador): la máquina ya no frena hasta casi detenerse en la esquina.
+
+    - El arco se elige con el radio más grande cuya polilínea no se aparta más de tolerance_mm del vértice
+      original: r = tol / (1/cos(φ/2) - cos(φ/2n)), con φ el giro y n la cantidad de tramos.
+    - Cada punto de tangencia queda a r·tan(φ/2) del vértice, como máximo a la mitad del segmento vecino
+      (los arcos de vértices contiguos no se pisan); si no entra, el radio se achica.
+    - Los extremos de los trazos y los vértices con segmentos de longitud casi nula no se tocan, por lo que
+      conviene aplicarlo sobre un buffer sin puntos repetidos (StrokeBuffer.snapped).
+    Tras blend(), `corners_blended` tiene la cantidad de vértices reemplazados.
+    """
+    MIN_SEGMENT = 1e-6
+
+    def __init__(self, tolerance_mm: float, min_angle_deg: float = 15.0, max_step_deg: float = 10.0):
+        if tolerance_mm < 0 or max_step_deg <= 0:
+            raise ValueError("tolerance_mm no puede ser negativa y max_step_deg debe ser positivo")
+        self.tolerance_mm = float(tolerance_mm)
+        self.min_angle = np.radians(max(0.0, float(min_angle_deg)))
+        self.max_step = np.radians(float(max_step_deg))
+        self.corners_blended = 0
+
+    def blend(self, strokes: StrokeBuffer) -> StrokeBuffer:
+        " Nuevo buffer con las esquinas redondeadas (mismos trazos, en el mismo orden). "
+        self.corners_blended = 0
+        coords, offsets = strokes.coords, strokes.offsets
+        n = len(coords)
+        if n < 3 or self.tolerance_mm <= 0:
+            return strokes
+        nonempty = np.diff(offsets) > 0
+        edge = np.zeros(n, dtype=bool)
+        edge[offsets[:-1][nonempty]] = True
+        edge[offsets[1:][nonempty] - 1] = True
+        vectors = np.diff(coords, axis=0)
+        lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        # Vértice en cada punto interior p (1..n-2), entre el segmento p-1 y el p
+        len_in, len_out = lengths[:-1], lengths[1:]
+        valid = ~edge[1:-1] & (len_in >= self.MIN_SEGMENT) & (len_out >= self.MIN_SEGMENT)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u_in = vectors[:-1] / len_in[:, None]
+            u_out = vectors[1:] / len_out[:, None]
+            turn = np.arccos(np.clip(np.einsum("ij,ij->i", u_in, u_out), -1.0, 1.0))
+        # Las reversiones (giro ≈ 180°) no admiten arco tangente
+        candidates = np.flatnonzero(valid & (turn >= max(self.min_angle, 1e-9)) & (turn < np.pi - 1e-6))
+        if not len(candidates):
+            return strokes
+        phi = turn[candidates]
+        steps = np.maximum(np.ceil(phi / self.max_step), 1).astype(np.int64)
+        half = phi / 2.0
+        radius = self.tolerance_mm / (1.0 / np.cos(half) - np.cos(half / steps))
+        reach = radius * np.tan(half)
+        limit = 0.5 * np.minimum(len_in[candidates], len_out[candidates])
+        clamped = reach > limit
+        reach = np.where(clamped, limit, reach)
+        radius = np.where(clamped, limit / np.tan(half), radius)
+        vertex = candidates + 1
+        cin, cout = u_in[candidates], u_out[candidates]
+        start = coords[vertex] - cin * reach[:, None]
+        # Centro a la izquierda del segmento de entrada si el giro es antihorario, a la derecha si es horario
+        side = np.where(cin[:, 0] * cout[:, 1] - cin[:, 1] * cout[:, 0] >= 0, 1.0, -1.0)
+        normal = np.column_stack((-cin[:, 1], cin[:, 0])) * side[:, None]
+        center = start + normal * radius[:, None]
+        # Cada vértice redondeado pasa a ser steps + 1 puntos: tangencia de entrada, interiores y de salida
+        counts = np.ones(n, dtype=np.int64)
+        counts[vertex] = steps + 1
+        out = np.repeat(coords, counts, axis=0)
+        first = np.concatenate(([0], np.cumsum(counts)))[vertex]
+        group = np.repeat(np.arange(len(vertex)), steps + 1)
+        within = np.arange(len(group)) - np.repeat(np.concatenate(([0], np.cumsum(steps + 1)))[:-1], steps + 1)
+        angle = side[group] * phi[group] * within / steps[group]
+        rel = start[group] - center[group]
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+        arc = center[group] + np.column_stack((rel[:, 0] * cos_a - rel[:, 1] * sin_a,
+                                               rel[:, 0] * sin_a + rel[:, 1] * cos_a))
+        out[np.repeat(first, steps + 1) + within] = arc
+        self.corners_blended = len(vertex)
+        new_offsets = np.concatenate(([0], np.cumsum(counts)))[offsets]
+        return StrokeBuffer(out, new_offsets)
@@ -60,6 +60,25 @@ class ScaleManager(LoggerHelper):
                 raise ValueError("Atributos SVG inválidos para calcular escala") from exc
         return 1.0
 
+    def fit_scale(self, bbox, scale: float, max_width_mm: float, max_height_mm: float) -> float:
+        """
+        Resuelve en un solo paso la escala final para que el bbox (xmin, xmax, ymin, ymax, en unidades SVG)
+        quepa en max_width_mm x max_height_mm: min(scale, max_width_mm/ancho, max_height_mm/alto).
+        Equivale a adjust_scale_for_max_height seguido de adjust_scale_for_max_width.
+        """
+        xmin, xmax, ymin, ymax = bbox
+        width_base = abs(xmax - xmin)
+        height_base = abs(ymax - ymin)
+        self._debug(f"fit_scale: bbox={bbox}, max_width_mm={max_width_mm:.4g}, max_height_mm={max_height_mm:.4g}, scale_in={scale:.4g}")
+        if height_base * scale > max_height_mm:
+            scale = scale * (max_height_mm / (height_base * scale))
+        if width_base * scale > max_width_mm:
+            scale = scale * (max_width_mm / (width_base * scale))
+        if scale <= 0 or not scale or scale != scale:
+            raise ValueError("Escala final inválida")
+        self._debug(f"fit_scale: FINAL width={width_base * scale:.4g}mm, height={height_base * scale:.4g}mm, scale_final={scale:.4g}")
+        return scale
+
     def adjust_scale_for_max_height(self, paths, scale: float, max_height_mm: float) -> float:
         " Ajusta el factor de escala para que la altura no supere max_height_mm. "
         bbox = BoundingBoxCalculator.get_svg_bbox(paths)
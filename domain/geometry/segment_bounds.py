@@ -0,0 +1,116 @@
+"""
+SegmentBounds: Bounding box exacto de segmentos SVG (Line, Bezier cuadrática/cúbica, Arc).
+"""
+from typing import List, Any
+import numpy as np
+from svgpathtools import Line, QuadraticBezier, CubicBezier, Arc
+
+
+class SegmentBounds:
+    """
+    Calcula (xmin, xmax, ymin, ymax) de cada segmento a partir de sus extremos analíticos.
+
+    - Line: extremos del segmento.
+    - Bezier cuadrática/cúbica: raíces de la derivada en (0, 1), resueltas por eje y vectorizadas
+      sobre los puntos de control de todos los segmentos del mismo tipo.
+    - Arc: ángulos donde se anula la derivada de la elipse rotada, filtrados por el barrido del arco.
+    - Otros segmentos (sin tipo conocido): se aproximan con 21 muestras de seg.point(t).
+    """
+    FALLBACK_SAMPLES = 21
+    EPS = 1e-12
+
+    @staticmethod
+    def compute(segments: List[Any]) -> np.ndarray:
+        " Devuelve un array (n, 4) con (xmin, xmax, ymin, ymax) de cada segmento, en el orden de entrada. "
+        bounds = np.empty((len(segments), 4))
+        groups = {Line: [], QuadraticBezier: [], CubicBezier: [], Arc: [], None: []}
+        for i, seg in enumerate(segments):
+            groups[type(seg) if type(seg) in groups else None].append(i)
+        if groups[Line]:
+            idx = groups[Line]
+            ctrl = np.array([(segments[i].start, segments[i].end) for i in idx], dtype=complex)
+            bounds[idx] = SegmentBounds._from_points(ctrl)
+        if groups[QuadraticBezier]:
+            idx = groups[QuadraticBezier]
+            ctrl = np.array([(s.start, s.control, s.end) for s in (segments[i] for i in idx)], dtype=complex)
+            bounds[idx] = SegmentBounds._quadratic(ctrl)
+        if groups[CubicBezier]:
+            idx = groups[CubicBezier]
+            ctrl = np.array([(s.start, s.control1, s.control2, s.end) for s in (segments[i] for i in idx)],
+                            dtype=complex)
+            bounds[idx] = SegmentBounds._cubic(ctrl)
+        if groups[Arc]:
+            idx = groups[Arc]
+            bounds[idx] = SegmentBounds._arcs([segments[i] for i in idx])
+        for i in groups[None]:
+            ts = np.linspace(0, 1, SegmentBounds.FALLBACK_SAMPLES)
+            bounds[i] = SegmentBounds._from_points(np.array([[segments[i].point(t) for t in ts]], dtype=complex))
+        return bounds
+
+    @staticmethod
+    def _from_points(pts: np.ndarray) -> np.ndarray:
+        " Bbox por fila de un array complejo (n, k), ignorando NaN (candidatos descartados). "
+        return np.column_stack((np.nanmin(pts.real, axis=1), np.nanmax(pts.real, axis=1),
+                                np.nanmin(pts.imag, axis=1), np.nanmax(pts.imag, axis=1)))
+
+    @staticmethod
+    def _interior(t: np.ndarray) -> np.ndarray:
+        " Conserva los parámetros en (0, 1); el resto pasa a NaN. "
+        return np.where((t > 0) & (t < 1), t, np.nan)
+
+    @staticmethod
+    def _quadratic(ctrl: np.ndarray) -> np.ndarray:
+        p0, p1, p2 = ctrl[:, 0:1], ctrl[:, 1:2], ctrl[:, 2:3]
+        cand = []
+        for axis in (np.real, np.imag):
+            # B'(t) = 0  <=>  t = (p0 - p1) / (p0 - 2 p1 + p2)
+            den = axis(p0 - 2 * p1 + p2)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = np.where(np.abs(den) > SegmentBounds.EPS, axis(p0 - p1) / den, np.nan)
+            cand.append(SegmentBounds._interior(t))
+        t = np.concatenate(cand, axis=1)
+        mt = 1 - t
+        interior = mt * mt * p0 + 2 * mt * t * p1 + t * t * p2
+        return SegmentBounds._from_points(np.concatenate((ctrl[:, [0, 2]], interior), axis=1))
+
+    @staticmethod
+    def _cubic(ctrl: np.ndarray) -> np.ndarray:
+        p0, p1, p2, p3 = (ctrl[:, k:k + 1] for k in range(4))
+        cand = []
+        for axis in (np.real, np.imag):
+            # B'(t) / 3 = a t² + b t + c
+            a = axis(-p0 + 3 * p1 - 3 * p2 + p3)
+            b = axis(2 * (p0 - 2 * p1 + p2))
+            c = axis(p1 - p0)
+            quadratic = np.abs(a) > SegmentBounds.EPS
+            disc = b * b - 4 * a * c
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sq = np.sqrt(np.where(disc >= 0, disc, np.nan))
+                r1 = np.where(quadratic, (-b + sq) / (2 * a), np.where(np.abs(b) > SegmentBounds.EPS, -c / b, np.nan))
+                r2 = np.where(quadratic, (-b - sq) / (2 * a), np.nan)
+            cand.append(SegmentBounds._interior(r1))
+            cand.append(SegmentBounds._interior(r2))
+        t = np.concatenate(cand, axis=1)
+        mt = 1 - t
+        interior = mt ** 3 * p0 + 3 * mt * mt * t * p1 + 3 * mt * t * t * p2 + t ** 3 * p3
+        return SegmentBounds._from_points(np.concatenate((ctrl[:, [0, 3]], interior), axis=1))
+
+    @staticmethod
+    def _arcs(arcs: List[Arc]) -> np.ndarray:
+        center = np.array([a.center for a in arcs], dtype=complex)[:, None]
+        rx = np.array([a.radius.real for a in arcs])[:, None]
+        ry = np.array([a.radius.imag for a in arcs])[:, None]
+        rot = np.array([a.rot_matrix for a in arcs], dtype=complex)[:, None]
+        theta0 = np.radians([a.theta for a in arcs])[:, None]
+        delta = np.radians([a.delta for a in arcs])[:, None]
+        cos_phi, sin_phi = rot.real, rot.imag
+        # x'(θ) = 0 y y'(θ) = 0 para la elipse rotada; cada uno tiene dos soluciones separadas por π
+        tx = np.arctan2(-ry * sin_phi, rx * cos_phi)
+        ty = np.arctan2(ry * cos_phi, rx * sin_phi)
+        angles = np.concatenate((tx, tx + np.pi, ty, ty + np.pi), axis=1)
+        # Distancia angular desde theta0 en el sentido del barrido
+        swept = np.mod(np.where(delta >= 0, angles - theta0, theta0 - angles), 2 * np.pi)
+        angles = np.where(swept <= np.abs(delta), angles, np.nan)
+        interior = center + rot * (rx * np.cos(angles) + 1j * ry * np.sin(angles))
+        ends = np.array([(a.start, a.end) for a in arcs], dtype=complex)
+        return SegmentBounds._from_points(np.concatenate((ends, interior), axis=1))
@@ -0,0 +1,64 @@
+"""
+SegmentCurvature: Derivadas y curvatura analíticas de segmentos SVG, vectorizadas sobre arrays de t.
+"""
+from typing import Any, Tuple
+import numpy as np
+from svgpathtools import Line, QuadraticBezier, CubicBezier, Arc
+
+
+class SegmentCurvature:
+    """
+    Calcula B'(t), B''(t) y la curvatura κ(t) = |B' × B''| / |B'|³ a partir de los puntos de control.
+
+    - Line: derivada constante y curvatura nula.
+    - QuadraticBezier / CubicBezier: derivadas de la forma de Bernstein.
+    - Arc: derivadas de la elipse rotada c + R·(rx·cos a + i·ry·sin a), con a = θ + t·Δ.
+    - Otros segmentos: diferencias finitas centradas sobre seg.point(t) (compatibilidad).
+    """
+    MIN_SPEED = 1e-10
+    FD_STEP = 1e-4
+
+    @staticmethod
+    def derivatives(segment: Any, ts) -> Tuple[np.ndarray, np.ndarray]:
+        " Devuelve (B'(t), B''(t)) como arrays complejos con la forma de ts. "
+        t = np.asarray(ts, dtype=float)
+        kind = type(segment)
+        if kind is Line:
+            d1 = np.full(t.shape, complex(segment.end - segment.start))
+            return d1, np.zeros(t.shape, dtype=complex)
+        if kind is QuadraticBezier:
+            p0, p1, p2 = segment.start, segment.control, segment.end
+            d1 = 2 * ((1 - t) * (p1 - p0) + t * (p2 - p1))
+            return d1, np.full(t.shape, complex(2 * (p2 - 2 * p1 + p0)))
+        if kind is CubicBezier:
+            p0, p1, p2, p3 = segment.start, segment.control1, segment.control2, segment.end
+            tc = 1 - t
+            d1 = 3 * (tc * tc * (p1 - p0) + 2 * tc * t * (p2 - p1) + t * t * (p3 - p2))
+            d2 = 6 * (tc * (p2 - 2 * p1 + p0) + t * (p3 - 2 * p2 + p1))
+            return d1, d2
+        if kind is Arc:
+            delta = np.radians(segment.delta)
+            angle = np.radians(segment.theta) + t * delta
+            rx, ry = segment.radius.real, segment.radius.imag
+            rot = segment.rot_matrix
+            d1 = rot * (-rx * np.sin(angle) + 1j * ry * np.cos(angle)) * delta
+            d2 = rot * (-rx * np.cos(angle) - 1j * ry * np.sin(angle)) * delta * delta
+            return d1, d2
+        h = SegmentCurvature.FD_STEP
+        ta, tb = np.clip(t - h, 0, 1), np.clip(t + h, 0, 1)
+        pa = np.array([segment.point(v) for v in np.ravel(ta)], dtype=complex).reshape(t.shape)
+        pm = np.array([segment.point(v) for v in np.ravel(t)], dtype=complex).reshape(t.shape)
+        pb = np.array([segment.point(v) for v in np.ravel(tb)], dtype=complex).reshape(t.shape)
+        d1 = (pb - pa) / (tb - ta)
+        d2 = (pb - 2 * pm + pa) / (h * h)
+        return d1, d2
+
+    @staticmethod
+    def curvature(segment: Any, ts) -> np.ndarray:
+        " Curvatura κ(t) (1 / unidades SVG) para cada t; 0 donde la velocidad es nula. "
+        d1, d2 = SegmentCurvature.derivatives(segment, ts)
+        speed = np.abs(d1)
+        cross = np.abs(d1.real * d2.imag - d1.imag * d2.real)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kappa = cross / speed ** 3
+        return np.where(speed > SegmentCurvature.MIN_SPEED, kappa, 0.0)
@@ -3,7 +3,7 @@ Puerto GcodeCompressionPort: interfaz para compresión de G-code en el dominio.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 from domain.compression_metrics import CompressionMetrics
 
 class GcodeCompressionPort(ABC):
@@ -14,3 +14,16 @@ class GcodeCompressionPort(ABC):
     def compress(self, gcode_lines: List[str], tolerance: float) -> Tuple[List[str], CompressionMetrics]:
         """Comprime líneas G-code respetando una tolerancia máxima"""
         pass
+
+    def compress_stream(self, gcode_lines: Iterable[str], tolerance: float, metrics: CompressionMetrics) -> Iterator[str]:
+        """
+        Versión en flujo de compress(): consume las líneas de forma perezosa y suma sus métricas
+        (arcos, movimientos relativos y redundancias) a `metrics` a medida que avanza.
+        Por defecto materializa la entrada y delega en compress(); los compresores que pueden
+        trabajar línea a línea la sobrescriben.
+        """
+        compressed, comp_metrics = self.compress(list(gcode_lines), tolerance)
+        metrics.arcs_created += comp_metrics.arcs_created
+        metrics.relative_moves += comp_metrics.relative_moves
+        metrics.redundancies_removed += comp_metrics.redundancies_removed
+        yield from compressed
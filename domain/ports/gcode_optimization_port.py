@@ -5,12 +5,25 @@ Puerto GcodeOptimizationPort: interfaz para optimización de comandos G-code en
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 from domain.gcode.commands.base_command import BaseCommand
+from domain.gcode.command_buffer import CommandBuffer
 
 class GcodeOptimizationPort(ABC):
     """
     Interfaz para optimizar comandos G-code y retornar métricas de optimización.
+    Los optimizadores vectorizados redefinen optimize_buffer() y delegan optimize() en _optimize_via_buffer().
     """
     @abstractmethod
     def optimize(self, commands: List[BaseCommand], tolerance: float) -> tuple[List[BaseCommand], Dict[str, Any]]:
         """Optimiza comandos y retorna métricas de optimización"""
         pass
+
+    def optimize_buffer(self, buffer: CommandBuffer, tolerance: float = None) -> tuple[CommandBuffer, Dict[str, Any]]:
+        """Optimiza un CommandBuffer. Por defecto convierte a objetos y usa optimize()."""
+        kwargs = {} if tolerance is None else {"tolerance": tolerance}
+        commands, metrics = self.optimize(buffer.to_commands(), **kwargs)
+        return CommandBuffer.from_commands(commands), metrics
+
+    def _optimize_via_buffer(self, commands, tolerance: float = None):
+        """Ejecuta optimize_buffer() y devuelve el resultado en el mismo formato de la entrada (lista o buffer)."""
+        buffer, metrics = self.optimize_buffer(CommandBuffer.from_commands(commands), tolerance)
+        return (buffer if isinstance(commands, CommandBuffer) else buffer.to_commands()), metrics
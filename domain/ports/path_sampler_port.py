@@ -4,7 +4,9 @@ Puerto PathSamplerPort: interfaz para muestreo de puntos en rutas SVG en el domi
 
 from abc import ABC, abstractmethod
 from typing import Iterable
+import numpy as np
 from domain.entities.point import Point
+from domain.entities.stroke_buffer import StrokeBuffer
 
 class PathSamplerPort(ABC):
     """
@@ -14,3 +16,19 @@ class PathSamplerPort(ABC):
     def sample(self, path) -> Iterable[Point]:
         """Genera puntos a lo largo de un path."""
         pass # noqa: W0107  # pylint: disable=unnecessary-pass
+
+    def for_scale(self, scale: float) -> "PathSamplerPort":
+        """
+        Devuelve un muestreador equivalente para un dibujo que se escalará por `scale`.
+        Por defecto el muestreo no depende de la escala y se devuelve el mismo muestreador.
+        """
+        return self
+
+    def sample_buffer(self, paths) -> StrokeBuffer:
+        """
+        Muestrea varios paths en un único StrokeBuffer (un trazo por path, en el mismo orden).
+        Por defecto llama a sample() por path; los muestreadores vectorizados lo redefinen.
+        """
+        return StrokeBuffer.from_arrays(
+            np.array([(pt.x, pt.y) for pt in self.sample(path)], dtype=float) for path in paths
+        )
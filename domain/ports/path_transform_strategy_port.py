@@ -3,6 +3,7 @@ Puerto: PathTransformStrategyPort
 Interfaz para estrategias de transformación de paths SVG.
 """
 from abc import ABC, abstractmethod
+import numpy as np
 
 class PathTransformStrategyPort(ABC):
     @abstractmethod
@@ -11,3 +12,11 @@ class PathTransformStrategyPort(ABC):
         Transforma un punto (x, y) y retorna el nuevo punto transformado.
         """
         pass
+
+    def transform_array(self, xs, ys):
+        """
+        Transforma arrays de coordenadas (xs, ys). Por defecto aplica transform punto a punto;
+        las estrategias afines pueden sobrescribirlo con una versión vectorizada.
+        """
+        pairs = [self.transform(x, y) for x, y in zip(xs, ys)]
+        return np.array([p[0] for p in pairs], dtype=float), np.array([p[1] for p in pairs], dtype=float)
@@ -4,6 +4,8 @@ Define la interfaz TransformManagerPort para aplicar estrategias de transformaci
 """
 from abc import ABC, abstractmethod
 from typing import List, Tuple
+import numpy as np
+from domain.entities.stroke_buffer import StrokeBuffer
 from domain.ports.path_transform_strategy_port import PathTransformStrategyPort
 
 class TransformManagerPort(ABC):
@@ -12,6 +14,16 @@ class TransformManagerPort(ABC):
         """Aplica todas las estrategias de transformación al punto (x, y)."""
         pass
 
+    def apply_array(self, xs, ys):
+        """Aplica las transformaciones a arrays de coordenadas (por defecto, punto a punto)."""
+        pairs = [self.apply(x, y) for x, y in zip(xs, ys)]
+        return np.array([p[0] for p in pairs], dtype=float), np.array([p[1] for p in pairs], dtype=float)
+
+    def apply_buffer(self, buffer: StrokeBuffer) -> StrokeBuffer:
+        """Aplica las transformaciones a todos los puntos de un StrokeBuffer (conserva los trazos)."""
+        xs, ys = self.apply_array(buffer.coords[:, 0], buffer.coords[:, 1])
+        return buffer.with_coords(np.column_stack((xs, ys)))
+
     @abstractmethod
     def add_strategy(self, strategy: PathTransformStrategyPort):
         """Agrega una nueva estrategia de transformación."""
@@ -20,5 +32,9 @@ class TransformManagerPort(ABC):
 class NullTransformManager:
     def apply(self, x, y):
         return x, y
+    def apply_array(self, xs, ys):
+        return xs, ys
+    def apply_buffer(self, buffer):
+        return buffer
     def add_strategy(self, strategy):
         pass
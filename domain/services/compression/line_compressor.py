@@ -3,15 +3,60 @@ Compresor para optimizar líneas de G-code consolidando movimientos lineales.
 """
 from domain.ports.gcode_compression_port import GcodeCompressionPort
 from domain.compression_metrics import CompressionMetrics
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 import re
 
+class _ModalState:
+    """
+    Estado modal mínimo para interpretar el G-code compacto (líneas sin G o sin ejes repetidos):
+    último G de movimiento, posición absoluta como texto y modo relativo. None = desconocido.
+    """
+    MOTION_WORD = re.compile(r'G([0-3])(?!\d)')
+    AXIS = re.compile(r'([XY])([\d.-]+)')
+
+    def __init__(self):
+        self.word = None
+        self.x = None
+        self.y = None
+        self.relative = False
+
+    def update(self, line: str):
+        if line.startswith('G91'):
+            # Bloque G91/G90 en un solo elemento, o G91 suelto hasta el próximo G90
+            self.relative = not line.endswith('G90')
+            self.word = self.x = self.y = None
+            return
+        if line.startswith('G90'):
+            self.relative = False
+            return
+        word = self.MOTION_WORD.match(line)
+        if word:
+            self.word = int(word.group(1))
+        elif not line.startswith(('X', 'Y', 'F', 'G4')):
+            # Otros comandos (herramienta, comentarios, etc.): el G modal deja de asumirse
+            self.word = None
+            return
+        if self.relative or self.word is None:
+            self.x = self.y = None
+            return
+        for axis, value in self.AXIS.findall(line):
+            if axis == 'X':
+                self.x = value
+            else:
+                self.y = value
+
+
 class LineCompressor(GcodeCompressionPort):
     """
     Comprime secuencias de movimientos lineales en la misma coordenada.
-    Trabaja directamente con líneas de texto G-code.
+    Trabaja directamente con líneas de texto G-code, de a una: compress() y compress_stream()
+    comparten la misma máquina de estados y solo retienen la secuencia G1 en curso.
+    Entiende también el G-code compacto/modal (G1 implícito, ejes omitidos, sin espacios);
+    las coordenadas se copian tal como vienen, de modo que se respeta el formato de salida.
     """
-    
+    G1_PATTERN = re.compile(r'G1 X([\d.-]+) Y([\d.-]+)(?: F(\d+))?')
+    MODAL_G1_PATTERN = re.compile(r'(G1(?!\d))? ?(?:X([\d.-]+))? ?(?:Y([\d.-]+))? ?(?:F(\d+)(?:\.\d*)?)?$')
+
     def compress(self, gcode_lines: List[str], tolerance: float) -> Tuple[List[str], CompressionMetrics]:
         """
         Comprime líneas de G-code buscando movimientos lineales consecutivos.
@@ -21,68 +66,69 @@ class LineCompressor(GcodeCompressionPort):
         Returns:
             Tupla (líneas comprimidas, métricas de compresión)
         """
-        optimized_lines = []
-        i = 0
-        segments_removed = 0
-        lines_optimized = 0
-        
-        while i < len(gcode_lines):
-            line = gcode_lines[i].strip()
-            
+        metrics = CompressionMetrics(original_lines=len(gcode_lines), compressed_lines=0)
+        optimized_lines = list(self.compress_stream(gcode_lines, tolerance, metrics))
+        metrics.compressed_lines = len(optimized_lines)
+        return optimized_lines, metrics
+
+    def compress_stream(self, gcode_lines: Iterable[str], tolerance: float, metrics: CompressionMetrics) -> Iterator[str]:
+        """
+        Comprime un flujo de líneas G-code; suma a metrics.redundancies_removed los segmentos eliminados.
+        """
+        modal = _ModalState()
+        # Secuencia en curso: [primera línea, x final, y de referencia (texto), feedrate, longitud]
+        sequence = None
+        for raw_line in gcode_lines:
+            line = raw_line.strip()
+            move = self._linear_move(line, modal)
+            modal.update(line)
+            if sequence is not None:
+                if move and abs(float(move[1]) - float(sequence[2])) < tolerance:
+                    sequence[1] = move[0]
+                    # Actualizar feedrate si está presente
+                    if move[2]:
+                        sequence[3] = move[2]
+                    sequence[4] += 1
+                    continue
+                yield self._close_sequence(sequence, metrics)
+                sequence = None
             # Preservar comandos de configuración y comentarios
-            if not line.startswith('G1 '):
-                optimized_lines.append(line)
-                i += 1
+            if move is None:
+                yield line
                 continue
-            
-            # Detectar inicio de una secuencia lineal
-            g1_match = re.match(r'G1 X([\d.-]+) Y([\d.-]+)(?: F(\d+))?', line)
-            if not g1_match:
-                optimized_lines.append(line)
-                i += 1
-                continue
-                
-            y_value = float(g1_match.group(2))
-            current_y = y_value
-            start_x = float(g1_match.group(1))
-            feedrate = g1_match.group(3)
-            
-            # Buscar último punto en esta secuencia Y
-            j = i + 1
-            sequence_length = 1
-            end_x = start_x
-            
-            while j < len(gcode_lines):
-                next_line = gcode_lines[j].strip()
-                next_match = re.match(r'G1 X([\d.-]+) Y([\d.-]+)(?: F(\d+))?', next_line)
-                
-                if next_match and abs(float(next_match.group(2)) - current_y) < tolerance:
-                    end_x = float(next_match.group(1))
-                    # Actualizar feedrate si está presente
-                    if next_match.group(3):
-                        feedrate = next_match.group(3)
-                    sequence_length += 1
-                    j += 1
-                else:
-                    break
-            
-            # Si encontramos una secuencia, generar comando optimizado
-            if sequence_length > 1:
-                feed_part = f" F{feedrate}" if feedrate else ""
-                optimized_lines.append(f"G1 X{end_x:.3f} Y{current_y:.3f}{feed_part}")
-                segments_removed += sequence_length - 1
-                lines_optimized += 1
-                i = j
-            else:
-                optimized_lines.append(line)
-                i += 1
-        
-        metrics = CompressionMetrics(
-            original_lines=len(gcode_lines),
-            compressed_lines=len(optimized_lines),
-            arcs_created=0,
-            relative_moves=0,
-            redundancies_removed=segments_removed
-        )
-        
-        return optimized_lines, metrics
+            # Inicio de una secuencia lineal
+            sequence = [line, move[0], move[1], move[2], 1]
+        if sequence is not None:
+            yield self._close_sequence(sequence, metrics)
+
+    def _linear_move(self, line: str, modal: _ModalState):
+        " (x, y, feed) como texto si la línea es un G1 absoluto con destino conocido; None si no. "
+        if modal.relative:
+            return None
+        if line.startswith('G1 '):
+            g1_match = self.G1_PATTERN.match(line)
+            if g1_match:
+                return g1_match.groups()
+        if not line.startswith(('G1', 'X', 'Y')):
+            return None
+        modal_match = self.MODAL_G1_PATTERN.match(line)
+        if not modal_match:
+            return None
+        explicit, x, y, feed = modal_match.groups()
+        if (not explicit and modal.word != 1) or (x is None and y is None):
+            return None
+        x = x if x is not None else modal.x
+        y = y if y is not None else modal.y
+        if x is None or y is None:
+            return None
+        return x, y, feed
+
+    @staticmethod
+    def _close_sequence(sequence, metrics: CompressionMetrics) -> str:
+        " Línea que reemplaza a la secuencia: la original si tiene un solo movimiento, o el G1 consolidado. "
+        line, end_x, current_y, feedrate, sequence_length = sequence
+        if sequence_length == 1:
+            return line
+        metrics.redundancies_removed += sequence_length - 1
+        feed_part = f" F{feedrate}" if feedrate else ""
+        return f"G1 X{end_x} Y{current_y}{feed_part}"
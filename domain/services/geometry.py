@@ -3,6 +3,7 @@ Servicio de geometría para cálculo de bounding box y centro de paths SVG.
 """
 from typing import Tuple, List, Any
 import numpy as np
+from domain.geometry.bounding_box_calculator import BoundingBoxCalculator
 
 class GeometryService:
     """
@@ -18,18 +19,12 @@ class GeometryService:
     @staticmethod
     def _calculate_bbox(paths: List[Any]) -> Tuple[float, float, float, float]:
         """
-        Calcula el bounding box de una lista de paths SVG.
+        Calcula el bounding box exacto de una lista de paths SVG (compartido con BoundingBoxCalculator).
         """
-        xs, ys = [], []
-        for p in paths:
-            for seg in p:
-                for t in range(21):
-                    z = seg.point(t/20)
-                    xs.append(z.real)
-                    ys.append(z.imag)
-        if not xs or not ys:
+        bbox = BoundingBoxCalculator.combine_bounds(BoundingBoxCalculator.path_bounds(paths))
+        if bbox is None:
             raise ValueError("No points found in paths.")
-        return min(xs), max(xs), min(ys), max(ys)
+        return bbox
 
     @staticmethod
     def center(bbox: Tuple[float, float, float, float]) -> Tuple[float, float]:
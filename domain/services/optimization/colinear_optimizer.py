@@ -1,54 +1,61 @@
 from typing import List, Dict, Any
+import numpy as np
 from domain.ports.gcode_optimization_port import GcodeOptimizationPort
 from domain.gcode.commands.base_command import BaseCommand
-from domain.gcode.commands.move_command import MoveCommand
+from domain.gcode.command_buffer import CommandBuffer
 
 class ColinearOptimizer(GcodeOptimizationPort):
     """Optimiza secuencias de MoveCommand colineales."""
     def optimize(self, commands: List[BaseCommand], tolerance: float = 0.01) -> tuple[List[BaseCommand], Dict[str, Any]]:
-        optimized_cmds = []
-        i = 0
-        lines_saved = 0
-        while i < len(commands):
-            cmd = commands[i]
-            if (
-                isinstance(cmd, MoveCommand)
-                and not cmd.rapid
-                and i + 1 < len(commands)
-            ):
-                start = i
-                points = [(cmd.x, cmd.y)]
-                feed = cmd.feed
-                j = i + 1
-                while (
-                    j < len(commands)
-                    and isinstance(commands[j], MoveCommand)
-                    and not commands[j].rapid
-                ):
-                    points.append((commands[j].x, commands[j].y))
-                    j += 1
-                if len(points) >= 3:
-                    optimized_points = [points[0]]
-                    dx_prev = points[1][0] - points[0][0]
-                    dy_prev = points[1][1] - points[0][1]
-                    for k in range(2, len(points)):
-                        dx = points[k][0] - points[k-1][0]
-                        dy = points[k][1] - points[k-1][1]
-                        # Usar tolerancia para colinealidad
-                        if abs(dx * dy_prev - dy * dx_prev) > tolerance:
-                            optimized_points.append(points[k-1])
-                            dx_prev = dx
-                            dy_prev = dy
-                    optimized_points.append(points[-1])
-                    lines_saved += len(points) - len(optimized_points)
-                    for idx, (x, y) in enumerate(optimized_points):
-                        optimized_cmds.append(MoveCommand(x, y, feed if idx == 0 else None, rapid=False))
-                else:
-                    for k in range(start, j):
-                        optimized_cmds.append(commands[k])
-                i = j
-            else:
-                optimized_cmds.append(cmd)
-                i += 1
-        metrics = {"lines_saved": lines_saved}
-        return optimized_cmds, metrics
+        return self._optimize_via_buffer(commands, tolerance)
+
+    def optimize_buffer(self, buffer: CommandBuffer, tolerance: float = None) -> tuple[CommandBuffer, Dict[str, Any]]:
+        """
+        En cada secuencia de 3 o más G1 se conserva el primer punto, el último y los puntos donde la dirección
+        se aparta de la última dirección conservada (|producto cruz| > tolerancia). Los G1 conservados
+        pierden su feed salvo el primero de la secuencia.
+        """
+        tol = 0.01 if tolerance is None else tolerance
+        n = len(buffer)
+        starts, ends = CommandBuffer.runs(buffer.is_linear())
+        long_runs = ends - starts >= 3
+        if not long_runs.any():
+            return buffer, {"lines_saved": 0}
+        x, y = buffer.x, buffer.y
+        dx, dy = np.diff(x), np.diff(y)
+        dxl, dyl = dx.tolist(), dy.tolist()
+        keep = np.ones(n, dtype=bool)
+        clear_feed = np.zeros(n, dtype=bool)
+        for a, b in zip(starts[long_runs].tolist(), ends[long_runs].tolist()):
+            keep[a + 1:b - 1] = False
+            clear_feed[a + 1:b] = True
+            # Segmento k: del comando k al k + 1; el último segmento de la secuencia es b - 2
+            anchor = a
+            while True:
+                turn = self._next_turn(dx, dy, dxl, dyl, anchor, b - 1, tol)
+                if turn >= b - 1:
+                    break
+                keep[turn] = True
+                anchor = turn
+        result = buffer.copy()
+        result.feed[clear_feed] = np.nan
+        result = result.take(keep)
+        metrics = {"lines_saved": int(n - keep.sum())}
+        return result, metrics
+
+    @staticmethod
+    def _next_turn(dx, dy, dxl, dyl, anchor: int, stop: int, tol: float) -> int:
+        " Primer segmento s en (anchor, stop) que no es colineal con el segmento anchor; stop si no hay. "
+        ax, ay = dxl[anchor], dyl[anchor]
+        s = anchor + 1
+        # Caso frecuente en curvas: el segmento siguiente ya gira
+        if s < stop and abs(dxl[s] * ay - dyl[s] * ax) > tol:
+            return s
+        lo, width = s + 1, 64
+        while lo < stop:
+            hi = min(stop, lo + width)
+            hit = np.flatnonzero(np.abs(dx[lo:hi] * ay - dy[lo:hi] * ax) > tol)
+            if len(hit):
+                return lo + int(hit[0])
+            lo, width = hi, width * 2
+        return stop
@@ -2,9 +2,10 @@
 LineOptimizer: Optimizador para consolidar movimientos lineales en la misma coordenada.
 """
 from typing import List, Dict, Any
+import numpy as np
 from domain.ports.gcode_optimization_port import GcodeOptimizationPort
 from domain.gcode.commands.base_command import BaseCommand
-from domain.gcode.commands.move_command import MoveCommand
+from domain.gcode.command_buffer import CommandBuffer
 
 class LineOptimizer(GcodeOptimizationPort):
     """
@@ -24,55 +25,57 @@ class LineOptimizer(GcodeOptimizationPort):
         """
         Optimiza comandos consolidando secuencias lineales en la misma coordenada.
         Args:
-            commands: Lista de comandos BaseCommand a optimizar
+            commands: Lista de comandos BaseCommand (o CommandBuffer) a optimizar
             tolerance: Tolerancia opcional (usa la del objeto si no se proporciona)
         Returns:
-            Tupla con (lista de comandos optimizados, métricas de optimización)
+            Tupla con (comandos optimizados en el mismo formato de la entrada, métricas de optimización)
+        """
+        return self._optimize_via_buffer(commands, tolerance)
+
+    def optimize_buffer(self, buffer: CommandBuffer, tolerance: float = None) -> tuple[CommandBuffer, Dict[str, Any]]:
+        """
+        Versión vectorizada: una secuencia empieza en un G1 (ancla) y continúa mientras los G1 siguientes
+        tengan la misma Y que el ancla (dentro de la tolerancia) y feed nulo o igual al del ancla.
+        Cada secuencia se reemplaza por un G1 a la X final con la Y y el feed del ancla.
         """
-        result = []
-        i = 0
-        lines_optimized = 0
-        segments_removed = 0
         tol = tolerance if tolerance is not None else self.tolerance
-        
-        while i < len(commands):
-            # Si no es un comando de movimiento, simplemente añadirlo
-            if not isinstance(commands[i], MoveCommand) or commands[i].rapid:
-                result.append(commands[i])
-                i += 1
-                continue
-                
-            # Potencial inicio de secuencia lineal
-            current = commands[i]
-            sequence = [current]
-            constant_y = current.y
-            constant_feed = current.feed
-            start_x = current.x
-            
-            # Buscar secuencia con Y constante
-            j = i + 1
-            while (j < len(commands) and 
-                   isinstance(commands[j], MoveCommand) and 
-                   not commands[j].rapid and
-                   abs(commands[j].y - constant_y) < tol and
-                   (commands[j].feed is None or commands[j].feed == constant_feed)):
-                sequence.append(commands[j])
-                j += 1
-                
-            # Si encontramos una secuencia suficientemente larga, optimizarla
-            if len(sequence) > 1:
-                end_x = sequence[-1].x
-                # Reemplazar toda la secuencia con un único movimiento
-                result.append(MoveCommand(end_x, constant_y, constant_feed, rapid=False))
-                segments_removed += len(sequence) - 1
-                lines_optimized += 1
-                i = j
-            else:
-                result.append(current)
-                i += 1
-        
+        n = len(buffer)
+        linear = buffer.is_linear()
+        y, feed = buffer.y, buffer.feed
+        # Cortes seguros: comandos que no son G1 o saltos de Y >= 2·tol (ningún ancla previa puede cubrirlos)
+        link = np.zeros(n, dtype=bool)
+        link[1:] = linear[1:] & linear[:-1] & (np.abs(y[1:] - y[:-1]) < 2 * tol)
+        starts = np.flatnonzero(~link)
+        ends = np.append(starts[1:], n)
+        if n:
+            # Bloque resuelto directamente si toda su Y está a menos de tol del ancla y los feeds coinciden
+            anchor = np.repeat(starts, ends - starts)
+            same_feed = np.isnan(feed) | (feed == feed[anchor]) | (np.arange(n) == anchor)
+            ok = (np.abs(y - y[anchor]) < tol) & same_feed
+            simple = np.logical_and.reduceat(ok, starts)
+            if not simple.all():
+                starts = self._sequential_starts(y, feed, tol, starts, ends, simple)
+                ends = np.append(starts[1:], n)
+        merged = ends - starts > 1
+        result = buffer.take(starts)
+        result.x[merged] = buffer.x[ends[merged] - 1]
         metrics = {
-            "segments_removed": segments_removed,
-            "lines_optimized": lines_optimized
+            "segments_removed": int((ends - starts - 1)[merged].sum()),
+            "lines_optimized": int(merged.sum())
         }
         return result, metrics
+
+    @staticmethod
+    def _sequential_starts(y: np.ndarray, feed: np.ndarray, tol: float, starts, ends, simple) -> np.ndarray:
+        " Recorre en orden los bloques no resueltos (Y con deriva o feeds distintos) para ubicar cada ancla. "
+        result = []
+        for a, b, done in zip(starts.tolist(), ends.tolist(), simple.tolist()):
+            result.append(a)
+            if done:
+                continue
+            anchor = a
+            for k in range(a + 1, b):
+                if abs(y[k] - y[anchor]) >= tol or not (np.isnan(feed[k]) or feed[k] == feed[anchor]):
+                    anchor = k
+                    result.append(k)
+        return np.array(result, dtype=np.int64)
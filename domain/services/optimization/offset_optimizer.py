@@ -1,5 +1,6 @@
 from typing import List, Dict, Any, Tuple
 from domain.ports.gcode_optimization_port import GcodeOptimizationPort
+from domain.gcode.command_buffer import CommandBuffer
 
 class OffsetOptimizer(GcodeOptimizationPort):
     """
@@ -14,25 +15,28 @@ class OffsetOptimizer(GcodeOptimizationPort):
     def optimize(self, commands: List[Any], tolerance: float = 0.0) -> Tuple[List[Any], Dict[str, Any]]:
         """
         Applies X/Y offset to all movement commands (MoveCommand, ArcCommand, etc).
-        Returns new command list and metrics.
+        Returns new command list (or CommandBuffer, matching the input) and metrics.
         """
-        offset_applied = 0
-        new_commands = []
-        for cmd in commands:
-            # Only apply to commands with x/y attributes (e.g. MoveCommand, ArcCommand)
-            if hasattr(cmd, 'x') and hasattr(cmd, 'y'):
-                orig_x, orig_y = cmd.x, cmd.y
-                if self.is_relative:
-                    cmd.x = orig_x * (1 + self.offset_x)
-                    cmd.y = orig_y * (1 + self.offset_y)
-                else:
-                    cmd.x = orig_x + self.offset_x
-                    cmd.y = orig_y + self.offset_y
-                offset_applied += 1
-            new_commands.append(cmd)
+        return self._optimize_via_buffer(commands, tolerance)
+
+    def optimize_buffer(self, buffer: CommandBuffer, tolerance: float = None) -> Tuple[CommandBuffer, Dict[str, Any]]:
+        """
+        Vectorized offset over the X/Y columns of every command that has coordinates.
+        Arc centers (I/J) are relative to the start point and are left unchanged.
+        """
+        result = buffer.copy()
+        mask = result.has_xy()
+        if self.is_relative:
+            result.x[mask] *= 1 + self.offset_x
+            result.y[mask] *= 1 + self.offset_y
+        else:
+            result.x[mask] += self.offset_x
+            result.y[mask] += self.offset_y
+        offset_applied = int(mask.sum())
+        total = len(buffer)
         metrics = {
             "offset_applied": offset_applied,
-            "total_commands": len(commands),
-            "optimization_rate": offset_applied / len(commands) if commands else 0.0
+            "total_commands": total,
+            "optimization_rate": offset_applied / total if total else 0.0
         }
-        return new_commands, metrics
+        return result, metrics
@@ -1,22 +1,50 @@
 from domain.ports.gcode_optimization_chain_port import GcodeOptimizationChainPort
+from domain.gcode.command_buffer import CommandBuffer
 from domain.services.optimization.arc_optimizer import ArcOptimizer
 from domain.services.optimization.colinear_optimizer import ColinearOptimizer
 from domain.services.optimization.line_optimizer import LineOptimizer
 from domain.services.optimization.path_planner_optimizer import PathPlannerOptimizer
 
 class OptimizationChain(GcodeOptimizationChainPort):
-    def __init__(self, optimizers=None):
+    # Diferencia de tiempo simulado (s) que se considera ruido numérico
+    TIME_TOLERANCE_S = 1e-6
+
+    def __init__(self, optimizers=None, time_estimator=None):
         self.optimizers = optimizers or [
             PathPlannerOptimizer(min_distance=5.0),  # Primero reordenar los trazos
             LineOptimizer(tolerance=0.001),  # Luego consolidar líneas
             ColinearOptimizer(),
             ArcOptimizer(tolerance=0.1)
         ]
+        # Opcional (MotionSimulator): descarta los pasos que alargan el tiempo real de ploteo
+        self.time_estimator = time_estimator
 
     def optimize(self, commands):
-        current_commands = commands
+        " Aplica los optimizadores sobre un único CommandBuffer; devuelve el formato de la entrada (lista o buffer). "
+        current_commands = CommandBuffer.from_commands(commands)
         metrics = {}
+        estimator = self.time_estimator
+        best_time = estimator.estimate(current_commands).estimated_time_s if estimator is not None else None
+        rejected = 0
         for optimizer in self.optimizers:
-            current_commands, opt_metrics = optimizer.optimize(current_commands)
+            previous = current_commands
+            if hasattr(optimizer, 'optimize_buffer'):
+                current_commands, opt_metrics = optimizer.optimize_buffer(current_commands)
+            else:
+                result, opt_metrics = optimizer.optimize(current_commands.to_commands())
+                current_commands = CommandBuffer.from_commands(result)
             metrics.update(opt_metrics)
-        return current_commands, metrics
+            if estimator is not None:
+                # Menos líneas no implica menos tiempo: se compara por tiempo simulado
+                elapsed = estimator.estimate(current_commands).estimated_time_s
+                if elapsed > best_time + self.TIME_TOLERANCE_S:
+                    current_commands = previous
+                    rejected += 1
+                else:
+                    best_time = elapsed
+        if estimator is not None:
+            metrics["estimated_time_s"] = best_time
+            metrics["optimizations_rejected"] = rejected
+        if isinstance(commands, CommandBuffer):
+            return current_commands, metrics
+        return current_commands.to_commands(), metrics
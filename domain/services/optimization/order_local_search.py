@@ -0,0 +1,140 @@
+"""
+OrderLocalSearch: Mejora anytime (2-opt / Or-opt) del orden de trazos con presupuesto de tiempo.
+"""
+import time
+from typing import Optional, Tuple
+import numpy as np
+
+
+class OrderLocalSearch:
+    """
+    Mejora una secuencia de trazos minimizando el recorrido en vacío (fin de un trazo -> inicio del siguiente).
+
+    - 2-opt: invierte un bloque contiguo de trazos (cada trazo del bloque se recorre al revés).
+    - Or-opt: mueve una cadena de 1 a MAX_CHAIN trazos a otra posición, opcionalmente invertida.
+    - Las ganancias de cada movimiento se evalúan vectorizadas con NumPy sobre todas las posiciones destino.
+    - Es "anytime": al agotarse budget_s devuelve la mejor secuencia encontrada hasta ese momento.
+    - El primer trazo conserva su posición y sentido, igual que en el orden greedy.
+    """
+    MAX_CHAIN = 3
+    MIN_GAIN = 1e-9
+
+    def __init__(self, budget_s: float, allow_reversal: bool = False, clock=time.perf_counter):
+        self.budget_s = budget_s
+        self.allow_reversal = allow_reversal
+        self._clock = clock
+
+    @staticmethod
+    def travel(starts: np.ndarray, ends: np.ndarray) -> float:
+        " Distancia total en vacío de una secuencia de trazos ya orientados. "
+        if len(starts) < 2:
+            return 0.0
+        return float(np.hypot(*(starts[1:] - ends[:-1]).T).sum())
+
+    def improve(self, starts, ends, reversible: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        starts, ends: arrays (n, 2) con los extremos de cada trazo en el orden actual.
+        reversible: máscara opcional de trazos que pueden invertirse (solo si allow_reversal).
+        Devuelve (orden, invertidos): índices de la secuencia original y si cada trazo quedó invertido.
+        """
+        self._S = np.array(starts, dtype=float).reshape(-1, 2)
+        self._E = np.array(ends, dtype=float).reshape(-1, 2)
+        n = len(self._S)
+        self._perm = np.arange(n)
+        self._flip = np.zeros(n, dtype=bool)
+        if self.allow_reversal:
+            self._rev_ok = np.ones(n, dtype=bool) if reversible is None else np.array(reversible, dtype=bool)
+        else:
+            self._rev_ok = np.zeros(n, dtype=bool)
+        if n < 3 or self.budget_s <= 0:
+            return self._perm, self._flip
+        deadline = self._clock() + self.budget_s
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, n):
+                if self._clock() >= deadline:
+                    return self._perm, self._flip
+                if self._rev_ok[i] and self._two_opt(i):
+                    improved = True
+                for length in range(1, self.MAX_CHAIN + 1):
+                    if i + length <= n and self._or_opt(i, length):
+                        improved = True
+        return self._perm, self._flip
+
+    def _two_opt(self, i: int) -> bool:
+        " Busca el mejor bloque [i, j] a invertir; lo aplica si reduce el recorrido. "
+        S, E = self._S, self._E
+        n = len(S)
+        # El bloque solo puede extenderse mientras sus trazos sean reversibles
+        blocked = np.flatnonzero(~self._rev_ok[i:])
+        limit = n - i if len(blocked) == 0 else int(blocked[0])
+        prev = E[i - 1]
+        # delta(j) = d(E[i-1], E[j]) - d(E[i-1], S[i]) + d(S[i], S[j+1]) - d(E[j], S[j+1])
+        delta = np.hypot(*(E[i:i + limit] - prev).T) - np.hypot(*(S[i] - prev))
+        last = min(i + limit, n - 1)
+        if last > i:
+            nxt = S[i + 1:last + 1]
+            delta[:last - i] += np.hypot(*(nxt - S[i]).T) - np.hypot(*(nxt - E[i:last]).T)
+        k = int(np.argmin(delta))
+        if delta[k] >= -self.MIN_GAIN:
+            return False
+        j = i + k
+        block = slice(i, j + 1)
+        S[block], E[block] = E[block][::-1].copy(), S[block][::-1].copy()
+        self._perm[block] = self._perm[block][::-1].copy()
+        self._flip[block] = ~self._flip[block][::-1]
+        self._rev_ok[block] = self._rev_ok[block][::-1].copy()
+        return True
+
+    def _or_opt(self, i: int, length: int) -> bool:
+        " Busca la mejor posición para reinsertar la cadena [i, i+length); la mueve si reduce el recorrido. "
+        S, E = self._S, self._E
+        n = len(S)
+        end = i + length
+        cs, ce, prev = S[i], E[end - 1], E[i - 1]
+        if end < n:
+            nxt = S[end]
+            removal_gain = np.hypot(*(cs - prev)) + np.hypot(*(nxt - ce)) - np.hypot(*(nxt - prev))
+        else:
+            removal_gain = np.hypot(*(cs - prev))
+        if removal_gain <= self.MIN_GAIN:
+            return False
+        # Coste de insertar la cadena después de cada posición p (p = n-1: al final de la secuencia)
+        edge = np.hypot(*(S[1:] - E[:-1]).T)
+        cost = np.empty(n)
+        cost[:-1] = np.hypot(*(E[:-1] - cs).T) + np.hypot(*(S[1:] - ce).T) - edge
+        cost[-1] = np.hypot(*(E[-1] - cs))
+        # Las posiciones adyacentes o internas a la cadena no son destinos válidos
+        cost[i - 1:end] = np.inf
+        reverse = self.allow_reversal and bool(self._rev_ok[i:end].all())
+        if reverse:
+            cost_rev = np.empty(n)
+            cost_rev[:-1] = np.hypot(*(E[:-1] - ce).T) + np.hypot(*(S[1:] - cs).T) - edge
+            cost_rev[-1] = np.hypot(*(E[-1] - ce))
+            cost_rev[i - 1:end] = np.inf
+            p_rev = int(np.argmin(cost_rev))
+        p = int(np.argmin(cost))
+        reversed_chain = reverse and cost_rev[p_rev] < cost[p]
+        if reversed_chain:
+            p = p_rev
+            best = cost_rev[p]
+        else:
+            best = cost[p]
+        if best - removal_gain >= -self.MIN_GAIN:
+            return False
+        chain = np.arange(i, end)
+        if reversed_chain:
+            chain = chain[::-1]
+        if p < i:
+            idx = np.concatenate((np.arange(p + 1), chain, np.arange(p + 1, i), np.arange(end, n)))
+            chain_pos = slice(p + 1, p + 1 + length)
+        else:
+            idx = np.concatenate((np.arange(i), np.arange(end, p + 1), chain, np.arange(p + 1, n)))
+            chain_pos = slice(p + 1 - length, p + 1)
+        self._S, self._E = S[idx], E[idx]
+        self._perm, self._flip, self._rev_ok = self._perm[idx], self._flip[idx], self._rev_ok[idx]
+        if reversed_chain:
+            self._S[chain_pos], self._E[chain_pos] = self._E[chain_pos].copy(), self._S[chain_pos].copy()
+            self._flip[chain_pos] = ~self._flip[chain_pos]
+        return True
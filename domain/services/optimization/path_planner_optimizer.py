@@ -6,6 +6,7 @@ from domain.ports.gcode_optimization_port import GcodeOptimizationPort
 from domain.gcode.commands.base_command import BaseCommand
 from domain.gcode.commands.move_command import MoveCommand
 import math
+import numpy as np
 
 class PathPlannerOptimizer(GcodeOptimizationPort):
     """Optimiza el orden de los trazos para minimizar la distancia total de movimientos rápidos."""
@@ -100,23 +101,50 @@ class PathPlannerOptimizer(GcodeOptimizationPort):
                 return last_pos
         # Primer trazo no se reordena, ni el último si es solo bloque final
         strokes = [Stroke(g, i, l) for i, (g, l) in enumerate(zip(bloques_trazos, group_lengths))]
+        # Scoring vectorizado: arrays de candidatos (en orden original) y máscara de trazos ya usados
+        starts = np.array([s.start for s in strokes], dtype=float)
+        ends = np.array([s.end for s in strokes], dtype=float)
+        length_norm = np.array([s.length_norm for s in strokes], dtype=float)
+        candidates = np.arange(1, len(strokes))
         ordered = [strokes[0]]
-        remaining = strokes[1:]
-        last_pos = ordered[0].end
+        last_pos = ends[0]
         N = len(strokes) - 1
         for k in range(1, N+1):
+            if k == 1 or used_count * 4 > len(candidates):
+                # Compactar: descartar los trazos usados para que cada iteración recorra solo los pendientes
+                if k > 1:
+                    candidates = candidates[~used]
+                sx, sy = starts[candidates, 0], starts[candidates, 1]
+                ln = length_norm[candidates]
+                used = np.zeros(len(candidates), dtype=bool)
+                used_count = 0
+                dist = np.empty(len(candidates))
+                score = np.empty(len(candidates))
             alpha = 1 - (k / (N+1))
             beta = k / (N+1)
-            dists = [self._distance(last_pos, s.start) for s in remaining]
-            max_dist = max(dists) or 1.0
-            for s, d in zip(remaining, dists):
-                s.dist_norm = d / max_dist
-            def score(s):
-                return alpha * s.length_norm - beta * s.dist_norm
-            next_stroke = max(remaining, key=score)
-            ordered.append(next_stroke)
-            remaining.remove(next_stroke)
-            last_pos = next_stroke.end
+            # Misma aritmética que _distance: sqrt(dx*dx + dy*dy)
+            np.subtract(sx, last_pos[0], out=dist)
+            np.multiply(dist, dist, out=dist)
+            np.subtract(sy, last_pos[1], out=score)
+            np.multiply(score, score, out=score)
+            np.add(dist, score, out=dist)
+            np.sqrt(dist, out=dist)
+            # Las distancias son >= 0: anular las de trazos usados no altera el máximo de los pendientes
+            np.putmask(dist, used, 0.0)
+            max_dist = float(dist.max()) or 1.0
+            # score = alpha * length_norm - beta * dist_norm (ln = -inf en trazos usados, alpha > 0)
+            np.divide(dist, max_dist, out=dist)
+            np.multiply(dist, beta, out=dist)
+            np.multiply(ln, alpha, out=score)
+            np.subtract(score, dist, out=score)
+            # argmax devuelve el primero ante empates, igual que max() sobre la lista de pendientes
+            j = int(np.argmax(score))
+            used[j] = True
+            ln[j] = -np.inf
+            used_count += 1
+            idx = int(candidates[j])
+            ordered.append(strokes[idx])
+            last_pos = ends[idx]
         # Reconstruir comandos: inicio + trazos reordenados + final
         optimized_commands = []
         optimized_commands.extend(bloques_fuera_inicio)
@@ -150,4 +178,6 @@ class PathPlannerOptimizer(GcodeOptimizationPort):
     
     def _distance(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
         """Calcula la distancia euclidiana entre dos puntos"""
-        return math.sqrt((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)
+        dx = p2[0] - p1[0]
+        dy = p2[1] - p1[1]
+        return math.sqrt(dx * dx + dy * dy)
@@ -0,0 +1,112 @@
+"""
+SpaceFillingCurveOrder: Ordena paths según una curva de llenado del espacio (Hilbert o Morton).
+Pensado para dibujos con cientos de miles de trazos pequeños (stippling, halftone).
+"""
+from typing import List
+import numpy as np
+from domain.services.optimization.trajectory_optimizer import TrajectoryOptimizer
+
+
+class SpaceFillingCurveOrder(TrajectoryOptimizer):
+    """
+    Estrategia de orden O(n log n): calcula el índice de Hilbert (o Morton) del punto clave
+    de cada path y los ordena con un único argsort de NumPy.
+
+    - key="centroid": promedio de los vértices del path (punto medio entre inicio y fin si no tiene segmentos).
+    - key="start": punto de inicio del path.
+    - Las coordenadas se cuantizan a una grilla de 2**bits x 2**bits sobre el bbox de los puntos clave.
+    - Comparte la interfaz de TrajectoryOptimizer (optimize_order, metrics, mejora 2-opt opcional).
+    """
+    CURVES = ("hilbert", "morton")
+    KEYS = ("centroid", "start")
+
+    def __init__(self, curve: str = "hilbert", key: str = "centroid", bits: int = 16,
+                 allow_reversal: bool = False, improvement_budget_s: float = 0.0):
+        if curve not in self.CURVES:
+            raise ValueError(f"Curva no soportada: {curve}. Opciones: {', '.join(self.CURVES)}")
+        if key not in self.KEYS:
+            raise ValueError(f"Punto clave no soportado: {key}. Opciones: {', '.join(self.KEYS)}")
+        if not 1 <= bits <= 31:
+            raise ValueError("bits debe estar entre 1 y 31")
+        super().__init__(allow_reversal=allow_reversal, improvement_budget_s=improvement_budget_s)
+        self.curve = curve
+        self.key = key
+        self.bits = bits
+
+    def optimize_order(self, paths: List, progress_callback=None) -> List:
+        """
+        Reordena los paths a lo largo de la curva. Omite paths vacíos o inválidos.
+        progress_callback: función opcional (current, total); se invoca una vez al terminar.
+        """
+        valid_paths, start_points, end_points = self._valid_paths(paths)
+        self.metrics = {}
+        if not valid_paths:
+            return []
+        total = len(valid_paths)
+        starts = np.array([self._get_xy(pt) for pt in start_points], dtype=float)
+        ends = np.array([self._get_xy(pt) for pt in end_points], dtype=float)
+        if self.key == "start":
+            keys = starts
+        else:
+            keys = (starts + ends) / 2.0
+            for k, p in enumerate(valid_paths):
+                vertices = self._segment_starts(p)
+                if vertices:
+                    keys[k] = self._vertex_mean(vertices, ends[k])
+        ix, iy = self._quantize(keys)
+        index = self.hilbert_index(ix, iy, self.bits) if self.curve == "hilbert" else self.morton_index(ix, iy)
+        order = np.argsort(index, kind="stable")
+        if progress_callback:
+            progress_callback(total, total)
+        ordered = [valid_paths[k] for k in order.tolist()]
+        return self._finish(ordered, starts[order], ends[order])
+
+    def _vertex_mean(self, vertices, end):
+        " Promedio de los vértices de un path segmentado (el punto final solo cuenta si el path es abierto). "
+        xy = np.array([self._get_xy(v) for v in vertices] + [tuple(end)], dtype=float)
+        if np.hypot(*(xy[0] - xy[-1])) <= self.CLOSED_TOLERANCE:
+            # Path cerrado: el punto final repite al primero
+            xy = xy[:-1]
+        return xy.mean(axis=0)
+
+    def _quantize(self, keys: np.ndarray):
+        " Lleva los puntos clave a enteros en [0, 2**bits) conservando la relación de aspecto. "
+        lo = keys.min(axis=0)
+        extent = float((keys.max(axis=0) - lo).max())
+        side = (1 << self.bits) - 1
+        if extent <= 0:
+            return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=np.int64)
+        q = np.rint((keys - lo) * (side / extent)).astype(np.int64)
+        return q[:, 0], q[:, 1]
+
+    @staticmethod
+    def hilbert_index(x: np.ndarray, y: np.ndarray, bits: int) -> np.ndarray:
+        " Distancia a lo largo de la curva de Hilbert de orden `bits` (vectorizado, algoritmo xy2d). "
+        x = np.array(x, dtype=np.int64)
+        y = np.array(y, dtype=np.int64)
+        n = 1 << bits
+        d = np.zeros(len(x), dtype=np.int64)
+        s = n >> 1
+        while s > 0:
+            rx = (x & s) > 0
+            ry = (y & s) > 0
+            d += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+            # Rotar el cuadrante para que la curva sea continua
+            flip = rx & ~ry
+            x = np.where(flip, n - 1 - x, x)
+            y = np.where(flip, n - 1 - y, y)
+            swap = ~ry
+            x, y = np.where(swap, y, x), np.where(swap, x, y)
+            s >>= 1
+        return d
+
+    @staticmethod
+    def morton_index(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        " Código de Morton (Z-order): intercala los bits de x e y (hasta 31 bits por eje). "
+        def spread(v):
+            v = np.array(v, dtype=np.uint64) & np.uint64(0x7FFFFFFF)
+            for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                                (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333), (1, 0x5555555555555555)):
+                v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+            return v
+        return spread(x) | (spread(y) << np.uint64(1))
@@ -0,0 +1,148 @@
+"""
+SpatialGridIndex: Índice espacial de grilla uniforme para búsquedas de vecino más cercano con borrado.
+"""
+import math
+from typing import Optional, Sequence
+import numpy as np
+
+
+class SpatialGridIndex:
+    """
+    Indexa puntos 2D en una grilla uniforme (respaldada por NumPy) y permite consultar
+    el punto activo más cercano a una posición y eliminar puntos ya consumidos.
+
+    - La grilla se dimensiona para tener ~`points_per_cell` puntos por celda.
+    - Cuando la cantidad de puntos activos cae a la mitad, la grilla se reconstruye sobre
+      los puntos restantes para mantener la densidad (coste amortizado O(n log n)).
+    - Ante empates de distancia se devuelve el índice menor, igual que un `min()` lineal.
+    """
+
+    MIN_POINTS_FOR_REBUILD = 64
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float], points_per_cell: float = 2.0):
+        self._xs = np.asarray(xs, dtype=float)
+        self._ys = np.asarray(ys, dtype=float)
+        if self._xs.shape != self._ys.shape:
+            raise ValueError("xs e ys deben tener la misma longitud")
+        self.points_per_cell = points_per_cell
+        # Copias en listas de Python: el acceso escalar es mucho más rápido que sobre ndarray
+        self._px = self._xs.tolist()
+        self._py = self._ys.tolist()
+        self._alive = [True] * len(self._px)
+        self._count = len(self._px)
+        self._build(np.arange(self._count))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _build(self, indices: np.ndarray):
+        " Construye la grilla sobre los índices dados. "
+        self._built_count = len(indices)
+        if len(indices) == 0:
+            self._x0 = self._y0 = 0.0
+            self._cell = 1.0
+            self._nx = self._ny = 1
+            self._buckets = [[]]
+            self._cell_of = {}
+            return
+        xs = self._xs[indices]
+        ys = self._ys[indices]
+        x0, x1 = float(xs.min()), float(xs.max())
+        y0, y1 = float(ys.min()), float(ys.max())
+        width, height = x1 - x0, y1 - y0
+        n = len(indices)
+        area = width * height
+        if area > 0:
+            cell = math.sqrt(area * self.points_per_cell / n)
+        else:
+            # Puntos alineados (o uno solo): repartir el lado mayor
+            cell = max(width, height) * self.points_per_cell / n
+        if cell <= 0:
+            cell = 1.0
+        nx = int(width / cell) + 1
+        ny = int(height / cell) + 1
+        ix = np.minimum(((xs - x0) / cell).astype(np.int64), nx - 1)
+        iy = np.minimum(((ys - y0) / cell).astype(np.int64), ny - 1)
+        # Celdas ordenadas por filas: una fila del anillo es un slice contiguo de buckets
+        cell_ids = iy * nx + ix
+        buckets = [[] for _ in range(nx * ny)]
+        # Orden estable: dentro de cada celda los índices quedan ascendentes
+        order = np.argsort(cell_ids, kind="stable")
+        sorted_ids = cell_ids[order].tolist()
+        sorted_idx = indices[order].tolist()
+        for cid, idx in zip(sorted_ids, sorted_idx):
+            buckets[cid].append(idx)
+        self._x0, self._y0 = x0, y0
+        self._cell = cell
+        self._nx, self._ny = nx, ny
+        self._buckets = buckets
+        self._cell_of = dict(zip(indices.tolist(), cell_ids.tolist()))
+
+    def remove(self, idx: int):
+        " Marca el punto idx como consumido. "
+        if not self._alive[idx]:
+            return
+        self._alive[idx] = False
+        self._count -= 1
+        self._buckets[self._cell_of.pop(idx)].remove(idx)
+        if self._count >= self.MIN_POINTS_FOR_REBUILD and self._count * 2 < self._built_count:
+            alive = np.fromiter((i for i in self._cell_of), dtype=np.int64, count=self._count)
+            alive.sort()
+            self._build(alive)
+
+    def nearest(self, x: float, y: float) -> Optional[int]:
+        " Devuelve el índice del punto activo más cercano a (x, y), o None si no quedan puntos. "
+        if self._count == 0:
+            return None
+        cell = self._cell
+        nx, ny = self._nx, self._ny
+        ix = int((x - self._x0) // cell)
+        iy = int((y - self._y0) // cell)
+        ix = 0 if ix < 0 else (nx - 1 if ix >= nx else ix)
+        iy = 0 if iy < 0 else (ny - 1 if iy >= ny else iy)
+        buckets = self._buckets
+        px, py = self._px, self._py
+        best = -1
+        best_d2 = math.inf
+        # Anillos 0 y 1 juntos: bloque 3x3 recorrido como tres slices contiguos (caso más frecuente)
+        i_lo, i_hi = max(ix - 1, 0), min(ix + 1, nx - 1)
+        for j in range(max(iy - 1, 0), min(iy + 1, ny - 1) + 1):
+            base = j * nx
+            for bucket in buckets[base + i_lo:base + i_hi + 1]:
+                for idx in bucket:
+                    dx = px[idx] - x
+                    dy = py[idx] - y
+                    d2 = dx * dx + dy * dy
+                    if d2 < best_d2 or (d2 == best_d2 and idx < best):
+                        best_d2 = d2
+                        best = idx
+        # Cualquier celda del anillo r+1 está al menos a r*cell de distancia
+        if best >= 0 and best_d2 <= cell * cell:
+            return best
+        max_r = max(ix, nx - 1 - ix, iy, ny - 1 - iy)
+        for r in range(2, max_r + 1):
+            i_lo, i_hi = max(ix - r, 0), min(ix + r, nx - 1)
+            j_lo, j_hi = max(iy - r, 0), min(iy + r, ny - 1)
+            for j in range(j_lo, j_hi + 1):
+                base = j * nx
+                if j == iy - r or j == iy + r:
+                    # Fila superior/inferior del anillo: slice contiguo
+                    cells = buckets[base + i_lo:base + i_hi + 1]
+                else:
+                    # Filas intermedias: solo los extremos izquierdo/derecho
+                    cells = []
+                    if ix - r >= 0:
+                        cells.append(buckets[base + ix - r])
+                    if ix + r < nx:
+                        cells.append(buckets[base + ix + r])
+                for bucket in cells:
+                    for idx in bucket:
+                        dx = px[idx] - x
+                        dy = py[idx] - y
+                        d2 = dx * dx + dy * dy
+                        if d2 < best_d2 or (d2 == best_d2 and idx < best):
+                            best_d2 = d2
+                            best = idx
+            if best >= 0 and best_d2 <= (r * cell) ** 2:
+                break
+        return best
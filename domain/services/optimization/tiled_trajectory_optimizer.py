@@ -0,0 +1,134 @@
+"""
+TiledTrajectoryOptimizer: Planificador jerárquico en dos niveles (tiles + greedy dentro de cada tile).
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence
+import numpy as np
+from domain.services.optimization.trajectory_optimizer import TrajectoryOptimizer
+from domain.services.optimization.space_filling_curve_order import SpaceFillingCurveOrder
+
+
+def _order_tile(paths: List, allow_reversal: bool) -> List:
+    " Ordena los paths de un tile con el greedy estándar (función de módulo para poder usarla en un pool). "
+    return TrajectoryOptimizer(allow_reversal=allow_reversal).optimize_order(paths)
+
+
+class TiledTrajectoryOptimizer(TrajectoryOptimizer):
+    """
+    Divide el área de escritura en tiles de tile_mm x tile_mm, ordena los trazos de cada tile de forma
+    independiente (opcionalmente en un pool de procesos) y recorre los tiles en serpentina o por curva de Hilbert.
+
+    - Cada trazo pertenece al tile de su punto de inicio.
+    - El área (area_mm) se proyecta sobre el bbox del dibujo con el factor de ajuste estimado, para que
+      los tiles midan aproximadamente tile_mm una vez escalado el dibujo.
+    - Dentro de cada tile el greedy arranca por el trazo más cercano al final del último trazo del tile
+      anterior. Con workers > 1 los tiles se ordenan en paralelo, cada uno de forma independiente y
+      partiendo del trazo más cercano al centro del tile anterior: las uniones entre tiles pueden quedar
+      algo más largas que en serie.
+    - Si el pool de procesos no está disponible se ordena en serie y metrics["parallel_fallback"] tiene el motivo.
+    - La mejora 2-opt / Or-opt (improvement_budget_s) se aplica sobre la secuencia completa y corrige las uniones.
+    """
+    TILE_ORDERS = ("serpentine", "hilbert")
+
+    def __init__(self, area_mm: Sequence[float] = (297.0, 210.0), tile_mm: float = 50.0,
+                 tile_order: str = "serpentine", workers: int = 1,
+                 allow_reversal: bool = False, improvement_budget_s: float = 0.0):
+        if tile_order not in self.TILE_ORDERS:
+            raise ValueError(f"Orden de tiles no soportado: {tile_order}. Opciones: {', '.join(self.TILE_ORDERS)}")
+        if tile_mm <= 0:
+            raise ValueError("tile_mm debe ser mayor que cero")
+        super().__init__(allow_reversal=allow_reversal, improvement_budget_s=improvement_budget_s)
+        self.area_mm = tuple(area_mm)
+        self.tile_mm = tile_mm
+        self.tile_order = tile_order
+        self.workers = workers
+
+    def optimize_order(self, paths: List, progress_callback=None) -> List:
+        """
+        Reordena los paths tile por tile. Omite paths vacíos o inválidos.
+        progress_callback: función opcional (current, total) invocada al completar cada tile.
+        """
+        valid_paths, start_points, _ = self._valid_paths(paths)
+        self.metrics = {}
+        if not valid_paths:
+            return []
+        total = len(valid_paths)
+        starts = np.array([self._get_xy(pt) for pt in start_points], dtype=float)
+        tile_ids, centers = self._assign_tiles(starts)
+        # Agrupar trazos por tile conservando el orden de entrada dentro de cada uno
+        by_tile = np.argsort(tile_ids, kind="stable")
+        bounds = np.searchsorted(tile_ids[by_tile], np.arange(len(centers) + 1))
+        sequence = [tile for tile in self._tile_sequence() if bounds[tile + 1] > bounds[tile]]
+        tile_members = [by_tile[bounds[tile]:bounds[tile + 1]] for tile in sequence]
+        pooled = None
+        if self.workers > 1 and len(sequence) > 1:
+            # En paralelo no se conoce la salida del tile anterior: se parte de su centro
+            entries = [starts[0]] + [centers[tile] for tile in sequence[:-1]]
+            pooled = self._order_tiles([[valid_paths[k] for k in self._seed(members, starts, entry)]
+                                        for members, entry in zip(tile_members, entries)])
+        ordered = []
+        entry = starts[0]
+        for k, members in enumerate(tile_members):
+            if pooled is not None:
+                chunk = pooled[k]
+            else:
+                # El greedy del tile arranca por el trazo más cercano a donde quedó la pluma
+                members = self._seed(members, starts, entry)
+                chunk = _order_tile([valid_paths[m] for m in members], self.allow_reversal)
+            ordered.extend(chunk)
+            entry = np.array(self._get_xy(self._get_end_point(chunk[-1])), dtype=float)
+            if progress_callback:
+                progress_callback(len(ordered), total)
+        starts = np.array([self._get_xy(self._get_start_point(p)) for p in ordered], dtype=float)
+        ends = np.array([self._get_xy(self._get_end_point(p)) for p in ordered], dtype=float)
+        fallback = self.metrics.get("parallel_fallback")
+        ordered = self._finish(ordered, starts, ends)
+        self.metrics["tiles"] = len(sequence)
+        if fallback:
+            self.metrics["parallel_fallback"] = fallback
+        return ordered
+
+    def _assign_tiles(self, starts: np.ndarray):
+        " Asigna cada trazo a un tile. Devuelve (id_tile por trazo, centros de tile indexados por id). "
+        lo = starts.min(axis=0)
+        extent = starts.max(axis=0) - lo
+        # Escala estimada (mm por unidad) con la que el dibujo llenará el área de escritura
+        ratios = [a / e for a, e in zip(self.area_mm, extent) if e > 0]
+        scale = min(ratios) if ratios else 1.0
+        tile = self.tile_mm / scale
+        self._nx = max(1, int(math.ceil(extent[0] / tile)) if extent[0] > 0 else 1)
+        self._ny = max(1, int(math.ceil(extent[1] / tile)) if extent[1] > 0 else 1)
+        ix = np.minimum(((starts[:, 0] - lo[0]) / tile).astype(np.int64), self._nx - 1)
+        iy = np.minimum(((starts[:, 1] - lo[1]) / tile).astype(np.int64), self._ny - 1)
+        gx, gy = np.meshgrid(np.arange(self._nx), np.arange(self._ny))
+        centers = np.column_stack((lo[0] + (gx.ravel() + 0.5) * tile, lo[1] + (gy.ravel() + 0.5) * tile))
+        return iy * self._nx + ix, centers
+
+    def _tile_sequence(self) -> List[int]:
+        " Orden de recorrido de los tiles: serpentina por filas o curva de Hilbert. "
+        nx, ny = self._nx, self._ny
+        if self.tile_order == "hilbert":
+            bits = max(1, int(math.ceil(math.log2(max(nx, ny)))))
+            gy, gx = np.divmod(np.arange(nx * ny), nx)
+            return np.argsort(SpaceFillingCurveOrder.hilbert_index(gx, gy, bits), kind="stable").tolist()
+        sequence = []
+        for row in range(ny):
+            cols = range(nx) if row % 2 == 0 else range(nx - 1, -1, -1)
+            sequence.extend(row * nx + col for col in cols)
+        return sequence
+
+    @staticmethod
+    def _seed(members: np.ndarray, starts: np.ndarray, entry: np.ndarray) -> List[int]:
+        " Los trazos del tile con el más cercano a entry al principio. "
+        first = members[int(np.argmin(np.hypot(*(starts[members] - entry).T)))]
+        return [first] + [k for k in members.tolist() if k != first]
+
+    def _order_tiles(self, tile_paths: List[List]):
+        " Ordena los tiles en un pool de procesos; None si el pool no está disponible (se ordena en serie). "
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                return list(pool.map(_order_tile, tile_paths, [self.allow_reversal] * len(tile_paths)))
+        except Exception as e:  # pylint: disable=broad-except
+            self.metrics["parallel_fallback"] = f"Pool de procesos no disponible ({e}); se ordena en serie."
+            return None
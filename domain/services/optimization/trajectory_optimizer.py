@@ -1,50 +1,159 @@
 """
 TrajectoryOptimizer: Reordena paths/segmentos para minimizar movimientos en vacío (greedy).
+La búsqueda del vecino más cercano usa un índice espacial de grilla (SpatialGridIndex).
+Opcionalmente el orden greedy se refina con búsqueda local 2-opt / Or-opt (OrderLocalSearch).
 """
+import time
 from typing import List
+import numpy as np
+from domain.services.optimization.spatial_grid_index import SpatialGridIndex
+from domain.services.optimization.order_local_search import OrderLocalSearch
 
 class TrajectoryOptimizer:
+    """
+    Ordena los paths con una heurística greedy de vecino más cercano.
+    Con allow_reversal=True cada trazo puede recorrerse en cualquier sentido: los paths abiertos
+    se invierten y los cerrados se rotan para entrar por el vértice más cercano a la pluma.
+    Con improvement_budget_s > 0 el orden greedy se mejora con 2-opt / Or-opt durante ese tiempo.
+    Tras cada llamada, `metrics` contiene el recorrido en vacío antes y después de la mejora
+    (en unidades de los paths).
+    """
+    CLOSED_TOLERANCE = 1e-6
+
+    def __init__(self, allow_reversal: bool = False, improvement_budget_s: float = 0.0):
+        self.allow_reversal = allow_reversal
+        self.improvement_budget_s = improvement_budget_s
+        self.metrics = {}
+
     def optimize_order(self, paths: List, progress_callback=None) -> List:
         """
         Reordena los paths para minimizar la distancia entre el final de uno y el inicio del siguiente.
         paths: lista de objetos con atributos start_point y end_point, o una lista de puntos.
         Omite paths vacíos o inválidos.
         progress_callback: función opcional (current, total) para reportar progreso.
+        Si allow_reversal está activo, los paths devueltos pueden estar invertidos o rotados.
         """
-        # Filtrar paths inválidos
-        valid_paths = []
-        for p in paths:
-            try:
-                # Verifica que tenga al menos un punto válido
-                _ = self._get_start_point(p)
-                _ = self._get_end_point(p)
-                valid_paths.append(p)
-            except AttributeError:
-                print(f"[TrajectoryOptimizer][WARN] Path inválido omitido: {p}")
-                continue
+        valid_paths, start_points, end_points = self._valid_paths(paths)
+        self.metrics = {}
         if not valid_paths:
             return []
-        ordered = []
-        remaining = valid_paths[:]
-        current = remaining.pop(0)
-        ordered.append(current)
         total = len(valid_paths)
-        step = 1
-        while remaining:
-            last_point = self._get_end_point(current)
+        # Puntos de entrada: cada path aporta una o más formas de recorrerlo (contiguas en las listas)
+        if self.allow_reversal:
+            entry_xy, exit_xy, entry_mode, first_entry = [], [], [], []
+            for p in valid_paths:
+                first_entry.append(len(entry_mode))
+                for entry, exit_, mode in self._entries(p):
+                    entry_xy.append(self._get_xy(entry))
+                    exit_xy.append(self._get_xy(exit_))
+                    entry_mode.append(mode)
+            first_entry.append(len(entry_mode))
+            owner = np.repeat(np.arange(total), np.diff(first_entry)).tolist()
+        else:
+            entry_xy = [self._get_xy(pt) for pt in start_points]
+            exit_xy = [self._get_xy(pt) for pt in end_points]
+            entry_mode = [0] * total
+            first_entry = list(range(total + 1))
+            owner = first_entry
+        entries = np.array(entry_xy, dtype=float)
+        # Índice espacial sobre los puntos de entrada: vecino más cercano en ~O(log n) por paso
+        index = SpatialGridIndex(entries[:, 0], entries[:, 1])
+        # El primer path conserva su sentido original
+        current = 0
+        for e in range(first_entry[0], first_entry[1]):
+            index.remove(e)
+        chosen = [current]
+        # Reportar progreso en ~100 pasos para no penalizar trabajos con miles de paths
+        report_every = max(1, (total - 1) // 100)
+        for step in range(1, total):
+            last_x, last_y = exit_xy[current]
             # Encuentra el path más cercano al final del anterior
-            next_idx, next_path = min(
-                enumerate(remaining),
-                key=lambda x: self._distance(last_point, self._get_start_point(x[1]))
-            )
-            ordered.append(next_path)
-            current = next_path
-            remaining.pop(next_idx)
-            if progress_callback:
+            current = index.nearest(last_x, last_y)
+            path_idx = owner[current]
+            for e in range(first_entry[path_idx], first_entry[path_idx + 1]):
+                index.remove(e)
+            chosen.append(current)
+            if progress_callback and (step % report_every == 0 or step == total - 1):
                 progress_callback(step, total)
-            step += 1
+        ordered = [self._orient(valid_paths[owner[e]], entry_mode[e]) for e in chosen]
+        starts = np.array([entry_xy[e] for e in chosen], dtype=float)
+        ends = np.array([exit_xy[e] for e in chosen], dtype=float)
+        return self._finish(ordered, starts, ends)
+
+    def _valid_paths(self, paths: List):
+        " Filtra paths vacíos o inválidos. Devuelve (paths, puntos_inicio, puntos_fin). "
+        valid_paths, starts, ends = [], [], []
+        for p in paths:
+            try:
+                # Verifica que tenga al menos un punto válido
+                start = self._get_start_point(p)
+                end = self._get_end_point(p)
+            except AttributeError:
+                print(f"[{type(self).__name__}][WARN] Path inválido omitido: {p}")
+                continue
+            valid_paths.append(p)
+            starts.append(start)
+            ends.append(end)
+        return valid_paths, starts, ends
+
+    def _finish(self, ordered: List, starts: np.ndarray, ends: np.ndarray) -> List:
+        " Registra el recorrido en vacío del orden obtenido y aplica la mejora local si hay presupuesto. "
+        travel_before = OrderLocalSearch.travel(starts, ends)
+        self.metrics = {"travel_before": travel_before, "travel_after": travel_before, "improvement_s": 0.0}
+        if self.improvement_budget_s > 0 and len(ordered) > 2:
+            ordered = self._improve(ordered, starts, ends)
         return ordered
 
+    def _improve(self, ordered: List, starts: np.ndarray, ends: np.ndarray) -> List:
+        " Refina el orden greedy con 2-opt / Or-opt dentro del presupuesto de tiempo. "
+        t0 = time.perf_counter()
+        reversible = [self._segment_starts(p) is not None for p in ordered]
+        search = OrderLocalSearch(self.improvement_budget_s, allow_reversal=self.allow_reversal)
+        order, flipped = search.improve(starts, ends, reversible=reversible)
+        improved = [self._orient(ordered[k], -1 if flip else 0) for k, flip in zip(order.tolist(), flipped.tolist())]
+        new_starts = np.where(flipped[:, None], ends[order], starts[order])
+        new_ends = np.where(flipped[:, None], starts[order], ends[order])
+        self.metrics["travel_after"] = OrderLocalSearch.travel(new_starts, new_ends)
+        self.metrics["improvement_s"] = time.perf_counter() - t0
+        return improved
+
+    def _entries(self, path):
+        """
+        Devuelve las formas de recorrer el path como tuplas (punto_entrada, punto_salida, modo).
+        modo: 0 = sentido original, -1 = invertido, k > 0 = path cerrado rotado al segmento k.
+        """
+        start, end = self._get_start_point(path), self._get_end_point(path)
+        segment_starts = self._segment_starts(path)
+        if segment_starts is None:
+            # Path sin segmentos reversibles: solo se puede recorrer en su sentido original
+            return [(start, end, 0)]
+        if len(segment_starts) > 1 and self._distance(start, end) <= self.CLOSED_TOLERANCE:
+            return [(vertex, vertex, k) for k, vertex in enumerate(segment_starts)]
+        return [(start, end, 0), (end, start, -1)]
+
+    @staticmethod
+    def _segment_starts(path):
+        " Devuelve los puntos de inicio de cada segmento si el path es reversible, o None. "
+        if hasattr(path, 'start_point') or not (hasattr(path, '__len__') and hasattr(path, '__getitem__')):
+            return None
+        if not all(hasattr(seg, 'start') and hasattr(seg, 'reversed') for seg in path):
+            return None
+        return [seg.start for seg in path]
+
+    @staticmethod
+    def _orient(path, mode: int):
+        " Aplica al path el sentido elegido, invirtiendo o rotando sus segmentos. "
+        if mode == 0:
+            return path
+        if mode < 0:
+            if hasattr(path, 'reversed'):
+                return path.reversed()
+            return type(path)(seg.reversed() for seg in reversed(path))
+        segments = list(path[mode:]) + list(path[:mode])
+        if isinstance(path, list):
+            return segments
+        return type(path)(*segments)
+
     def _get_start_point(self, path):
         if hasattr(path, 'start_point'):
             return path.start_point
@@ -73,15 +182,17 @@ class TrajectoryOptimizer:
                 return segment.points[-1]
         raise AttributeError('Path object has no end_point, points ni segmentos con end')
 
+    @staticmethod
+    def _get_xy(pt):
+        " Soporta puntos con atributos x/y o números complejos (svgpathtools) "
+        if isinstance(pt, complex):
+            return pt.real, pt.imag
+        elif hasattr(pt, 'x') and hasattr(pt, 'y'):
+            return pt.x, pt.y
+        else:
+            raise AttributeError('El punto no tiene atributos x/y ni es complejo')
+
     def _distance(self, p1, p2):
-        # Soporta puntos con atributos x/y o números complejos (svgpathtools)
-        def get_xy(pt):
-            if hasattr(pt, 'x') and hasattr(pt, 'y'):
-                return pt.x, pt.y
-            elif isinstance(pt, complex):
-                return pt.real, pt.imag
-            else:
-                raise AttributeError('El punto no tiene atributos x/y ni es complejo')
-        x1, y1 = get_xy(p1)
-        x2, y2 = get_xy(p2)
+        x1, y1 = self._get_xy(p1)
+        x2, y2 = self._get_xy(p2)
         return ((x1 - x2)**2 + (y1 - y2)**2) ** 0.5
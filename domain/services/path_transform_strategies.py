@@ -11,3 +11,6 @@ class VerticalFlipStrategy(PathTransformStrategyPort):
     def transform(self, x: float, y: float) -> tuple[float, float]:
         result = (x, self.cy - (y - self.cy))
         return result
+
+    def transform_array(self, xs, ys):
+        return xs, self.cy - (ys - self.cy)
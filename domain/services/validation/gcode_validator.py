@@ -4,6 +4,11 @@ GCodeValidator: Valida la integridad básica de archivos G-code.
 import re
 
 class GCodeValidator:
+    # Patrón extendido para comandos G-code estándar y comentarios (; o entre paréntesis).
+    # X, Y y F iniciales corresponden a líneas modales (G-code compacto, sin repetir el G de movimiento)
+    GCODE_PATTERN = re.compile(r"^(G0|G1|G2|G3|G4|G20|G21|G28|G90|G91|G92|M\d+|X|Y|F|;|\s|\(.*\)|$)", re.IGNORECASE)
+    EMPTY_ERROR = "El archivo G-code está vacío."
+
     @staticmethod
     def validate(gcode_lines):
         """
@@ -11,11 +16,19 @@ class GCodeValidator:
         Retorna (True, None) si es válido, (False, mensaje_error) si no.
         """
         if not gcode_lines:
-            return False, "El archivo G-code está vacío."
-        
-        # Patrón extendido para comandos G-code estándar y comentarios (; o entre paréntesis)
-        gcode_pattern = re.compile(r"^(G0|G1|G2|G3|G4|G20|G21|G28|G90|G91|G92|M\d+|;|\s|\(.*\)|$)", re.IGNORECASE)
+            return False, GCodeValidator.EMPTY_ERROR
         for idx, line in enumerate(gcode_lines, 1):
-            if not gcode_pattern.match(line.strip()):
-                return False, f"Línea {idx}: Comando G-code no reconocido: '{line.strip()}'"
+            error = GCodeValidator.validate_line(idx, line)
+            if error:
+                return False, error
         return True, None
+
+    @staticmethod
+    def validate_line(idx, line):
+        """
+        Valida una sola línea (idx es su número, desde 1). Retorna None si es válida o el mensaje de error.
+        Permite validar un flujo de líneas sin materializarlo.
+        """
+        if not GCodeValidator.GCODE_PATTERN.match(line.strip()):
+            return f"Línea {idx}: Comando G-code no reconocido: '{line.strip()}'"
+        return None
@@ -8,10 +8,16 @@ Incluye marcas de referencia en las esquinas del área de trabajo y marcas para
 from infrastructure.logger_helper import LoggerHelper
 from infrastructure.config.config import Config
 from domain.gcode.reference_mark import reference_mark_gcode
+from domain.gcode.pen_state_machine import PenStateMachine
 
 class ReferenceMarkGenerator(LoggerHelper):
-    "Genera el G-code para una marca de referencia en una posición específica."
-    def __init__(self, feed, cmd_down, cmd_up, dwell, logger=None, i18n=None, enable_marks=True, config=None):
+    """
+    Genera el G-code para una marca de referencia en una posición específica.
+    Los CMD_DOWN/CMD_UP pasan por un PenStateMachine (compartible entre marcas con `pen`): se omiten
+    los redundantes y cada cambio lleva su pausa (pen_down_dwell / pen_up_dwell en ms; sin valor usa dwell).
+    """
+    def __init__(self, feed, cmd_down, cmd_up, dwell, logger=None, i18n=None, enable_marks=True, config=None,
+                 pen_down_dwell=None, pen_up_dwell=None, pen=None):
         LoggerHelper.__init__(self, config=config, logger=logger)
         self.feed = feed
         self.cmd_down = cmd_down
@@ -21,6 +27,11 @@ class ReferenceMarkGenerator(LoggerHelper):
         self.i18n = i18n
         self.enable_marks = enable_marks
         self.config = config
+        self.pen = pen or PenStateMachine(
+            cmd_down, cmd_up,
+            (dwell if pen_down_dwell is None else pen_down_dwell) / 1000,
+            (dwell if pen_up_dwell is None else pen_up_dwell) / 1000,
+        )
 
     def generate(self, x, y, direction):
         """
@@ -28,20 +39,20 @@ class ReferenceMarkGenerator(LoggerHelper):
         """
         body = []
         for line in reference_mark_gcode(x, y, direction, self.feed):
-            if line == "CMD_DOWN":
-                if self.enable_marks:
-                    body.append(self.cmd_down)
-                    self._debug(f"[REF_MARKS] CMD_DOWN insertado en ({x}, {y})")
-                else:
-                    self._debug(f"[REF_MARKS] CMD_DOWN omitido por configuración en ({x}, {y})")
-            elif line == "CMD_UP":
-                if self.enable_marks:
-                    body.append(self.cmd_up)
-                    self._debug(f"[REF_MARKS] CMD_UP insertado en ({x}, {y})")
-                else:
-                    self._debug(f"[REF_MARKS] CMD_UP omitido por configuración en ({x}, {y})")
-            elif line == "DWELL":
-                body.append(f"G4 P{self.dwell/1000}")
+            if line in ("CMD_DOWN", "CMD_UP"):
+                if not self.enable_marks:
+                    # Sin cambio de lapicera tampoco hay pausa que emitir
+                    self._debug(f"[REF_MARKS] {line} omitido por configuración en ({x}, {y})")
+                    continue
+                transition = self.pen.down() if line == "CMD_DOWN" else self.pen.up()
+                if transition is None:
+                    self._debug(f"[REF_MARKS] {line} redundante omitido en ({x}, {y})")
+                    continue
+                command, dwell_s = transition
+                body.append(command)
+                if dwell_s > 0:
+                    body.append(f"G4 P{dwell_s}")
+                self._debug(f"[REF_MARKS] {line} insertado en ({x}, {y})")
             else:
                 body.append(line)
         return body
@@ -50,9 +61,12 @@ class ReferenceMarkBlockGenerator(LoggerHelper):
     """
     Genera solo la primera marca de referencia (abajo izquierda) y su G-code.
     """
-    def __init__(self, feed, cmd_down, cmd_up, dwell, logger=None, i18n=None, enable_marks=True, config=None):
+    def __init__(self, feed, cmd_down, cmd_up, dwell, logger=None, i18n=None, enable_marks=True, config=None,
+                 pen_down_dwell=None, pen_up_dwell=None, pen=None):
         LoggerHelper.__init__(self, config=config, logger=logger)
-        self.mark_generator = ReferenceMarkGenerator(feed, cmd_down, cmd_up, dwell, logger, i18n, enable_marks, config)
+        # Un solo estado de lapicera para las cuatro marcas
+        self.mark_generator = ReferenceMarkGenerator(feed, cmd_down, cmd_up, dwell, logger, i18n, enable_marks, config,
+                                                     pen_down_dwell, pen_up_dwell, pen)
         self.feed = feed
         self.cmd_down = cmd_down
         self.cmd_up = cmd_up
@@ -100,6 +114,8 @@ class ReferenceMarksGenerator(LoggerHelper):
         cmd_down = config.get("CMD_DOWN")
         cmd_up = config.get("CMD_UP")
         dwell = config.get("DWELL_MS")
+        pen_down_dwell = config.get("PEN_DOWN_DWELL_MS", None)
+        pen_up_dwell = config.get("PEN_UP_DWELL_MS", None)
         enable_marks = config.get("GENERATE_REFERENCE_MARKS", True)
         if width is not None and height is not None:
             area = [width, height]
@@ -112,13 +128,23 @@ class ReferenceMarksGenerator(LoggerHelper):
             "G21",
             "G90"
         ]
+        pen = PenStateMachine(
+            cmd_down, cmd_up,
+            (dwell if pen_down_dwell is None else pen_down_dwell) / 1000,
+            (dwell if pen_up_dwell is None else pen_up_dwell) / 1000,
+        )
         if enable_marks:
-            header.append(cmd_up)
+            # Estado inicial desconocido: se sube la lapicera antes de la primera marca
+            command, dwell_s = pen.up()
+            header.append(command)
+            if dwell_s > 0:
+                header.append(f"G4 P{dwell_s}")
         self._debug(self.i18n.get("REF_MARKS_START", "[REF_MARKS] Inicio generación de marcas de referencia. GENERATE_REFERENCE_MARKS={}").format(enable_marks))
         self._debug(f"[REF_MARKS] Inicio generación de marcas de referencia. GENERATE_REFERENCE_MARKS={enable_marks}")
         body = []
         # Marcas de referencia principales
-        ref_block = ReferenceMarkBlockGenerator(feed, cmd_down, cmd_up, dwell, self.logger, self.i18n, enable_marks)
+        ref_block = ReferenceMarkBlockGenerator(feed, cmd_down, cmd_up, dwell, self.logger, self.i18n, enable_marks,
+                                                pen=pen)
         body.extend(ref_block.generate(width, height))
         # Marcas de área
         body.append("G0 X0 Y0")
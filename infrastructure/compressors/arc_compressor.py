@@ -1,20 +1,252 @@
 from domain.ports.gcode_compression_port import GcodeCompressionPort
 from domain.compression_metrics import CompressionMetrics
-from typing import List, Tuple
-from domain.services.optimization.arc_optimizer import ArcOptimizer
+from domain.geometry.arc_fitter import ArcFitter
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+import re
+
+class _ModalState:
+    """
+    Estado modal mínimo para seguir el G-code: G de movimiento de la entrada y de la salida (difieren
+    cuando un arco reemplazó G1), posición absoluta (None si es desconocida), modo relativo y separador
+    entre palabras ('' si el G-code omite los espacios).
+    """
+    MOTION_WORD = re.compile(r'G0*([0-3])(?!\d)')
+
+    def __init__(self):
+        self.word = None
+        self.emitted = None
+        self.position = None
+        self.relative = False
+        self.space = ' '
+
+    def motion_word(self, line: str):
+        " Último G0..G3 explícito de la línea (o del bloque G91/G90 de varias líneas), o None. "
+        words = self.MOTION_WORD.findall(line.split(';')[0])
+        return int(words[-1]) if words else None
+
 
 class ArcCompressor(GcodeCompressionPort):
-    """Comprime secuencias de movimientos lineales en arcos G2/G3"""
+    """
+    Comprime secuencias de movimientos lineales en arcos G2/G3.
+    Junta las líneas G1 consecutivas (absolutas, o relativas dentro de un bloque G91) y reemplaza por un
+    arco cada tramo que ArcFitter ajusta dentro de la tolerancia; el resto pasa sin cambios.
+    - tolerance_mm (ARC_TOLERANCE_MM): si es None se usa la tolerancia que recibe compress().
+    - min_points (MIN_POINTS_FOR_ARC) y min_angle_deg (MIN_ARC_ANGLE_DEG): segmentos y giro mínimos de un arco.
+    - coordinate_scale: mm por unidad de las coordenadas (10^-decimales en el formato de punto fijo).
+    El arco lleva el último F de su tramo e I/J con los decimales de sus coordenadas. Entiende el G-code
+    compacto: si una línea siguiente omitía el G1, se lo agrega. Retiene hasta MAX_PENDING líneas (y
+    secuencias de como máximo MAX_RUN) para ajustar todas sus secuencias en una sola pasada de ArcFitter.
+    """
+    WORD = re.compile(r'([A-Z])([-+]?[\d.]+)')
+    # Forma habitual (no compacta), sin pasar por el análisis palabra por palabra
+    G1_PATTERN = re.compile(r'G1 X(-?\d+(?:\.(\d*))?) Y(-?\d+(?:\.(\d*))?)(?: F([\d.]+))?$')
+    MAX_RUN = 8192
+    MAX_PENDING = 65536
+
+    def __init__(self, tolerance_mm: Optional[float] = None, min_points: int = 3, min_angle_deg: float = 2.0,
+                 coordinate_scale: float = 1.0):
+        self.tolerance_mm = tolerance_mm
+        self.min_points = min_points
+        self.min_angle_deg = min_angle_deg
+        self.coordinate_scale = coordinate_scale
 
     def compress(self, gcode_lines: List[str], tolerance: float) -> Tuple[List[str], CompressionMetrics]:
-        optimizer = ArcOptimizer(tolerance=tolerance)
-        # ArcOptimizer espera comandos, no líneas de texto. Aquí solo devolvemos los originales y métricas vacías.
-        # TODO: Implementar conversión de líneas G-code a comandos si se desea compresión real.
-        metrics = CompressionMetrics(
-            original_lines=len(gcode_lines),
-            compressed_lines=len(gcode_lines),
-            arcs_created=0,
-            relative_moves=0,
-            redundancies_removed=0
-        )
-        return gcode_lines, metrics
+        """
+        Comprime líneas de G-code reemplazando secuencias de G1 por arcos.
+        Args:
+            gcode_lines: Lista de líneas de G-code a comprimir
+            tolerance: Tolerancia en mm (si no se fijó tolerance_mm)
+        Returns:
+            Tupla (líneas comprimidas, métricas de compresión)
+        """
+        metrics = CompressionMetrics(original_lines=len(gcode_lines), compressed_lines=0)
+        compressed = list(self.compress_stream(gcode_lines, tolerance, metrics))
+        metrics.compressed_lines = len(compressed)
+        return compressed, metrics
+
+    def compress_stream(self, gcode_lines: Iterable[str], tolerance: float, metrics: CompressionMetrics) -> Iterator[str]:
+        " Comprime un flujo de líneas G-code; suma a metrics.arcs_created los arcos emitidos. "
+        tolerance = self.tolerance_mm if self.tolerance_mm is not None else tolerance
+        if not tolerance or tolerance <= 0:
+            yield from gcode_lines
+            return
+        fitter = ArcFitter(tolerance, min_points=self.min_points, min_angle_deg=self.min_angle_deg)
+        modal = _ModalState()
+        # Líneas retenidas desde la primera secuencia G1 sin ajustar: (línea, G modal de la entrada) o
+        # (secuencia G1, posición de partida, relativa)
+        pending, buffered = [], 0
+        # Secuencia en curso: movimientos y posición de partida ((0, 0) en modo relativo, None si se desconoce)
+        run, anchor = [], None
+        for raw_line in gcode_lines:
+            line = raw_line.strip()
+            move = self._linear_move(line, modal)
+            if run and (move is None or len(run) >= self.MAX_RUN):
+                pending.append((run, anchor, modal.relative))
+                run = []
+            if not run and buffered >= self.MAX_PENDING:
+                yield from self._flush(pending, modal, fitter, metrics)
+                pending, buffered = [], 0
+            buffered += 1
+            if move is not None:
+                if not run:
+                    anchor = (0.0, 0.0) if modal.relative else modal.position
+                run.append(move)
+                if line.startswith('G1'):
+                    modal.space = ' ' if line[2:3] == ' ' else ''
+                modal.word = 1
+                modal.position = None if modal.relative else move[1]
+                continue
+            self._update(line, modal)
+            if pending:
+                pending.append((line, modal.word))
+            else:
+                # Sin secuencias por ajustar, la línea sale en el momento
+                yield self._passthrough(line, modal.word, modal)
+        if run:
+            pending.append((run, anchor, modal.relative))
+        yield from self._flush(pending, modal, fitter, metrics)
+
+    def _linear_move(self, line: str, modal: _ModalState):
+        """
+        (línea, (x, y), feed como texto, decimales) si la línea es un G1 que puede formar parte de un arco;
+        None si no. En modo relativo (x, y) es el desplazamiento; en absoluto, el destino.
+        """
+        if not line.startswith(('G1', 'X', 'Y')):
+            return None
+        g1_match = self.G1_PATTERN.match(line)
+        if g1_match:
+            x, x_decimals, y, y_decimals, feed = g1_match.groups()
+            return line, (float(x), float(y)), feed, max(len(x_decimals or ''), len(y_decimals or ''))
+        words = self.WORD.findall(line)
+        if ''.join(w + v for w, v in words) != line.replace(' ', ''):
+            return None
+        values = dict(words)
+        if len(values) != len(words) or set(values) - {'G', 'X', 'Y', 'F'} or not {'X', 'Y'} & set(values):
+            return None
+        if ('G' in values and values['G'] != '1') or ('G' not in values and modal.word != 1):
+            return None
+        if not modal.relative and modal.position is None and not {'X', 'Y'} <= set(values):
+            return None
+        try:
+            x, y = (float(values[axis]) if axis in values else None for axis in 'XY')
+        except ValueError:
+            return None
+        if modal.relative:
+            target = (x or 0.0, y or 0.0)
+        else:
+            target = (modal.position[0] if x is None else x, modal.position[1] if y is None else y)
+        decimals = max(len(v.partition('.')[2]) for w, v in words if w in 'XY')
+        return line, target, values.get('F'), decimals
+
+    def _update(self, line: str, modal: _ModalState):
+        " Actualiza el estado con una línea que no forma parte de una secuencia G1. "
+        word = modal.motion_word(line)
+        if word is not None:
+            modal.word = word
+            if line[:1] == 'G':
+                modal.space = ' ' if line[2:3] == ' ' else ''
+        if line.startswith('G91'):
+            # Bloque G91/G90 en un solo elemento, o G91 suelto hasta el próximo G90
+            modal.relative = not line.endswith('G90')
+            if '\n' in line:
+                modal.position = None
+            return
+        if line.startswith('G90'):
+            modal.relative = False
+            return
+        if not line.startswith(('G0', 'G1', 'G2', 'G3', 'X', 'Y')) or modal.word is None:
+            return
+        if modal.relative:
+            modal.position = None
+            return
+        values = dict(self.WORD.findall(line.split(';')[0]))
+        try:
+            current = modal.position or (None, None)
+            x = float(values['X']) if 'X' in values else current[0]
+            y = float(values['Y']) if 'Y' in values else current[1]
+        except ValueError:
+            x = y = None
+        modal.position = None if x is None or y is None else (x, y)
+
+    @staticmethod
+    def _passthrough(line: str, word: Optional[int], modal: _ModalState) -> str:
+        """
+        La línea tal cual, con el G modal de la entrada (word) agregado si lo omite y la salida quedó en
+        otro (tras un arco).
+        """
+        explicit = modal.motion_word(line)
+        if explicit is not None:
+            modal.emitted = explicit
+            return line
+        if line[:1] in ('X', 'Y') and word is not None and modal.emitted != word:
+            modal.emitted = word
+            return f"G{word}{modal.space}{line}"
+        return line
+
+    def _flush(self, pending, modal: _ModalState, fitter: ArcFitter, metrics: CompressionMetrics) -> Iterator[str]:
+        " Ajusta todas las secuencias retenidas con una llamada a ArcFitter y emite las líneas en orden. "
+        prepared = []
+        for entry in pending:
+            if isinstance(entry[0], str):
+                continue
+            run, anchor, relative = entry
+            moves = [move[1] for move in run]
+            if relative:
+                targets = np.cumsum(np.array([anchor] + moves, dtype=np.float64), axis=0)
+            elif anchor is not None:
+                targets = np.array([anchor] + moves, dtype=np.float64)
+            else:
+                # Sin posición previa conocida el primer G1 solo sirve de inicio
+                targets = np.array(moves, dtype=np.float64)
+            prepared.append(targets)
+        offsets = np.concatenate(([0], np.cumsum([len(targets) for targets in prepared]))).astype(np.int64)
+        arcs = [{} for _ in prepared]
+        if prepared:
+            points = np.concatenate(prepared) * self.coordinate_scale
+            for start, end, cx, cy, clockwise in fitter.fit_many(points, offsets):
+                owner = int(np.searchsorted(offsets, start, side='right')) - 1
+                base = int(offsets[owner])
+                arcs[owner][start - base] = (start - base, end - base, cx, cy, clockwise)
+        runs = iter(zip(prepared, arcs))
+        for entry in pending:
+            if isinstance(entry[0], str):
+                yield self._passthrough(entry[0], entry[1], modal)
+                continue
+            run, anchor, relative = entry
+            targets, run_arcs = next(runs)
+            if not relative and anchor is None:
+                yield self._passthrough(run[0][0], 1, modal)
+                run = run[1:]
+            yield from self._emit(run, targets, relative, run_arcs, modal, metrics)
+
+    def _emit(self, run, targets: np.ndarray, relative: bool, arcs, modal: _ModalState,
+              metrics: CompressionMetrics) -> Iterator[str]:
+        " Emite la secuencia: los tramos ajustados como un G2/G3 y el resto tal como venía. "
+        index = 0
+        while index < len(run):
+            if index not in arcs:
+                yield self._passthrough(run[index][0], 1, modal)
+                index += 1
+                continue
+            start, end, cx, cy, clockwise = arcs[index]
+            covered = run[start:end]
+            decimals = max(move[3] for move in covered)
+            origin = targets[start]
+            finish = targets[end] - origin if relative else targets[end]
+            # I/J: centro relativo al inicio del arco, en unidades del G-code
+            offset = (cx / self.coordinate_scale - origin[0], cy / self.coordinate_scale - origin[1])
+            word = 2 if clockwise else 3
+            words = [f"G{word}"] + [axis + self._number(value, decimals)
+                                    for axis, value in zip("XYIJ", (finish[0], finish[1]) + offset)]
+            feeds = [move[2] for move in covered if move[2] is not None]
+            if feeds:
+                words.append(f"F{feeds[-1]}")
+            modal.emitted = word
+            metrics.arcs_created += 1
+            yield modal.space.join(words)
+            index = end
+
+    @staticmethod
+    def _number(value: float, decimals: int) -> str:
+        return f"{round(float(value), decimals) + 0.0:.{decimals}f}"
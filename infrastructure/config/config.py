@@ -63,6 +63,10 @@ class Config:
         " Devuelve el valor de la clave, o un valor por defecto si no existe. "
         return self._data.get(key, default)
 
+    def set(self, key, value):
+        " Sobrescribe el valor de la clave en memoria (no persiste en config.json). "
+        self._data[key] = value
+
     @property
     def svg_input_dir(self):
         " Devuelve el directorio de entrada de SVG como un objeto Path. "
@@ -93,6 +97,16 @@ class Config:
         "Devuelve el paso en mm (STEP_MM)."
         return self._data["STEP_MM"]
 
+    @property
+    def sampling_mode(self):
+        "Devuelve el modo de muestreo de curvas (SAMPLING_MODE): 'uniform' (paso STEP_MM) o 'flatten'."
+        return str(self._data.get("SAMPLING_MODE", "uniform")).lower()
+
+    @property
+    def flatten_tolerance_mm(self):
+        "Devuelve la desviación máxima de cuerda en mm para el modo 'flatten' (FLATTEN_TOLERANCE_MM)."
+        return float(self._data.get("FLATTEN_TOLERANCE_MM", 0.05))
+
     @property
     def dwell_ms(self):
         "Devuelve el tiempo de espera en ms (DWELL_MS)."
@@ -5,6 +5,7 @@ Factory para adaptadores (input/output) de la capa de Interface Adapters.
 from adapters.input.config_adapter import ConfigAdapter
 from adapters.input.svg_loader_adapter import SvgLoaderAdapter
 from adapters.input.path_sampler import PathSampler
+from adapters.input.flattening_path_sampler import FlatteningPathSampler
 from adapters.output.gcode_generator_adapter import GCodeGeneratorAdapter
 from adapters.output.logger_adapter import LoggerAdapter
 from adapters.input.gcode_file_selector_adapter import GcodeFileSelectorAdapter
@@ -22,8 +23,15 @@ class AdapterFactory:
         return SvgLoaderAdapter(svg_file)
 
     @staticmethod
-    def create_path_sampler(step_mm, logger):
-        " Crea un muestreador de rutas. "
+    def create_path_sampler(step_mm, logger, mode="uniform", tolerance_mm=0.05):
+        """
+        Crea un muestreador de rutas.
+        mode: 'uniform' (un punto cada step_mm) o 'flatten' (mínimos puntos con desviación <= tolerance_mm).
+        """
+        if mode == "flatten":
+            return FlatteningPathSampler(tolerance_mm, step_mm, logger=logger)
+        if mode != "uniform":
+            raise ValueError(f"SAMPLING_MODE no soportado: {mode}. Opciones: uniform, flatten")
         return PathSampler(step_mm, logger=logger)
 
     @staticmethod
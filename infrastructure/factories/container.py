@@ -119,7 +119,8 @@ class Container:
         if self._gcode_compression_service is None:
             logger = getattr(self, 'logger', None)
             i18n = getattr(self, 'i18n', None)
-            self._gcode_compression_service = create_gcode_compression_service(logger=logger, i18n=i18n)
+            self._gcode_compression_service = create_gcode_compression_service(logger=logger, i18n=i18n,
+                                                                                config=self.config)
         return self._gcode_compression_service
 
     @property
@@ -161,7 +162,12 @@ class Container:
 
     def get_gcode_generator(self, transform_strategies=None, i18n=None):
         " Devuelve un generador de G-code configurado. "
-        path_sampler = AdapterFactory.create_path_sampler(self.step_mm, logger=self.logger)
+        path_sampler = AdapterFactory.create_path_sampler(
+            self.step_mm,
+            logger=self.logger,
+            mode=self.config.sampling_mode,
+            tolerance_mm=self.config.flatten_tolerance_mm
+        )
         return AdapterFactory.create_gcode_generator(
             path_sampler=path_sampler,
             feed=self.feed,
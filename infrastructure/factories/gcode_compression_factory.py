@@ -7,13 +7,30 @@ GcodeCompressionFactory: Permite crear un servicio de compresión de G-code con
 from domain.services.compression.line_compressor import LineCompressor
 from infrastructure.compressors.arc_compressor import ArcCompressor
 from application.use_cases.gcode_compression.gcode_compression_service import GcodeCompressionService
+from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
 
 # Factory para crear el servicio de compresión con ambos compresores
 
-def create_gcode_compression_service(logger=None, i18n=None):
-    " Crea un servicio de compresión de G-code con múltiples compresores. "
+def create_gcode_compression_service(logger=None, i18n=None, config=None):
+    """
+    Crea un servicio de compresión de G-code con múltiples compresores.
+    Con `config`, el compresor de arcos usa COMPRESSION.ARC_TOLERANCE_MM, MIN_POINTS_FOR_ARC y
+    MIN_ARC_ANGLE_DEG (y se omite con USE_ARCS en false); sin ella, la tolerancia de CompressionConfig.
+    """
     compressors = [
-        ArcCompressor(),
+        create_arc_compressor(config),
         LineCompressor()
     ]
-    return GcodeCompressionService(compressors, logger=logger, i18n=i18n)
+    return GcodeCompressionService([c for c in compressors if c is not None], logger=logger, i18n=i18n)
+
+
+def create_arc_compressor(config=None):
+    " Crea el ArcCompressor con los parámetros de COMPRESSION y el formato del G-code; None si USE_ARCS es false. "
+    if config is None:
+        return ArcCompressor()
+    use_arcs, tolerance, min_points, min_angle = GcodeGenerationConfigHelper.get_arc_compression(config)
+    if not use_arcs:
+        return None
+    decimals, fixed_point = GcodeGenerationConfigHelper.get_gcode_format(config)
+    return ArcCompressor(tolerance_mm=tolerance, min_points=min_points, min_angle_deg=min_angle,
+                         coordinate_scale=10.0 ** -decimals if fixed_point else 1.0)
@@ -0,0 +1,27 @@
+"""
+Path: infrastructure/factories/motion_simulator_factory.py
+MotionSimulatorFactory: Crea el simulador cinemático con los parámetros de máquina de la configuración.
+"""
+
+from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
+from domain.gcode.motion_simulator import MotionSimulator
+
+
+def create_motion_simulator(config):
+    " Crea un MotionSimulator con MAX_ACCEL_MM_S2, JUNCTION_DEVIATION_MM, FEED, RAPID_FEED, PEN_SERVO_*_MS y el formato del G-code. "
+    _planner, accel, deviation, _lookahead = GcodeGenerationConfigHelper.get_feed_planner(config)
+    rapid_feed, servo_down_ms, servo_up_ms = GcodeGenerationConfigHelper.get_plot_time_settings(config)
+    decimals, fixed_point = GcodeGenerationConfigHelper.get_gcode_format(config)
+    try:
+        feed = float(config.get("FEED", 4000) or 4000)
+    except (TypeError, ValueError):
+        feed = 4000.0
+    return MotionSimulator(
+        max_accel_mm_s2=accel,
+        junction_deviation_mm=deviation,
+        rapid_feed=rapid_feed,
+        default_feed=feed if feed > 0 else 4000.0,
+        pen_down_time_s=servo_down_ms / 1000.0,
+        pen_up_time_s=servo_up_ms / 1000.0,
+        coordinate_scale=10.0 ** -decimals if fixed_point else 1.0
+    )
@@ -10,6 +10,7 @@ Args:
 Methods:
     add_strategy(strategy): Agrega una estrategia de transformación.
     apply(x, y): Aplica todas las estrategias en orden y retorna el resultado.
+    apply_array(xs, ys): Igual que apply, sobre arrays NumPy de coordenadas.
 
 Ejemplo de uso:
     def mirror_x(x, y):
@@ -48,3 +49,9 @@ class TransformManager(TransformManagerPort):
 #                msg = "Transform applied: {} -> ({:.3f}, {:.3f})"
 #                self.logger.debug(msg.format(strategy.__class__.__name__, x, y))
         return x, y
+
+    def apply_array(self, xs, ys):
+        """Aplica todas las estrategias en orden sobre arrays de coordenadas (xs, ys)."""
+        for strategy in self.strategies:
+            xs, ys = strategy.transform_array(xs, ys)
+        return xs, ys
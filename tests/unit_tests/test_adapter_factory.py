@@ -9,6 +9,15 @@ def test_create_config_adapter():
     assert adapter is not None
     assert hasattr(adapter, 'get') or hasattr(adapter, 'get_config')
 
+def test_create_path_sampler_modes():
+    from adapters.input.path_sampler import PathSampler
+    from adapters.input.flattening_path_sampler import FlatteningPathSampler
+    assert type(AdapterFactory.create_path_sampler(0.3, logger=None)) is PathSampler
+    sampler = AdapterFactory.create_path_sampler(0.3, logger=None, mode="flatten", tolerance_mm=0.02)
+    assert isinstance(sampler, FlatteningPathSampler) and sampler.tolerance == 0.02
+    with pytest.raises(ValueError):
+        AdapterFactory.create_path_sampler(0.3, logger=None, mode="spline")
+
 def test_create_logger_adapter():
     logger = AdapterFactory.create_logger_adapter()
     assert logger is not None
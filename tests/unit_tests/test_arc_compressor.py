@@ -0,0 +1,106 @@
+import math
+import re
+import numpy as np
+import pytest
+
+from domain.geometry.arc_fitter import ArcFitter
+from infrastructure.compressors.arc_compressor import ArcCompressor
+from infrastructure.factories.gcode_compression_factory import create_arc_compressor
+from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
+
+
+def _circle(n, radius=10.0, clockwise=False, decimals=3, scale=1.0):
+    sign = -1.0 if clockwise else 1.0
+    points = [(radius * math.cos(sign * 2 * math.pi * k / n), radius * math.sin(sign * 2 * math.pi * k / n))
+              for k in range(n + 1)]
+    text = [f"{value / scale:.{decimals}f}" for point in points for value in point]
+    return ["G0 X" + text[0] + " Y" + text[1]] + [f"G1 X{x} Y{y} F1500" for x, y in zip(text[2::2], text[3::2])]
+
+
+def _words(line):
+    return {word: float(value) for word, value in re.findall(r'([GXYIJF])(-?[\d.]+)', line)}
+
+
+def test_circle_collapses_to_a_few_arcs_with_consistent_centers():
+    lines = _circle(360)
+    compressed, metrics = ArcCompressor(0.01).compress(lines, 0.1)
+    assert compressed[0] == lines[0] and 1 <= metrics.arcs_created <= 3
+    assert len(compressed) == 1 + metrics.arcs_created
+    x, y = 10.0, 0.0
+    for line in compressed[1:]:
+        words = _words(line)
+        assert words["G"] == 3 and words["F"] == 1500
+        # El centro I/J es el del círculo y el arco termina a la misma distancia que empieza
+        assert (x + words["I"], y + words["J"]) == pytest.approx((0.0, 0.0), abs=2e-3)
+        assert math.hypot(words["X"], words["Y"]) == pytest.approx(10.0, abs=1e-3)
+        x, y = words["X"], words["Y"]
+    assert (x, y) == (10.0, 0.0)
+    clockwise, _ = ArcCompressor(0.01).compress(_circle(360, clockwise=True), 0.1)
+    assert {line[:2] for line in clockwise[1:]} == {"G2"}
+
+
+def test_straight_lines_corners_and_short_or_shallow_runs_are_unchanged():
+    square = ["G0 X0 Y0", "G1 X10 Y0", "G1 X10 Y10", "G1 X0 Y10", "G1 X0 Y0"]
+    straight = ["G0 X0 Y0"] + [f"G1 X{k}.000 Y0.000" for k in range(1, 50)]
+    for lines in (square, straight):
+        assert ArcCompressor(0.1).compress(lines, 0.1)[0] == lines
+    quarter = _circle(40)[:11]
+    assert ArcCompressor(0.05).compress(quarter, 0.1)[1].arcs_created == 1
+    # Diez segmentos: no alcanzan doce puntos mínimos; 90° no llegan a un giro mínimo de 120°
+    assert ArcCompressor(0.05, min_points=12).compress(quarter, 0.1)[0] == quarter
+    assert ArcCompressor(0.05, min_angle_deg=120).compress(quarter, 0.1)[0] == quarter
+    assert ArcCompressor(0.0).compress(quarter, 0.0)[0] == quarter
+
+
+def test_arc_keeps_the_stream_modal_and_relative_blocks():
+    circle = _circle(72)
+    # G-code compacto: tras el arco, la línea que omitía el G1 lo recupera
+    lines = circle[:1] + ["G1X10.000Y0.000"] + [line[3:].replace(" ", "") for line in circle[1:]] + ["X20Y0", "M5"]
+    lines[2:-2] = [line.replace("F1500", "") for line in lines[2:-2]]
+    compressed, metrics = ArcCompressor(0.01).compress(lines, 0.1)
+    assert metrics.arcs_created >= 1 and compressed[-2:] == ["G1X20Y0", "M5"]
+    assert all(" " not in line for line in compressed[1:])
+    # Bloque G91: desplazamientos relativos, también en el arco
+    points = np.array([[10 * math.cos(a), 10 * math.sin(a)] for a in np.radians(np.arange(0, 91, 5))])
+    steps = np.round(np.diff(points, axis=0), 3)
+    relative = ["G0 X5 Y5", "G91"] + [f"G1 X{dx:.3f} Y{dy:.3f}" for dx, dy in steps] + ["G90", "G1 X0 Y0"]
+    compressed, metrics = ArcCompressor(0.01).compress(relative, 0.1)
+    assert metrics.arcs_created == 1 and compressed[-2:] == ["G90", "G1 X0 Y0"]
+    words = _words(compressed[2])
+    assert words["G"] == 3 and (words["X"], words["Y"]) == pytest.approx(tuple(steps.sum(axis=0)), abs=1e-9)
+    assert (words["I"], words["J"]) == pytest.approx((-10.0, 0.0), abs=2e-3)
+
+
+def test_fixed_point_coordinates_use_the_scale():
+    lines = _circle(360, decimals=0, scale=0.001)
+    compressed, metrics = ArcCompressor(0.01, coordinate_scale=0.001).compress(lines, 0.1)
+    assert 1 <= metrics.arcs_created <= 3
+    words = _words(compressed[1])
+    assert "." not in compressed[1] and (words["I"], words["J"]) == pytest.approx((-10000, 0), abs=2)
+
+
+def test_fitter_finds_arcs_in_several_polylines_at_once():
+    angles = np.radians(np.arange(0, 181, 3))
+    arc = np.column_stack((np.cos(angles), np.sin(angles))) * 5.0
+    line = np.column_stack((np.arange(20.0), np.zeros(20)))
+    fitter = ArcFitter(0.01)
+    arcs = fitter.fit_many(np.concatenate((line, arc, arc[::-1])), [0, 20, 20 + len(arc), 20 + 2 * len(arc)])
+    assert [(start, end, clockwise) for start, end, _cx, _cy, clockwise in arcs] == [
+        (20, 20 + len(arc) - 1, False), (20 + len(arc), 20 + 2 * len(arc) - 1, True)]
+    assert arcs[0][2:4] == pytest.approx((0.0, 0.0), abs=1e-9)
+    assert fitter.fit(line) == []
+    with pytest.raises(ValueError):
+        ArcFitter(0.0)
+
+
+def test_config_helper_and_factory_arc_compression():
+    assert GcodeGenerationConfigHelper.get_arc_compression({}) == (True, 0.2, 3, 2.0)
+    config = {"COMPRESSION": {"USE_ARCS": True, "ARC_TOLERANCE_MM": 0.05, "MIN_POINTS_FOR_ARC": 5, "MIN_ARC_ANGLE_DEG": 10}}
+    assert GcodeGenerationConfigHelper.get_arc_compression(config) == (True, 0.05, 5, 10.0)
+    assert GcodeGenerationConfigHelper.get_arc_compression({"COMPRESSION": {"ARC_TOLERANCE_MM": -1}}) == (True, 0.2, 3, 2.0)
+    compressor = create_arc_compressor({**config, "GCODE_DECIMALS": 2, "GCODE_FIXED_POINT": True})
+    assert (compressor.tolerance_mm, compressor.min_points, compressor.min_angle_deg) == (0.05, 5, 10.0)
+    assert compressor.coordinate_scale == pytest.approx(0.01)
+    assert create_arc_compressor(config).coordinate_scale == 1.0
+    assert create_arc_compressor({"COMPRESSION": {"USE_ARCS": False}}) is None
+    assert create_arc_compressor().tolerance_mm is None
@@ -0,0 +1,76 @@
+"""
+Tests del bbox exacto (SegmentBounds) y de la caché por trabajo de BoundingBoxCalculator.
+"""
+import random
+import numpy as np
+import pytest
+from svgpathtools import Path, Line, QuadraticBezier, CubicBezier, Arc
+from application.workflows.job_geometry import job_svg_loader_factory
+from domain.geometry.bounding_box_calculator import BoundingBoxCalculator
+from domain.geometry.segment_bounds import SegmentBounds
+from domain.services.geometry import GeometryService
+from tests.mocks.mock_geometry import CustomMockSegment
+
+
+def _random_segments(seed):
+    rnd = random.Random(seed)
+    def c():
+        return complex(rnd.uniform(-50, 50), rnd.uniform(-50, 50))
+    segments = []
+    for _ in range(100):
+        segments.append(Line(c(), c()))
+        segments.append(QuadraticBezier(c(), c(), c()))
+        segments.append(CubicBezier(c(), c(), c(), c()))
+        radius = complex(rnd.uniform(1, 40), rnd.uniform(1, 40))
+        segments.append(Arc(c(), radius, rnd.uniform(0, 180), rnd.random() < 0.5, rnd.random() < 0.5, c()))
+    return segments
+
+
+def test_segment_bounds_match_analytic_reference():
+    segments = _random_segments(3)
+    expected = np.array([seg.bbox() for seg in segments], dtype=float)
+    assert np.allclose(SegmentBounds.compute(segments), expected, atol=1e-9)
+
+
+def test_segment_bounds_fallback_for_generic_segments():
+    bounds = SegmentBounds.compute([CustomMockSegment()])
+    assert np.allclose(bounds, [[0, 10, 0, 10]])
+
+
+def test_exact_bbox_and_per_path_bounds():
+    BoundingBoxCalculator.clear_cache()
+    paths = [Path(CubicBezier(0, 1j, 1 + 1j, 1)), Path(), Path(Line(5 + 5j, 6 + 7j))]
+    bounds = BoundingBoxCalculator.path_bounds(paths)
+    assert np.isnan(bounds[1]).all()
+    assert np.allclose(bounds[0], [0, 1, 0, 0.75])
+    assert BoundingBoxCalculator.get_exact_bbox(paths) == (0.0, 6.0, 0.0, 7.0)
+
+
+def test_cache_is_shared_across_callers_and_path_lists(monkeypatch):
+    BoundingBoxCalculator.clear_cache()
+    segments = _random_segments(5)
+    calls = []
+    original = SegmentBounds.compute
+    monkeypatch.setattr(SegmentBounds, "compute", staticmethod(lambda segs: calls.append(len(segs)) or original(segs)))
+    paths = [Path(*segments[i:i + 4]) for i in range(0, len(segments), 4)]
+    bbox = BoundingBoxCalculator.get_exact_bbox(paths)
+    # Otra lista con los mismos segmentos (reordenados y divididos) usa la caché
+    regrouped = [list(p) for p in reversed(paths)]
+    assert GeometryService.calculate_bbox(regrouped) == bbox
+    assert calls == [len(segments)]
+    BoundingBoxCalculator.clear_cache()
+    BoundingBoxCalculator.get_exact_bbox(paths)
+    assert calls == [len(segments), len(segments)]
+
+
+def test_geometry_service_raises_without_segments():
+    with pytest.raises(ValueError):
+        GeometryService.calculate_bbox([[]])
+
+
+def test_job_svg_loader_factory_loads_each_file_once():
+    loads = []
+    factory = job_svg_loader_factory(lambda f: loads.append(f) or object())
+    assert factory("a.svg") is factory("a.svg")
+    factory("b.svg")
+    assert loads == ["a.svg", "b.svg"]
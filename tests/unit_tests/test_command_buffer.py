@@ -0,0 +1,102 @@
+import numpy as np
+
+from domain.gcode.command_buffer import CommandBuffer
+from domain.gcode.gcode_command_builder import GCodeCommandBuilder
+from domain.gcode.commands.move_command import MoveCommand
+from domain.gcode.commands.arc_command import ArcCommand, RelativeMoveCommand
+from domain.gcode.commands.dwell_command import DwellCommand
+from domain.gcode.commands.tool_up_command import ToolUpCommand
+from domain.gcode.commands.tool_down_command import ToolDownCommand
+from domain.services.optimization.line_optimizer import LineOptimizer
+from domain.services.optimization.colinear_optimizer import ColinearOptimizer
+from domain.services.optimization.arc_optimizer import ArcOptimizer
+from domain.services.optimization.offset_optimizer import OffsetOptimizer
+from domain.services.optimization.optimization_chain import OptimizationChain
+
+
+class Comment:
+    def to_gcode(self):
+        return "(comentario)"
+
+
+def _sample_commands():
+    return [
+        ToolUpCommand("M5"),
+        MoveCommand(1.0, 2.0, rapid=True),
+        DwellCommand(0.25),
+        ToolDownCommand("M3 S1000"),
+        MoveCommand(2.0, 2.0, feed=1200),
+        MoveCommand(3.0, 2.5),
+        ArcCommand(4.0, 4.0, 1.0, 0.0, clockwise=False, feed=800),
+        RelativeMoveCommand(0.5, -0.5, rapid=True),
+        Comment(),
+    ]
+
+
+def test_round_trip_preserves_gcode():
+    commands = _sample_commands()
+    buffer = CommandBuffer.from_commands(commands)
+    assert len(buffer) == len(commands)
+    assert buffer.op.tolist() == [CommandBuffer.TOOL_UP, CommandBuffer.RAPID, CommandBuffer.DWELL,
+                                  CommandBuffer.TOOL_DOWN, CommandBuffer.LINEAR, CommandBuffer.LINEAR,
+                                  CommandBuffer.ARC_CCW, CommandBuffer.REL_RAPID, CommandBuffer.RAW]
+    assert np.isnan(buffer.feed[5]) and buffer.feed[4] == 1200.0
+    # El movimiento relativo sale en líneas G91 / G0 / G90 separadas: el texto es el mismo
+    assert "\n".join(buffer.to_gcode_lines()) == "\n".join(cmd.to_gcode() for cmd in commands)
+    assert buffer.to_commands()[-1] is commands[-1]
+
+
+def test_builder_rows_and_vector_blocks_share_one_buffer():
+    builder = GCodeCommandBuilder()
+    builder.move_to(0, 0, rapid=True).tool_down("M3")
+    builder.moves_to(np.array([1.0, 2.0]), np.array([0.0, 1.0]), np.array([900.0, np.nan]))
+    builder.tool_up("M5").raw(Comment())
+    lines, metrics = builder.to_gcode_lines_with_metrics()
+    assert lines == ["G0 X0.000 Y0.000", "M3", "G1 X1.000 Y0.000 F900", "G1 X2.000 Y1.000", "M5", "(comentario)"]
+    assert metrics == {}
+
+
+def test_take_concatenate_and_runs():
+    buffer = CommandBuffer.from_commands(_sample_commands())
+    starts, ends = CommandBuffer.runs(buffer.is_linear())
+    assert starts.tolist() == [4] and ends.tolist() == [6]
+    joined = CommandBuffer.concatenate([buffer.take([0, 4]), buffer.take([3])])
+    assert joined.to_gcode_lines() == ["M5", "G1 X2.000 Y2.000 F1200", "M3 S1000"]
+
+
+def test_optimizers_accept_buffers_and_lists_alike():
+    commands = [MoveCommand(0.0, 0.0, feed=1000)] + [MoveCommand(float(k), 0.0) for k in range(1, 6)]
+    commands += [MoveCommand(5.0, 1.0), MoveCommand(5.0, 2.0), ToolUpCommand("M5")]
+    for optimizer in (LineOptimizer(), ColinearOptimizer(), ArcOptimizer(), OffsetOptimizer(1.0, 2.0)):
+        from_list, list_metrics = optimizer.optimize(list(commands))
+        from_buffer, buffer_metrics = optimizer.optimize(CommandBuffer.from_commands(commands))
+        assert isinstance(from_buffer, CommandBuffer)
+        assert [c.to_gcode() for c in from_list] == from_buffer.to_gcode_lines()
+        assert list_metrics == buffer_metrics
+
+
+def test_colinear_keeps_corners_only():
+    commands = [MoveCommand(float(k), 0.0, feed=1000 if k == 0 else None) for k in range(5)]
+    commands += [MoveCommand(4.0, float(k)) for k in range(1, 4)]
+    optimized, metrics = ColinearOptimizer().optimize_buffer(CommandBuffer.from_commands(commands))
+    assert optimized.to_gcode_lines() == ["G1 X0.000 Y0.000 F1000", "G1 X4.000 Y0.000", "G1 X4.000 Y3.000"]
+    assert metrics == {"lines_saved": 5}
+
+
+def test_arc_optimizer_replaces_three_point_runs():
+    commands = [ToolDownCommand("M3"), MoveCommand(1.0, 0.0, feed=500), MoveCommand(0.0, 1.0),
+                MoveCommand(-1.0, 0.0), ToolUpCommand("M5")]
+    optimized, metrics = ArcOptimizer().optimize(commands)
+    assert metrics == {"arcs_found": 1}
+    arc = optimized[1]
+    assert isinstance(arc, ArcCommand) and not arc.clockwise
+    assert (arc.x, arc.y, arc.i, arc.j, arc.feed) == (-1.0, 0.0, -1.0, 0.0, 500.0)
+
+
+def test_chain_runs_on_buffer_and_returns_input_format():
+    commands = [MoveCommand(0.0, 0.0, rapid=True)] + [MoveCommand(float(k), 0.0) for k in range(4)]
+    chain = OptimizationChain(optimizers=[LineOptimizer(), OffsetOptimizer(offset_x=1.0)])
+    as_list, metrics = chain.optimize(commands)
+    as_buffer, _ = chain.optimize(CommandBuffer.from_commands(commands))
+    assert [c.to_gcode() for c in as_list] == as_buffer.to_gcode_lines() == ["G0 X1.000 Y0.000", "G1 X4.000 Y0.000"]
+    assert metrics["segments_removed"] == 3 and metrics["offset_applied"] == 2
@@ -0,0 +1,125 @@
+import math
+import numpy as np
+import pytest
+
+from domain.entities.stroke_buffer import StrokeBuffer
+from domain.geometry.corner_blender import CornerBlender
+from domain.gcode.motion_simulator import MotionSimulator
+from domain.services.compression.line_compressor import LineCompressor
+from application.use_cases.gcode_compression.gcode_compression_service import GcodeCompressionService
+from adapters.output.gcode_generator_adapter import GCodeGeneratorAdapter
+from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
+from infrastructure.factories.motion_simulator_factory import create_motion_simulator
+from tests.mocks.mock_use_case import DummyLogger
+
+
+def _buffer(*strokes):
+    return StrokeBuffer.from_arrays([np.asarray(s, dtype=np.float64) for s in strokes])
+
+
+def _deviation(points, vertex):
+    # Por simetría, el punto de la polilínea más cercano al vértice es un punto o el medio de una cuerda
+    candidates = np.concatenate((points, (points[1:] + points[:-1]) / 2))
+    return np.hypot(*(candidates - vertex).T).min()
+
+
+def test_right_angle_is_replaced_by_a_tangent_arc_within_tolerance():
+    blender = CornerBlender(0.05, max_step_deg=10.0)
+    blended = blender.blend(_buffer([[0, 0], [10, 0], [10, 10]]))
+    assert blender.corners_blended == 1
+    coords = blended.coords
+    # 90° en tramos de 10°: 9 tramos, 10 puntos en lugar del vértice
+    assert len(coords) == 12 and blended.offsets.tolist() == [0, 12]
+    assert coords[0].tolist() == [0, 0] and coords[-1].tolist() == [10, 10]
+    # Las tangencias quedan sobre los segmentos originales y a la misma distancia del vértice
+    start, end = coords[1], coords[-2]
+    assert start[1] == pytest.approx(0) and end[0] == pytest.approx(10)
+    assert 10 - start[0] == pytest.approx(end[1])
+    # La polilínea del arco se aparta del vértice exactamente la tolerancia
+    assert _deviation(coords[1:-1], np.array([10.0, 0.0])) == pytest.approx(0.05)
+    # Giro antihorario de 10° entre cuerdas y de 5° contra cada segmento original
+    headings = np.degrees(np.arctan2(*np.diff(coords, axis=0)[:, ::-1].T))
+    assert np.allclose(np.diff(headings), [5.0] + [10.0] * 8 + [5.0])
+
+
+def test_reach_is_clamped_to_half_of_the_shorter_segment():
+    blended = CornerBlender(5.0).blend(_buffer([[0, 0], [1, 0], [1, -4]]))
+    coords = blended.coords
+    # Giro horario: el arco queda del lado de adentro, sin pisar el punto medio del segmento corto
+    assert coords[1].tolist() == pytest.approx([0.5, 0.0])
+    assert coords[-2].tolist() == pytest.approx([1.0, -0.5])
+    assert (coords[1:-1, 1] <= 1e-12).all() and (coords[1:-1, 0] <= 1 + 1e-12).all()
+
+
+def test_stroke_ends_shallow_turns_reversals_and_zero_tolerance_are_untouched():
+    strokes = _buffer([[0, 0], [10, 0], [20, 1]], [[0, 5], [5, 5], [0, 5]], [[3, 3]], [[0, 9], [4, 9], [4, 13]])
+    blender = CornerBlender(0.1, min_angle_deg=15.0)
+    blended = blender.blend(strokes)
+    # Solo la esquina de 90° del último trazo: el giro de 5.7° y la reversión quedan igual
+    assert blender.corners_blended == 1
+    assert blended.offsets.tolist() == [0, 3, 6, 7, 19]
+    assert np.array_equal(blended.coords[:7], strokes.coords[:7])
+    assert blended.coords[7].tolist() == [0, 9] and blended.coords[-1].tolist() == [4, 13]
+    assert CornerBlender(0.0).blend(strokes) is strokes
+    with pytest.raises(ValueError):
+        CornerBlender(-1.0)
+
+
+def test_blending_shortens_the_simulated_stroke_time():
+    zigzag = _buffer([[float(k), 2.0 * (k % 2)] for k in range(40)])
+    simulator = MotionSimulator(max_accel_mm_s2=1000.0, junction_deviation_mm=0.01, default_feed=6000.0)
+    before = simulator.stroke_time(zigzag)
+    blended = CornerBlender(0.2).blend(zigzag)
+    assert simulator.stroke_time(blended) < before
+    # Cambiar de trazo es detenerse: dos mitades tardan más que el trazo continuo
+    halves = _buffer(zigzag.coords[:20], zigzag.coords[19:])
+    assert simulator.stroke_time(halves) > before
+    straight = _buffer([[0, 0], [50, 0], [100, 0]])
+    assert simulator.stroke_time(straight) == pytest.approx(1.1)
+    # Feeds por punto como los de plan_buffer(): el del segmento que termina en cada posición.
+    # 100 mm/s hasta frenar a 50 mm/s en la unión (0.5625 s) y luego 50 mm a 50 mm/s (1.025 s)
+    assert simulator.stroke_time(straight, [np.nan, 6000.0, 3000.0]) == pytest.approx(0.5625 + 1.025)
+
+
+class _Config(dict):
+    " Configuración en un dict; el adaptador le agrega el atributo i18n "
+
+
+class _I18n:
+    def get(self, key, default=None, **_kwargs):
+        return default or key
+
+
+def test_adapter_measures_the_blend_on_the_compressed_gcode():
+    config = _Config(CORNER_BLEND_TOLERANCE_MM=0.05)
+    adapter = GCodeGeneratorAdapter(path_sampler=None, feed=1500, cmd_down="M3", cmd_up="M5", step_mm=1, dwell_ms=0,
+                                    max_height_mm=250, config=config, logger=DummyLogger(), i18n=_I18n())
+    square = _buffer([[0, 0], [20, 0], [20, 20], [0, 20], [0, 0]])
+    blended, unblended = adapter._blend_corners(square)
+    assert np.array_equal(unblended.coords, square.coords) and len(blended.coords) > len(square.coords)
+    simulator = create_motion_simulator(config)
+    reported = []
+    for service in (None, GcodeCompressionService([LineCompressor()])):
+        adapter.metrics = {}
+        lines = list(adapter._with_blend_metrics(
+            adapter._compressed(adapter.iter_gcode_commands(blended), service), unblended, service, False))
+        baseline = simulator.estimate_lines(adapter._compressed(adapter.iter_gcode_commands(unblended), service))
+        # El ahorro es el de las líneas que llegan al archivo frente a las mismas sin redondear
+        assert adapter.metrics["blend_time_saved_s"] == pytest.approx(
+            baseline.motion_time_s - simulator.estimate_lines(lines).motion_time_s)
+        reported.append(adapter.metrics)
+    assert reported[0]["corners_blended"] == 3 and reported[0]["blend_time_saved_s"] > 0
+    # LineCompressor aplana los arcos que entran o salen en horizontal: no se cuentan
+    assert reported[1]["corners_blended"] < 3
+    assert reported[1]["blend_time_saved_s"] < reported[0]["blend_time_saved_s"]
+    assert adapter._blend_corners(_buffer([[0, 0], [10, 0], [20, 0]]))[1] is None
+
+
+def test_config_helper_corner_blending():
+    assert GcodeGenerationConfigHelper.get_corner_blending({}) == (0.0, 15.0, 10.0)
+    config = {"CORNER_BLEND_TOLERANCE_MM": 0.05, "CORNER_BLEND_MIN_ANGLE_DEG": 30, "CORNER_BLEND_MAX_STEP_DEG": 5}
+    assert GcodeGenerationConfigHelper.get_corner_blending(config) == (0.05, 30.0, 5.0)
+    assert GcodeGenerationConfigHelper.get_corner_blending({"CORNER_BLEND_TOLERANCE_MM": None}) == (0.0, 15.0, 10.0)
+    assert GcodeGenerationConfigHelper.get_corner_blending(
+        {"CORNER_BLEND_TOLERANCE_MM": 0.1, "CORNER_BLEND_MAX_STEP_DEG": 0}) == (0.1, 15.0, 10.0)
+    assert math.isclose(GcodeGenerationConfigHelper.get_corner_blending({"CORNER_BLEND_TOLERANCE_MM": "x"})[0], 0.0)
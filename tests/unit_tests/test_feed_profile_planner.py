@@ -0,0 +1,61 @@
+import numpy as np
+
+from domain.entities.point import Point
+from domain.entities.stroke_buffer import StrokeBuffer
+from adapters.output.feed_rate_strategy import FeedRateStrategy
+from adapters.output.curvature_feed_calculator import CurvatureFeedCalculator
+from adapters.output.feed_profile_planner import FeedProfilePlanner
+from adapters.output.gcode_builder_helper import GCodeBuilderHelper
+
+
+def _reference_feeds(strategy, coords):
+    " Feeds con el cálculo por punto (adjust_feed del vértice actual y del siguiente). "
+    calc = CurvatureFeedCalculator(strategy)
+    points = [Point(x, y) for x, y in coords.tolist()]
+    n = len(points)
+    feeds = []
+    for j in range(1, n):
+        feed = calc.adjust_feed(points[j-2] if j > 1 else None, points[j-1], points[j])
+        if j + 1 < n:
+            feed = min(feed, calc.adjust_feed(points[j-1], points[j], points[j+1]))
+        feeds.append(feed)
+    return np.array(feeds)
+
+
+def test_plan_matches_per_point_calculation():
+    strategy = FeedRateStrategy(base_feed=4000, curvature_factor=0.25, min_feed_factor=0.45)
+    coords = np.array([[0, 0], [1, 0], [1, 1], [1, 1 + 1e-8], [0, 2], [2, 2], [3, 2.5]], dtype=float)
+    planned = FeedProfilePlanner(strategy).plan(coords)
+    assert np.allclose(planned, _reference_feeds(strategy, coords), rtol=1e-12, atol=0)
+    assert planned[0] == 4000 * (1 - 0.25 * 0.5)
+
+
+def test_plan_buffer_keeps_strokes_independent():
+    strategy = FeedRateStrategy(base_feed=1000, curvature_factor=1.0, min_feed_factor=0.2)
+    strokes = [np.array([[0, 0], [1, 0], [1, 1]]), np.empty((0, 2)), np.array([[5, 5]]),
+               np.array([[2, 0], [3, 0], [4, 0]])]
+    feeds = FeedProfilePlanner(strategy).plan_buffer(StrokeBuffer.from_arrays(strokes))
+    assert np.isnan(feeds[[0, 3, 4]]).all()
+    assert feeds[[1, 2]].tolist() == [500.0, 500.0]
+    # Recta: sin reducción aunque el trazo anterior termine en una esquina
+    assert feeds[[5, 6]].tolist() == [1000.0, 1000.0]
+
+
+def test_adjust_feeds_matches_adjust_feed():
+    strategy = FeedRateStrategy(base_feed=1000, curvature_factor=0.8, min_feed_factor=0.4)
+    curvatures = [np.nan, 0.0, 0.5, 1.0]
+    expected = [strategy.adjust_feed(None if np.isnan(c) else c, "marker") for c in curvatures]
+    assert strategy.adjust_feeds(np.array(curvatures), "marker").tolist() == expected
+
+
+def test_builder_output_with_planner_matches_feed_fn():
+    strategy = FeedRateStrategy(base_feed=4000, curvature_factor=0.25, min_feed_factor=0.45)
+    calc = CurvatureFeedCalculator(strategy)
+    def feed_fn(prev_pt, curr_pt, next_pt, future_pt):
+        feed = calc.adjust_feed(prev_pt, curr_pt, next_pt)
+        if future_pt is not None:
+            feed = min(feed, calc.adjust_feed(curr_pt, next_pt, future_pt))
+        return feed
+    strokes = [[Point(0, 0), Point(10, 0), Point(10, 10), Point(0, 10)], [Point(20, 0), Point(30, 0)]]
+    helper = GCodeBuilderHelper("M3", "M5", 100)
+    assert helper.build(strokes, FeedProfilePlanner(strategy)) == helper.build(strokes, feed_fn)
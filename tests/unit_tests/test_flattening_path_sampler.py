@@ -0,0 +1,65 @@
+"""
+Tests de FlatteningPathSampler: desviación máxima de cuerda garantizada con el mínimo de puntos.
+"""
+import random
+import numpy as np
+from svgpathtools import Path, Line, QuadraticBezier, CubicBezier, Arc
+from adapters.input.flattening_path_sampler import FlatteningPathSampler
+from adapters.input.path_sampler import PathSampler
+from tests.mocks.mock_geometry import MockSegment
+
+
+def _max_deviation(segment, polyline):
+    " Distancia máxima entre puntos densos de la curva y la polilínea muestreada. "
+    dense = np.array([segment.point(t) for t in np.linspace(0, 1, 2001)])
+    a, b = polyline[:-1], polyline[1:]
+    ab = b - a
+    worst = 0.0
+    for z in dense:
+        u = np.clip(((z - a) * ab.conjugate()).real / np.maximum(np.abs(ab) ** 2, 1e-300), 0, 1)
+        worst = max(worst, float(np.min(np.abs(z - (a + u * ab)))))
+    return worst
+
+
+def _random_curves(seed):
+    rnd = random.Random(seed)
+    def c():
+        return complex(rnd.uniform(-30, 30), rnd.uniform(-30, 30))
+    curves = []
+    for _ in range(10):
+        curves.append(QuadraticBezier(c(), c(), c()))
+        curves.append(CubicBezier(c(), c(), c(), c()))
+        curves.append(Arc(c(), complex(rnd.uniform(5, 30), rnd.uniform(5, 30)), rnd.uniform(0, 180),
+                          rnd.random() < 0.5, rnd.random() < 0.5, c()))
+    return curves
+
+
+def test_chord_deviation_stays_below_tolerance():
+    sampler = FlatteningPathSampler(tolerance=0.05, step=0.3)
+    for seg in _random_curves(1):
+        points = sampler.sample_array(Path(seg))
+        polyline = points[:, 0] + 1j * points[:, 1]
+        assert _max_deviation(seg, polyline) <= 0.05 + 1e-9
+
+
+def test_emits_fewer_points_than_uniform_sampling():
+    paths = [Path(seg) for seg in _random_curves(2)] + [Path(Line(0j, 100 + 0j))]
+    flattened, _ = FlatteningPathSampler(tolerance=0.05, step=0.3).sample_many(paths)
+    uniform, _ = PathSampler(0.3).sample_many(paths)
+    assert len(flattened) < len(uniform) / 2
+    assert len(FlatteningPathSampler(0.05, 0.3).sample_array(Path(Line(0j, 100 + 0j)))) == 2
+
+
+def test_for_scale_expresses_tolerance_in_output_units():
+    seg = CubicBezier(0j, 100j, 100 + 100j, 100 + 0j)
+    sampler = FlatteningPathSampler(tolerance=0.05, step=0.3)
+    scaled = sampler.for_scale(0.1)
+    assert abs(scaled.tolerance - 0.5) < 1e-12
+    points = scaled.sample_array(Path(seg)) * 0.1
+    scaled_seg = CubicBezier(0j, 10j, 10 + 10j, 10 + 0j)
+    assert _max_deviation(scaled_seg, points[:, 0] + 1j * points[:, 1]) <= 0.05 + 1e-9
+
+
+def test_unknown_segments_use_step():
+    points = FlatteningPathSampler(tolerance=0.05, step=2.5).sample_array([MockSegment(10, (0, 0), (10, 0))])
+    assert len(points) == 5
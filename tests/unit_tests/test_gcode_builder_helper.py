@@ -0,0 +1,40 @@
+"""
+Tests unitarios para GCodeBuilderHelper (construcción de las líneas G-code de los trazos).
+"""
+from domain.entities.point import Point
+from adapters.output.gcode_builder_helper import GCodeBuilderHelper
+
+
+def test_builder_emits_no_zero_length_moves_at_output_resolution():
+    strokes = [[Point(0, 0), Point(1.0001, 0), Point(1.0003, 0.0004), Point(2, 0)]]
+    feed_fn = lambda prev, curr, nxt, future: 1000.0
+    lines, _ = GCodeBuilderHelper("M3", "M5", 100).build(strokes, feed_fn)
+    assert [line for line in lines if line.startswith("G1")] == ["G1 X1.000 Y0.000 F1000", "G1 X2.000 Y0.000"]
+
+
+def test_relative_moves_use_quantized_deltas_in_one_block_per_run():
+    strokes = [[Point(0.0004, 0), Point(0.0008, 0.0003), Point(0.0012, 0.0006), Point(1.0016, 0.0009)],
+               [Point(3.0001, 2.0004), Point(4.0004, 2.0004)]]
+    feed_fn = lambda prev, curr, nxt, future: 1000.0
+    lines, _ = GCodeBuilderHelper("M3", "M5", 100).build(strokes, feed_fn, use_relative_moves=True)
+    assert lines.count("G91") == lines.count("G90") == 1
+    # Suma de los deltas emitidos = última posición absoluta redondeada a 3 decimales
+    x = y = 0.0
+    for line in lines[lines.index("G91"):lines.index("G90")]:
+        if line.startswith(("G0 ", "G1 ")):
+            words = dict((w[0], float(w[1:])) for w in line.split()[1:])
+            x, y = round(x + words["X"], 3), round(y + words["Y"], 3)
+    assert (x, y) == (4.0, 2.0)
+
+
+def test_pen_drag_joins_close_strokes_without_lifting():
+    strokes = [[Point(0, 0), Point(1, 0)], [Point(1.05, 0), Point(2, 0)], [Point(10, 0), Point(11, 0)]]
+    feed_fn = lambda prev, curr, nxt, future: 1000.0
+    plain, plain_metrics = GCodeBuilderHelper("M3", "M5", 100).build(strokes, feed_fn)
+    dragged, metrics = GCodeBuilderHelper("M3", "M5", 100, pen_drag_max_gap_mm=0.1).build(strokes, feed_fn)
+    assert plain_metrics == {} and metrics == {"pen_lifts_avoided": 1}
+    assert plain.count("M3") == 3 and dragged.count("M3") == 2
+    # El hueco de 0.05 mm se recorre con la lapicera abajo; el de 8 mm sigue con subir/desplazar/bajar
+    assert dragged[dragged.index("G1 X1.000 Y0.000 F1000") + 1] == "G1 X1.050 Y0.000"
+    # M5 y M3 con sus pausas y el G0 se reemplazan por un G1
+    assert len(plain) - len(dragged) == 4
@@ -19,6 +19,11 @@ class TestGcodeOffsetUtils(unittest.TestCase):
         # No debe modificar la línea si no hay Y
         self.assertEqual(aplicar_offset_y_a_gcode([linea], offset)[0], linea)
 
+    def test_aplicar_offset_y_a_gcode_linea_modal(self):
+        # Líneas del G-code compacto: sin palabra G y sin espacios
+        self.assertEqual(aplicar_offset_y_a_gcode(["Y20.000 F1000", "G1X1.000Y2.000", "X5.000"], 50.0),
+                         ["Y70.000 F1000", "G1X1.000Y52.000", "X5.000"])
+
     def test_aplicar_offset_y_a_gcode_linea_no_g0g1(self):
         offset = 50.0
         linea = "M5"
@@ -38,5 +43,12 @@ class TestGcodeOffsetUtils(unittest.TestCase):
         ]
         self.assertEqual(aplicar_offset_y_a_gcode(lineas, offset), esperado)
 
+    def test_bloque_relativo_no_se_desplaza(self):
+        lineas = ["G0 X1.000 Y1.000", "G91", "G1 X0.500 Y0.500", "M5", "G90", "G0 X0.000 Y0.000",
+                  "G91\nG1 X1.000 Y1.000\nG90", "G1 X2.000 Y2.000"]
+        esperado = ["G0 X1.000 Y11.000", "G91", "G1 X0.500 Y0.500", "M5", "G90", "G0 X0.000 Y10.000",
+                    "G91\nG1 X1.000 Y1.000\nG90", "G1 X2.000 Y12.000"]
+        self.assertEqual(aplicar_offset_y_a_gcode(lineas, 10.0), esperado)
+
 if __name__ == "__main__":
     unittest.main()
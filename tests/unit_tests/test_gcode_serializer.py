@@ -0,0 +1,173 @@
+import io
+import numpy as np
+import pytest
+
+from domain.gcode.command_buffer import CommandBuffer
+from domain.gcode.gcode_serializer import GCodeSerializer, ModalState
+from domain.gcode.gcode_border_rectangle_detector import GCodeBorderRectangleDetector
+from domain.services.compression.line_compressor import LineCompressor
+from domain.gcode.commands.move_command import MoveCommand
+from domain.gcode.commands.arc_command import ArcCommand, RelativeMoveCommand
+from domain.gcode.commands.dwell_command import DwellCommand
+from domain.gcode.commands.tool_up_command import ToolUpCommand
+from domain.gcode.commands.tool_down_command import ToolDownCommand
+from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
+
+
+class Comment:
+    def to_gcode(self):
+        return "(100% relleno)"
+
+
+def _commands():
+    return [
+        MoveCommand(0, 0, rapid=True),
+        DwellCommand(0.35),
+        ToolDownCommand("M3 S255; baja lapicera"),
+        MoveCommand(12.3456, -0.0004, feed=2819.702207579759),
+        MoveCommand(-0.25, 7.0),
+        MoveCommand(5.0, 5.0, feed=1000, rapid=True),
+        ArcCommand(1.0, 2.0, -0.5, 0.5, clockwise=True, feed=800),
+        ArcCommand(3.0, 4.0, 0.5, 0.0, clockwise=False),
+        RelativeMoveCommand(0.3, -0.1, feed=900),
+        RelativeMoveCommand(1.0, 1.0, rapid=True),
+        ToolUpCommand("M5"),
+        Comment(),
+    ]
+
+
+def test_default_format_matches_to_gcode():
+    commands = _commands()
+    lines = GCodeSerializer().lines(CommandBuffer.from_commands(commands))
+    assert lines[:8] == [cmd.to_gcode() for cmd in commands[:8]]
+    # Los dos movimientos relativos comparten un solo bloque G91; el M5 no necesita cerrarlo
+    assert lines[8:] == ["G91", "G1 X0.300 Y-0.100 F900", "G0 X1.000 Y1.000", "M5", "G90", "(100% relleno)"]
+
+
+def test_configurable_decimals():
+    buffer = CommandBuffer.from_commands([MoveCommand(12.3456, -1.0, feed=1500), ArcCommand(1, 2, 0.125, 0)])
+    assert GCodeSerializer(decimals=1).lines(buffer) == ["G1 X12.3 Y-1.0 F1500", "G2 X1.0 Y2.0 I0.1 J0.0"]
+    assert GCodeSerializer(decimals=0).lines(buffer)[0] == "G1 X12 Y-1 F1500"
+
+
+def test_integral_feeds_are_written_without_decimals():
+    # La columna de feed es float64: 4000 y 4000.0 se escriben como el feed entero de la configuración
+    buffer = CommandBuffer.from_commands([MoveCommand(1, 0, feed=4000.0), MoveCommand(2, 0, feed=3999.839185837623),
+                                          ArcCommand(3, 0, 0.5, 0, feed=4000)])
+    assert GCodeSerializer().lines(buffer) == ["G1 X1.000 Y0.000 F4000", "G1 X2.000 Y0.000 F3999.839185837623",
+                                               "G2 X3.000 Y0.000 I0.500 J0.000 F4000"]
+    assert GCodeSerializer(compact=True, feed_decimals=1).lines(buffer)[0] == "G1 X1.000 Y0.000 F4000.0"
+    # Los comandos reconstruidos desde el buffer escriben el mismo F
+    assert [c.to_gcode() for c in buffer.to_commands()] == GCodeSerializer().lines(buffer)
+
+
+def test_fixed_point_mode_writes_scaled_integers():
+    buffer = CommandBuffer.from_commands([MoveCommand(12.3456, -0.0004), DwellCommand(0.5)])
+    assert GCodeSerializer(decimals=3, fixed_point=True).lines(buffer) == ["G1 X12346 Y0", "G4 P0.500"]
+
+
+def test_invalid_decimals():
+    with pytest.raises(ValueError):
+        GCodeSerializer(decimals=-1)
+    with pytest.raises(ValueError):
+        GCodeSerializer(decimals=2.5)
+
+
+def test_write_to_text_and_binary_streams_in_chunks():
+    buffer = CommandBuffer()
+    buffer.extend_moves(CommandBuffer.LINEAR, np.arange(25.0), np.zeros(25))
+    serializer = GCodeSerializer()
+    serializer.CHUNK_ROWS = 10
+    expected = "\n".join(serializer.lines(buffer))
+    text = io.StringIO()
+    assert serializer.write(buffer, text) == len(expected)
+    assert text.getvalue() == expected == serializer.text(buffer)
+    binary = io.BytesIO()
+    serializer.write(buffer, binary)
+    assert binary.getvalue() == expected.encode("utf-8")
+    assert GCodeSerializer().lines(CommandBuffer()) == []
+
+
+def _stroke_buffer():
+    buffer = CommandBuffer()
+    buffer.append(CommandBuffer.RAPID, 0.0, 0.0)
+    buffer.append(CommandBuffer.RAPID, 5.0, 0.0)
+    buffer.append(CommandBuffer.TOOL_DOWN, ref="M3")
+    buffer.extend_moves(CommandBuffer.LINEAR, [6.0, 7.0, 7.0, 7.0, 7.0002], [0.0, 0.0, 1.0, 1.0, 2.0],
+                        [1000.2, np.nan, 999.9, 1500.0, np.nan])
+    buffer.append(CommandBuffer.TOOL_UP, ref="M5")
+    buffer.append(CommandBuffer.RAPID, 7.0, 2.0)
+    return buffer
+
+
+def test_relative_runs_share_one_distance_mode_block():
+    buffer = CommandBuffer()
+    buffer.append(CommandBuffer.RAPID, 1.0, 1.0)
+    buffer.append(CommandBuffer.REL_RAPID, 2.0, 0.0)
+    buffer.append(CommandBuffer.TOOL_DOWN, ref="M3").append(CommandBuffer.DWELL, dwell=0.1)
+    buffer.extend_moves(CommandBuffer.REL_LINEAR, [1.0, 0.0], [0.0, 1.0], [900.0, np.nan])
+    buffer.append(CommandBuffer.TOOL_UP, ref="M5")
+    buffer.append(CommandBuffer.RAPID, 0.0, 0.0)
+    lines = GCodeSerializer().lines(buffer)
+    assert lines == ["G0 X1.000 Y1.000", "G91", "G0 X2.000 Y0.000", "M3", "G4 P0.100", "G1 X1.000 Y0.000 F900",
+                     "G1 X0.000 Y1.000", "M5", "G90", "G0 X0.000 Y0.000"]
+    # Con `modal` el bloque sigue abierto entre llamadas; sin él se cierra al final
+    modal = ModalState()
+    first = GCodeSerializer().lines(buffer.take(np.arange(4)), modal=modal)
+    assert first[-1] == "G4 P0.100" and modal.relative
+    assert first + GCodeSerializer().lines(buffer.take(np.arange(4, len(buffer))), modal=modal) == lines
+    assert GCodeSerializer().lines(buffer.take(np.arange(4)))[-1] == "G90"
+
+
+def test_compact_mode_omits_modal_words_axes_and_feed():
+    lines = GCodeSerializer(compact=True).lines(_stroke_buffer())
+    assert lines == ["G0 X0.000 Y0.000", "X5.000", "M3", "G1 X6.000 Y0.000 F1000", "X7.000", "Y1.000",
+                     "F1500", "Y2.000", "M5", "G0 X7.000 Y2.000"]
+    assert GCodeSerializer(compact=True, omit_spaces=True).lines(_stroke_buffer())[3] == "G1X6.000Y0.000F1000"
+    # El modo por defecto no cambia
+    assert GCodeSerializer().lines(_stroke_buffer())[1] == "G0 X5.000 Y0.000"
+
+
+def test_compact_state_continues_across_calls_and_chunks():
+    serializer = GCodeSerializer(compact=True)
+    expected = serializer.text(_stroke_buffer())
+    buffer = _stroke_buffer()
+    modal = ModalState()
+    first = serializer.lines(buffer.take(np.arange(4)), modal=modal)
+    rest = serializer.lines(buffer.take(np.arange(4, len(buffer))), modal=modal)
+    assert "\n".join(first + rest) == expected
+    serializer.CHUNK_ROWS = 3
+    stream = io.StringIO()
+    serializer.write(buffer, stream)
+    assert stream.getvalue() == expected
+
+
+def test_compact_output_is_understood_by_compressor_and_border_detector():
+    plain = GCodeSerializer().lines(_stroke_buffer())
+    compact = GCodeSerializer(compact=True, omit_spaces=True).lines(_stroke_buffer())
+    merged, _ = LineCompressor().compress(compact, 0.01)
+    assert merged[3:5] == ["G1 X7.000 Y0.000 F1000", "Y1.000"]
+    assert LineCompressor().compress(plain, 0.01)[0][3] == "G1 X7.000 Y0.000 F1000"
+    border = CommandBuffer()
+    border.append(CommandBuffer.RAPID, 0.0, 0.0).append(CommandBuffer.DWELL, dwell=0.35)
+    border.append(CommandBuffer.RAPID, 0.0, 250.0).append(CommandBuffer.DWELL, dwell=0.35)
+    border.append(CommandBuffer.TOOL_DOWN, ref="M3").append(CommandBuffer.DWELL, dwell=0.35)
+    border.extend_moves(CommandBuffer.LINEAR, [0.0, 155.0, 155.0, 0.0], [0.0, 0.0, 250.0, 250.0], [4000.0] + [np.nan] * 3)
+    border.append(CommandBuffer.DWELL, dwell=0.35).append(CommandBuffer.TOOL_UP, ref="M5")
+    lines = GCodeSerializer(compact=True, omit_spaces=True).lines(border)
+    assert lines[2] == "Y250.000"
+    assert GCodeBorderRectangleDetector().detect_border_pattern(lines) == list(range(len(lines)))
+
+
+def test_fixed_point_coordinates_survive_line_compression():
+    lines = GCodeSerializer(fixed_point=True).lines(CommandBuffer.from_commands(
+        [MoveCommand(1.0, 2.0, feed=900), MoveCommand(3.0, 2.0), MoveCommand(4.0, 2.0)]))
+    assert LineCompressor().compress(lines, 0.01)[0] == ["G1 X4000 Y2000 F900"]
+
+
+def test_config_helper_gcode_format():
+    assert GcodeGenerationConfigHelper.get_gcode_format({}) == (3, False)
+    assert GcodeGenerationConfigHelper.get_gcode_format({"GCODE_DECIMALS": 4, "GCODE_FIXED_POINT": True}) == (4, True)
+    assert GcodeGenerationConfigHelper.get_gcode_format({"GCODE_DECIMALS": 40}) == (3, False)
+    assert GcodeGenerationConfigHelper.get_gcode_compact({}) == (False, False)
+    assert GcodeGenerationConfigHelper.get_gcode_compact({"GCODE_COMPACT": True, "GCODE_OMIT_SPACES": True}) == (True, True)
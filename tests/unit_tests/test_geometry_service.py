@@ -18,5 +18,9 @@ class TestGeometryService(unittest.TestCase):
         self.assertAlmostEqual(center[0], 5)
         self.assertAlmostEqual(center[1], 5)
 
+    def test_bbox_without_segments_raises(self):
+        with self.assertRaises(ValueError):
+            GeometryService._calculate_bbox([[], []])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from domain.entities.stroke_buffer import StrokeBuffer
+from adapters.output.junction_deviation_planner import JunctionDeviationPlanner
+from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
+
+
+def _brute_force_speeds(limits, lengths, accel):
+    speeds = limits.copy()
+    for k in range(len(speeds) - 2, -1, -1):
+        speeds[k] = min(speeds[k], speeds[k + 1] + 2 * accel * lengths[k])
+    for k in range(1, len(speeds)):
+        speeds[k] = min(speeds[k], speeds[k - 1] + 2 * accel * lengths[k - 1])
+    return speeds
+
+
+def test_straight_runs_get_full_speed_and_short_zigzags_slow_down():
+    planner = JunctionDeviationPlanner(4000, 1000, 0.01)
+    assert planner.plan(np.array([[0, 0], [10, 0], [20, 0], [30, 0]], dtype=float)).tolist() == [4000.0] * 3
+    zigzag = np.array([[0.3 * k, 0.3 * (k % 2)] for k in range(20)], dtype=float)
+    feeds = planner.plan(zigzag)
+    assert feeds.max() < 4000 and feeds.min() >= 1
+    # Mismo recorrido con más aceleración: más rápido
+    assert (JunctionDeviationPlanner(4000, 5000, 0.01).plan(zigzag) >= feeds).all()
+
+
+def test_passes_match_sequential_planner():
+    planner = JunctionDeviationPlanner(4000, 800, 0.02)
+    coords = np.cumsum(np.random.default_rng(7).normal(scale=0.5, size=(200, 2)), axis=0)
+    vectors = np.diff(coords, axis=0)
+    lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+    starts, ends = np.zeros(200, dtype=bool), np.zeros(200, dtype=bool)
+    starts[0] = ends[-1] = True
+    limits = planner.vertex_limits(vectors, lengths, starts, ends)
+    expected = _brute_force_speeds(limits, lengths, planner.accel)
+    assert np.allclose(planner._plan_speeds(limits, lengths), expected, rtol=1e-9, atol=1e-3)
+    # Con anticipación limitada nunca se va más rápido que con el trazo completo
+    limited = JunctionDeviationPlanner(4000, 800, 0.02, lookahead_segments=4).plan(coords)
+    assert (limited <= planner.plan(coords)).all()
+
+
+def test_each_stroke_starts_and_ends_stopped():
+    planner = JunctionDeviationPlanner(6000, 100, 0.01)
+    strokes = StrokeBuffer.from_arrays([np.array([[0, 0], [1, 0]]), np.array([[1, 0], [2, 0]])])
+    feeds = planner.plan_buffer(strokes)
+    assert np.isnan(feeds[[0, 2]]).all()
+    # 1 mm desde y hasta detenido: pico = sqrt(a · L) en mm/min
+    assert feeds[1] == feeds[3] == np.floor(np.sqrt(100 * 3600 * 1.0))
+    with pytest.raises(ValueError):
+        JunctionDeviationPlanner(4000, 0, 0.01)
+
+
+def test_config_helper_feed_planner():
+    assert GcodeGenerationConfigHelper.get_feed_planner({}) == ("curvature", 1000.0, 0.01, 16)
+    config = {"FEED_PLANNER": "Junction_Deviation", "MAX_ACCEL_MM_S2": 500, "JUNCTION_DEVIATION_MM": 0.05,
+              "PLANNER_LOOKAHEAD_SEGMENTS": 0}
+    assert GcodeGenerationConfigHelper.get_feed_planner(config) == ("junction_deviation", 500.0, 0.05, 0)
+    assert GcodeGenerationConfigHelper.get_feed_planner({"FEED_PLANNER": "otro", "MAX_ACCEL_MM_S2": -1})[0] == "curvature"
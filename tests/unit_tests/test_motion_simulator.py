@@ -0,0 +1,124 @@
+import math
+import pytest
+
+from domain.gcode.motion_simulator import MotionSimulator, PlotEstimate
+from domain.gcode.command_buffer import CommandBuffer
+from domain.gcode.gcode_serializer import GCodeSerializer
+from domain.gcode.commands.move_command import MoveCommand
+from domain.gcode.commands.tool_up_command import ToolUpCommand
+from domain.gcode.commands.tool_down_command import ToolDownCommand
+from domain.services.optimization.line_optimizer import LineOptimizer
+from domain.services.optimization.optimization_chain import OptimizationChain
+from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
+from infrastructure.factories.motion_simulator_factory import create_motion_simulator
+
+
+def _simulator(**kwargs):
+    params = dict(max_accel_mm_s2=1000.0, junction_deviation_mm=0.01, rapid_feed=6000.0, default_feed=6000.0)
+    params.update(kwargs)
+    return MotionSimulator(**params)
+
+
+def test_single_move_follows_trapezoid_and_triangle():
+    # 100 mm a 100 mm/s con 1000 mm/s²: 5 mm acelerando, 90 mm a velocidad constante y 5 mm frenando
+    estimate = _simulator().estimate_lines(["G1 X100 Y0 F6000"])
+    assert estimate.motion_time_s == pytest.approx(1.1)
+    # 4 mm no alcanzan la velocidad nominal: pico de 63.2 mm/s a mitad de camino
+    assert _simulator().estimate_lines(["G1 X4 Y0 F6000"]).motion_time_s == pytest.approx(2 * math.sqrt(4 / 1000))
+
+
+def test_corners_slow_down_and_straight_joints_do_not():
+    straight = _simulator().estimate_lines(["G1 X50 Y0 F6000", "X100"])
+    assert straight.motion_time_s == pytest.approx(1.1)
+    corner = _simulator().estimate_lines(["G1 X50 Y0 F6000", "Y50"]).motion_time_s
+    reversal = _simulator().estimate_lines(["G1 X50 Y0 F6000", "X0"]).motion_time_s
+    assert 1.1 < corner < reversal == pytest.approx(2 * 0.6)
+
+
+def test_pen_dwells_and_distances_are_reported():
+    lines = ["M5", "G4 P0.35", "G0 X0 Y10", "M3 S255; baja", "G4 P0.25", "G1 X10 Y10 F1200", "G1 X10 Y0",
+             "M5", "G4 P0.25", "G0 X0 Y0", "M3", "G1 X0 Y5", "M5"]
+    estimate = _simulator(pen_down_time_s=0.1, pen_up_time_s=0.2).estimate_lines(lines)
+    assert (estimate.pen_down_mm, estimate.travel_mm) == (25.0, 20.0)
+    # El M5 inicial no cambia el estado (la lapicera arranca arriba)
+    assert estimate.pen_lifts == 2 and estimate.moves == 5
+    assert estimate.dwell_time_s == pytest.approx(0.85)
+    assert estimate.pen_time_s == pytest.approx(2 * 0.1 + 2 * 0.2)
+    assert estimate.estimated_time_s == pytest.approx(estimate.motion_time_s + 0.85 + 0.6)
+
+
+def test_arcs_relative_blocks_and_fixed_point():
+    # Semicírculo de radio 10: 31.4 mm, limitado además por v² ≤ a·r (100 mm/s)
+    arc = _simulator().estimate_lines(["G0 X10 Y0", "M3", "G3 X-10 Y0 I-10 J0 F6000"])
+    assert arc.pen_down_mm == pytest.approx(math.pi * 10)
+    full = _simulator().estimate_lines(["G2 X0 Y0 I5 J0 F600"])
+    assert full.travel_mm == pytest.approx(2 * math.pi * 5)
+    relative = _simulator().estimate_lines(["G0 X1 Y1", "G91", "G1 X3 Y4 F600", "X-3", "G90", "G1 X0 Y0"])
+    assert relative.travel_mm == pytest.approx(math.hypot(1, 1) + 5 + 3 + math.hypot(1, 5))
+    fixed = _simulator(coordinate_scale=0.001).estimate_lines(["G1 X100000 Y0 F6000"])
+    assert fixed.motion_time_s == pytest.approx(1.1)
+
+
+def test_sharp_corners_count_pen_down_turns_only():
+    lines = ["M3", "G1 X10 Y0 F6000", "G1 X10 Y10", "G1 X20 Y10.5", "G1 X30 Y10.5", "M5", "G0 X0 Y0", "G0 X0 Y10"]
+    # 90° y 87° cuentan; el giro de 2.9° y la esquina del G0 con la lapicera arriba no
+    assert _simulator().estimate_lines(lines).sharp_corners == 2
+    assert _simulator(corner_angle_deg=1.0).estimate_lines(lines).sharp_corners == 3
+    # Un arco tangente al segmento de entrada no es una esquina
+    tangent = ["M3", "G1 X10 Y0 F6000", "G3 X20 Y10 I0 J10", "M5"]
+    assert _simulator().estimate_lines(tangent).sharp_corners == 0
+
+
+def test_stream_and_buffer_apis_agree_with_text():
+    commands = [ToolDownCommand("M3"), MoveCommand(0.0, 0.0, feed=3000.0)] + \
+               [MoveCommand(float(k), float(k % 2)) for k in range(1, 20)] + [ToolUpCommand("M5")]
+    buffer = CommandBuffer.from_commands(commands)
+    lines = GCodeSerializer().lines(buffer)
+    simulator = _simulator()
+    expected = simulator.estimate_lines(lines)
+    target = PlotEstimate()
+    assert list(simulator.stream_lines(iter(lines), target)) == lines
+    assert target == expected == simulator.estimate(buffer) == simulator.estimate(commands)
+    compact = simulator.estimate_lines(GCodeSerializer(compact=True, omit_spaces=True).lines(buffer))
+    assert compact.estimated_time_s == pytest.approx(expected.estimated_time_s)
+
+
+def test_fastest_compares_candidates_by_simulated_time():
+    zigzag = CommandBuffer.from_commands([MoveCommand(0.0, 0.0, feed=6000.0)] +
+                                         [MoveCommand(float(k), float(k % 2) * 0.5) for k in range(1, 30)])
+    # Más líneas pero sin esquinas: es más rápido
+    smooth = CommandBuffer.from_commands([MoveCommand(float(k), 0.0, feed=6000.0 if k == 0 else None)
+                                          for k in range(60)])
+    index, estimate = _simulator().fastest([zigzag, smooth])
+    assert index == 1 and estimate.moves == 59
+    with pytest.raises(ValueError):
+        _simulator().fastest([])
+
+
+class _Detour:
+    " Optimizador de prueba que vuelve sobre el último tramo (dos reversiones). "
+    def optimize(self, commands):
+        return commands[:-1] + [MoveCommand(10.0, 0.0), MoveCommand(20.0, 0.0), commands[-1]], {"detour": True}
+
+
+def test_chain_rejects_steps_that_increase_plot_time():
+    commands = [ToolDownCommand("M3"), MoveCommand(0.0, 0.0, feed=3000), MoveCommand(10.0, 0.0),
+                MoveCommand(20.0, 0.0), ToolUpCommand("M5")]
+    chain = OptimizationChain(optimizers=[LineOptimizer(), _Detour()], time_estimator=_simulator())
+    optimized, metrics = chain.optimize(commands)
+    assert [c.to_gcode() for c in optimized] == ["M3", "G1 X20.000 Y0.000 F3000", "M5"]
+    assert metrics["optimizations_rejected"] == 1 and metrics["segments_removed"] == 2
+    assert metrics["estimated_time_s"] == pytest.approx(_simulator().estimate(optimized).estimated_time_s)
+
+
+def test_config_helper_and_factory():
+    assert GcodeGenerationConfigHelper.get_plot_time_settings({}) == (4000.0, 0.0, 0.0)
+    config = {"FEED": 3000, "RAPID_FEED": 9000, "PEN_SERVO_DOWN_MS": 150, "PEN_SERVO_UP_MS": None,
+              "GCODE_DECIMALS": 2, "GCODE_FIXED_POINT": True, "MAX_ACCEL_MM_S2": 500}
+    assert GcodeGenerationConfigHelper.get_plot_time_settings(config) == (9000.0, 150.0, 0.0)
+    simulator = create_motion_simulator(config)
+    assert simulator.rapid_speed == 150.0 and simulator.default_feed == 3000.0 and simulator.accel == 500.0
+    assert (simulator.pen_down_time_s, simulator.coordinate_scale) == (0.15, 0.01)
+    assert create_motion_simulator({"RAPID_FEED": None}).rapid_speed == pytest.approx(4000 / 60)
+    with pytest.raises(ValueError):
+        MotionSimulator(max_accel_mm_s2=0)
@@ -0,0 +1,63 @@
+"""
+Tests unitarios para OrderLocalSearch (mejora 2-opt / Or-opt del orden de trazos).
+"""
+import numpy as np
+from domain.services.optimization.order_local_search import OrderLocalSearch
+
+
+def _random_strokes(n, seed):
+    rng = np.random.default_rng(seed)
+    starts = rng.uniform(0, 300, (n, 2))
+    ends = starts + rng.normal(0, 5, (n, 2))
+    return starts, ends
+
+
+def _apply(starts, ends, order, flipped):
+    new_starts = np.where(flipped[:, None], ends[order], starts[order])
+    new_ends = np.where(flipped[:, None], starts[order], ends[order])
+    return new_starts, new_ends
+
+
+def test_improves_travel_without_reversal():
+    starts, ends = _random_strokes(200, seed=1)
+    order, flipped = OrderLocalSearch(5.0).improve(starts, ends)
+    assert sorted(order.tolist()) == list(range(200))
+    assert not flipped.any()
+    assert order[0] == 0
+    after = OrderLocalSearch.travel(*_apply(starts, ends, order, flipped))
+    assert after < OrderLocalSearch.travel(starts, ends)
+
+
+def test_reversal_respects_non_reversible_strokes():
+    starts, ends = _random_strokes(200, seed=2)
+    reversible = np.arange(200) % 3 != 0
+    order, flipped = OrderLocalSearch(5.0, allow_reversal=True).improve(starts, ends, reversible=reversible)
+    assert sorted(order.tolist()) == list(range(200))
+    assert not flipped[~reversible[order]].any()
+    assert not flipped[0]
+    after = OrderLocalSearch.travel(*_apply(starts, ends, order, flipped))
+    assert after < OrderLocalSearch.travel(starts, ends)
+
+
+def test_two_opt_uncrosses_reversed_stroke():
+    # El segundo trazo está dibujado "al revés": invertirlo elimina los dos saltos largos
+    starts = np.array([[0.0, 0.0], [10.0, 0.0], [11.0, 0.0]])
+    ends = np.array([[1.0, 0.0], [2.0, 0.0], [12.0, 0.0]])
+    order, flipped = OrderLocalSearch(1.0, allow_reversal=True).improve(starts, ends)
+    assert order.tolist() == [0, 1, 2]
+    assert flipped.tolist() == [False, True, False]
+
+
+def test_zero_budget_returns_identity():
+    starts, ends = _random_strokes(50, seed=3)
+    order, flipped = OrderLocalSearch(0.0, allow_reversal=True).improve(starts, ends)
+    assert order.tolist() == list(range(50))
+    assert not flipped.any()
+
+
+def test_expired_budget_returns_valid_order():
+    ticks = iter(range(1000))
+    search = OrderLocalSearch(3.0, clock=lambda: next(ticks))
+    starts, ends = _random_strokes(100, seed=4)
+    order, _ = search.improve(starts, ends)
+    assert sorted(order.tolist()) == list(range(100))
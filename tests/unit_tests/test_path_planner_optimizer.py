@@ -36,3 +36,42 @@ def test_reorder_strokes_by_length_and_proximity(make_trazo):
     reord_starts = [(s.x, s.y) for s in starts[1:]]
     assert reord_starts == [(0,0), (10,0), (50,50)] or reord_starts == [(10,0), (0,0), (50,50)]
     assert metrics["strategy"] == "length+proximity-dynamic"
+
+
+def _reference_order(strokes):
+    """ Orden de referencia: misma heurística evaluada trazo a trazo en Python (implementación histórica). """
+    optimizer = PathPlannerOptimizer()
+    max_length = max(length for _, _, length in strokes) or 1.0
+    remaining = list(range(1, len(strokes)))
+    order = [0]
+    last_pos = strokes[0][1]
+    n = len(strokes) - 1
+    for k in range(1, n + 1):
+        alpha = 1 - (k / (n + 1))
+        beta = k / (n + 1)
+        dists = [optimizer._distance(last_pos, strokes[i][0]) for i in remaining]
+        max_dist = max(dists) or 1.0
+        scores = [alpha * (strokes[i][2] / max_length) - beta * (d / max_dist) for i, d in zip(remaining, dists)]
+        best = remaining[scores.index(max(scores))]
+        order.append(best)
+        remaining.remove(best)
+        last_pos = strokes[best][1]
+    return order
+
+
+def test_vectorized_order_matches_reference(make_trazo):
+    import random
+    rnd = random.Random(11)
+    strokes, commands = [], []
+    for _ in range(400):
+        x, y = rnd.randint(0, 40), rnd.randint(0, 40)
+        # Coordenadas enteras y longitudes repetidas para forzar empates
+        points = [(x, y), (x + rnd.choice([1, 2, 3]), y)]
+        strokes.append((points[0], points[-1], float(points[-1][0] - points[0][0])))
+        commands.extend(make_trazo(points))
+    # El optimizador deja los G1 del último trazo en el bloque final: ese trazo cuenta como un punto
+    strokes[-1] = (strokes[-1][0], strokes[-1][0], 0.0)
+    optimized, _ = PathPlannerOptimizer().optimize(commands)
+    rapid_starts = [(c.x, c.y) for c in optimized if isinstance(c, MoveCommand) and c.rapid]
+    expected = [strokes[i][0] for i in _reference_order(strokes)]
+    assert rapid_starts == expected
@@ -0,0 +1,55 @@
+from domain.entities.point import Point
+from domain.gcode.pen_state_machine import PenStateMachine
+from domain.gcode.gcode_border_rectangle_detector import GCodeBorderRectangleDetector
+from adapters.output.gcode_builder_helper import GCodeBuilderHelper
+from adapters.output.gcode_generation_config_helper import GcodeGenerationConfigHelper
+from infrastructure.adapters.reference_marks_generator import ReferenceMarkBlockGenerator
+
+
+def test_transitions_carry_their_dwell_and_redundant_toggles_are_skipped():
+    pen = PenStateMachine("M3", "M5", down_dwell_s=0.1, up_dwell_s=0.2)
+    assert pen.up() == ("M5", 0.2)
+    assert pen.up() is None
+    assert pen.down() == ("M3", 0.1) and pen.is_down
+    assert pen.down() is None
+    assert pen.toggles_skipped == 2
+
+
+def test_builder_emits_one_dwell_per_pen_change():
+    strokes = [[Point(0, 0), Point(1, 0)], [Point(5, 0), Point(6, 0)]]
+    feed_fn = lambda prev, curr, nxt, future: 1000.0
+    lines, _ = GCodeBuilderHelper("M3", "M5", 350, pen_down_dwell_ms=100, pen_up_dwell_ms=200).build(strokes, feed_fn)
+    assert lines == ["G0 X0.000 Y0.000", "M3", "G4 P0.100", "G1 X1.000 Y0.000 F1000", "M5", "G4 P0.200",
+                     "G0 X5.000 Y0.000", "M3", "G4 P0.100", "G1 X6.000 Y0.000 F1000", "M5", "G4 P0.200",
+                     "G0 X0.000 Y0.000", "(End)"]
+    # Sin trazos la lapicera nunca baja: no hay M5 ni pausas
+    assert GCodeBuilderHelper("M3", "M5", 350).build([], feed_fn)[0] == ["G0 X0.000 Y0.000", "G0 X0.000 Y0.000", "(End)"]
+    # Pausa 0: la transición queda sin G4
+    lines, _ = GCodeBuilderHelper("M3", "M5", 350, pen_down_dwell_ms=0).build(strokes[:1], feed_fn)
+    assert lines[1:3] == ["M3", "G1 X1.000 Y0.000 F1000"]
+
+
+def test_border_detector_accepts_dwells_only_after_pen_changes():
+    lines = ["G0 X0.000 Y0.000", "G0 X0.000 Y250.000", "M3", "G4 P0.350", "G1 X0.000 Y0.000 F4000",
+             "G1 X155.000 Y0.000", "G1 X155.000 Y250.000", "G1 X0.000 Y250.000", "M5", "G4 P0.350",
+             "G0 X10.000 Y10.000"]
+    assert GCodeBorderRectangleDetector().detect_border_pattern(lines) == list(range(10))
+
+
+def test_config_helper_pen_dwells_fall_back_to_dwell_ms():
+    assert GcodeGenerationConfigHelper.get_pen_dwells_ms({}, 350) == (350, 350)
+    assert GcodeGenerationConfigHelper.get_pen_dwells_ms({"PEN_DOWN_DWELL_MS": 120, "PEN_UP_DWELL_MS": None}, 350) == (120.0, 350)
+
+
+def test_reference_marks_share_pen_state_and_skip_orphan_dwells():
+    class DummyConfig:
+        def get(self, k, d=None):
+            return [100.0, 50.0] if k == 'TARGET_WRITE_AREA_MM' else d
+    pen = PenStateMachine("M3", "M5", 0.1, 0.2)
+    pen.up()
+    lines = ReferenceMarkBlockGenerator(1000, "M3", "M5", 350, config=DummyConfig(), pen=pen).generate(100.0, 50.0)
+    # Cuatro marcas de tres trazos: un M3 y un M5 por trazo, cada uno con su pausa
+    assert lines.count("M3") == lines.count("G4 P0.1") == 12
+    assert lines.count("M5") == lines.count("G4 P0.2") == 12
+    disabled = ReferenceMarkBlockGenerator(1000, "M3", "M5", 350, enable_marks=False, config=DummyConfig()).generate(100.0, 50.0)
+    assert not any(line.startswith(("M3", "M5", "G4")) for line in disabled)
@@ -0,0 +1,54 @@
+"""
+Tests de las derivadas y curvatura analíticas (SegmentCurvature) y de su uso en sample_bezier.
+"""
+import random
+import numpy as np
+from svgpathtools import Line, QuadraticBezier, CubicBezier, Arc
+from adapters.input.segment_sampling_strategies import sample_bezier, estimate_curvature
+from domain.geometry.segment_curvature import SegmentCurvature
+from tests.mocks.mock_geometry import MockSegment
+
+
+def _random_curves(seed):
+    rnd = random.Random(seed)
+    def c():
+        return complex(rnd.uniform(-30, 30), rnd.uniform(-30, 30))
+    curves = []
+    for _ in range(10):
+        curves.append(QuadraticBezier(c(), c(), c()))
+        curves.append(CubicBezier(c(), c(), c(), c()))
+        curves.append(Arc(c(), complex(rnd.uniform(5, 30), rnd.uniform(5, 30)), rnd.uniform(0, 180),
+                          rnd.random() < 0.5, rnd.random() < 0.5, c()))
+    return curves
+
+
+def test_derivatives_and_curvature_match_svgpathtools():
+    ts = np.linspace(0.01, 0.99, 25)
+    for seg in _random_curves(1):
+        d1, d2 = SegmentCurvature.derivatives(seg, ts)
+        assert np.allclose(d1, [seg.derivative(t) for t in ts], rtol=1e-9, atol=1e-9)
+        assert np.allclose(d2, [seg.derivative(t, 2) for t in ts], rtol=1e-9, atol=1e-9)
+        assert np.allclose(SegmentCurvature.curvature(seg, ts), [abs(seg.curvature(t)) for t in ts], rtol=1e-9)
+
+
+def test_circle_and_line_curvature():
+    circle_arc = Arc(0j, 5 + 5j, 0, False, True, 10 + 0j)
+    assert np.allclose(SegmentCurvature.curvature(circle_arc, [0.0, 0.5, 1.0]), 0.2)
+    assert np.all(SegmentCurvature.curvature(Line(0j, 3 + 4j), [0.2, 0.8]) == 0)
+    assert abs(estimate_curvature(circle_arc, 0.3) - 0.2) < 1e-12
+
+
+def test_generic_segments_use_finite_differences():
+    assert abs(estimate_curvature(MockSegment(10, (0, 0), (10, 0)), 0.5)) < 1e-6
+
+
+def test_sample_bezier_refines_high_curvature_spans():
+    flat = CubicBezier(0j, 10 + 0.1j, 20 - 0.1j, 30 + 0j)
+    bent = CubicBezier(0j, 30 + 30j, -30 + 30j, 0.5 + 0j)
+    flat_points = sample_bezier(flat, max_segment_length=5.0, curvature_factor=1.0)
+    bent_points = sample_bezier(bent, max_segment_length=5.0, curvature_factor=10.0)
+    assert (flat_points[0].x, flat_points[-1].x) == (0.0, 30.0)
+    assert abs(bent_points[-1].x - 0.5) < 1e-12
+    spans = max(int(bent.length() / 5.0), 2)
+    assert len(bent_points) > spans + 1
+    assert len(flat_points) == max(int(flat.length() / 5.0), 2) + 1
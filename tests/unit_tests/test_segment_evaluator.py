@@ -0,0 +1,67 @@
+"""
+Tests de la evaluación vectorizada de segmentos (SegmentEvaluator) y del muestreo en bloque de PathSampler.
+"""
+import math
+import random
+import numpy as np
+from svgpathtools import Path, Line, QuadraticBezier, CubicBezier, Arc
+from adapters.input.path_sampler import PathSampler
+from domain.geometry.segment_evaluator import SegmentEvaluator
+from tests.mocks.mock_geometry import MockSegment
+
+
+def _random_segments(seed, n=50):
+    rnd = random.Random(seed)
+    def c():
+        return complex(rnd.uniform(-50, 50), rnd.uniform(-50, 50))
+    segments = []
+    for _ in range(n):
+        segments.append(Line(c(), c()))
+        segments.append(QuadraticBezier(c(), c(), c()))
+        segments.append(CubicBezier(c(), c(), c(), c()))
+        radius = complex(rnd.uniform(1, 40), rnd.uniform(1, 40))
+        segments.append(Arc(c(), radius, rnd.uniform(0, 180), rnd.random() < 0.5, rnd.random() < 0.5, c()))
+    segments.append(Arc(0j, 10 + 10j, 0, False, True, 20 + 0j))
+    return segments
+
+
+def _legacy_sample(path, step):
+    " Muestreo escalar de referencia: seg.point(t) para cada t. "
+    points = []
+    for seg in path:
+        n = max(1, int(math.ceil(seg.length() / step)))
+        points.extend((seg.point(t).real, seg.point(t).imag) for t in np.linspace(0, 1, n + 1))
+    return np.array(points)
+
+
+def test_evaluate_matches_segment_point():
+    segments = _random_segments(1) + [MockSegment(4, (0, 0), (4, 0))]
+    rnd = random.Random(2)
+    seg_index = np.array([rnd.randrange(len(segments)) for _ in range(2000)])
+    ts = np.array([rnd.random() for _ in range(2000)])
+    expected = np.array([(segments[i].point(t).real, segments[i].point(t).imag) for i, t in zip(seg_index, ts)])
+    assert np.allclose(SegmentEvaluator.evaluate(segments, seg_index, ts), expected, rtol=0, atol=1e-9)
+
+
+def test_lengths_match_segment_length():
+    segments = _random_segments(3)
+    expected = np.array([seg.length() for seg in segments])
+    assert np.allclose(SegmentEvaluator.lengths(segments), expected, rtol=1e-7)
+
+
+def test_sample_array_matches_scalar_sampling():
+    paths = [Path(*_random_segments(4, n=5)), Path(Line(0j, 3 + 4j))]
+    sampler = PathSampler(0.7)
+    for path in paths:
+        assert np.allclose(sampler.sample_array(path), _legacy_sample(path, 0.7), rtol=0, atol=1e-9)
+
+
+def test_sample_many_offsets_split_paths():
+    paths = [Path(*_random_segments(5, n=2)), [], Path(Line(0j, 10 + 0j))]
+    sampler = PathSampler(1.0)
+    buffer, offsets = sampler.sample_many(paths)
+    assert offsets.tolist()[0] == 0 and offsets[-1] == len(buffer)
+    for i, path in enumerate(paths):
+        chunk = buffer[offsets[i]:offsets[i + 1]]
+        assert np.array_equal(chunk, sampler.sample_array(path).reshape(-1, 2))
+    assert offsets[1] == offsets[2]
@@ -0,0 +1,107 @@
+"""
+Tests del escalado en una sola pasada: bbox exacto, ajuste de escala, muestreo a resolución de máquina
+y transformaciones aplicadas en bloque.
+"""
+from svgpathtools import Path, Line, CubicBezier
+from adapters.input.path_sampler import PathSampler
+from adapters.output.gcode_generator_adapter import GCodeGeneratorAdapter
+from adapters.output.sample_transform_pipeline import SampleTransformPipeline
+from domain.geometry.bounding_box_calculator import BoundingBoxCalculator
+from domain.geometry.scale_manager import ScaleManager
+from domain.services.path_transform_strategies import VerticalFlipStrategy
+from infrastructure.transform_manager import TransformManager
+from tests.mocks.mock_strategy import DummyStrategy
+
+
+class CountingSampler(PathSampler):
+    " PathSampler que cuenta las llamadas a sample_many (compartido entre copias de for_scale). "
+    def __init__(self, step, calls=None):
+        super().__init__(step)
+        self.calls = calls if calls is not None else []
+
+    def sample_many(self, paths):
+        self.calls.append((self.step, len(paths)))
+        return super().sample_many(paths)
+
+    def for_scale(self, scale):
+        return CountingSampler(self.step / scale, self.calls)
+
+
+class DummyI18n:
+    def get(self, key, default=None, **_kwargs):
+        return default or key
+
+
+class DummyLogger:
+    def __init__(self):
+        self.infos = []
+    def info(self, msg, *a, **k):
+        self.infos.append(msg)
+    def debug(self, *a, **k): pass
+    def warning(self, *a, **k): pass
+    def error(self, *a, **k): pass
+    def exception(self, *a, **k): pass
+
+
+class DummyConfig:
+    def __init__(self, area):
+        self.area = area
+    def get(self, key, default=None):
+        if key in ("TARGET_WRITE_AREA_MM", "PLOTTER_MAX_AREA_MM"):
+            return self.area
+        return default
+
+
+def test_exact_bbox_includes_curve_extremes():
+    # El extremo de la curva (y = 0.75) cae entre muestras; el bbox exacto lo incluye
+    path = Path(CubicBezier(0, 1j, 1 + 1j, 1))
+    xmin, xmax, ymin, ymax = BoundingBoxCalculator.get_exact_bbox([path])
+    assert (xmin, xmax, ymin) == (0.0, 1.0, 0.0)
+    assert abs(ymax - 0.75) < 1e-12
+    assert BoundingBoxCalculator.get_exact_bbox([]) == (0.0, 0.0, 0.0, 0.0)
+
+
+def test_fit_scale_matches_sequential_adjustments():
+    paths = [Path(Line(0, 400 + 100j))]
+    manager = ScaleManager()
+    expected = manager.adjust_scale_for_max_width(paths, manager.adjust_scale_for_max_height(paths, 2.0, 50.0), 180.0)
+    fitted = manager.fit_scale(BoundingBoxCalculator.get_exact_bbox(paths), 2.0, 180.0, 50.0)
+    assert abs(fitted - expected) < 1e-12
+    assert abs(fitted - 0.45) < 1e-12
+
+
+def test_path_sampler_for_scale_keeps_step_in_output_units():
+    sampler = PathSampler(0.5).for_scale(0.1)
+    assert abs(sampler.step - 5.0) < 1e-12
+    # 100 unidades SVG escaladas por 0.1 = 10 mm, muestreadas cada 0.5 mm
+    assert len(list(sampler.sample(Path(Line(0, 100))))) == 21
+
+
+def test_pipeline_applies_transforms_on_arrays_and_reports_bounds():
+    path = Path(Line(0, 4 + 2j))
+    manager = TransformManager([DummyStrategy(), VerticalFlipStrategy(5.0)])
+    pipeline = SampleTransformPipeline(PathSampler(1.0), manager, 2.0)
+    points = pipeline.process([path])[0]
+    expected = []
+    for pt in PathSampler(1.0).sample(path):
+        x, y = manager.apply(pt.x, pt.y)
+        expected.append((x * 2.0, y * 2.0))
+    assert [(p.x, p.y) for p in points] == expected
+    xs, ys = zip(*expected)
+    assert pipeline.bounds == (min(xs), max(xs), min(ys), max(ys))
+
+
+def test_generate_samples_once_at_machine_resolution():
+    # Dibujo de 1000 x 500 unidades: cabe en 200 x 100 mm con escala 0.2
+    paths = [Path(Line(0j, 1000 + 0j)), Path(Line(1000 + 500j, 500j))]
+    sampler = CountingSampler(1.0)
+    logger = DummyLogger()
+    generator = GCodeGeneratorAdapter(
+        path_sampler=sampler, feed=1000, cmd_down="M3", cmd_up="M5", step_mm=1.0, dwell_ms=0,
+        max_height_mm=100.0, config=DummyConfig([200.0, 100.0]), logger=logger, i18n=DummyI18n()
+    )
+    generator.generate(paths, {})
+    assert len(sampler.calls) == 1
+    step, count = sampler.calls[0]
+    assert abs(step - 5.0) < 1e-12 and count == len(paths)
+    assert any("Escala aplicada: 0.2," in msg for msg in logger.infos)
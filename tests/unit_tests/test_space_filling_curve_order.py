@@ -0,0 +1,69 @@
+"""
+Tests unitarios para SpaceFillingCurveOrder (orden por curva de Hilbert / Morton).
+"""
+import random
+import numpy as np
+import pytest
+from domain.services.optimization.space_filling_curve_order import SpaceFillingCurveOrder
+from domain.services.optimization.trajectory_optimizer import TrajectoryOptimizer
+
+
+class DummyPath:
+    def __init__(self, start, end):
+        self.start_point = start
+        self.end_point = end
+
+
+def _travel(paths):
+    return sum(abs(b.start_point - a.end_point) for a, b in zip(paths, paths[1:]))
+
+
+def test_hilbert_index_visits_adjacent_cells():
+    bits = 4
+    side = 1 << bits
+    xs, ys = np.meshgrid(np.arange(side), np.arange(side))
+    xs, ys = xs.ravel(), ys.ravel()
+    index = SpaceFillingCurveOrder.hilbert_index(xs, ys, bits)
+    assert sorted(index.tolist()) == list(range(side * side))
+    order = np.argsort(index)
+    steps = np.abs(np.diff(xs[order])) + np.abs(np.diff(ys[order]))
+    assert (steps == 1).all()
+
+
+def test_morton_index_interleaves_bits():
+    index = SpaceFillingCurveOrder.morton_index(np.array([0, 1, 0, 1, 2, 3]), np.array([0, 0, 1, 1, 0, 3]))
+    assert index.tolist() == [0, 1, 2, 3, 4, 15]
+
+
+@pytest.mark.parametrize("curve", SpaceFillingCurveOrder.CURVES)
+def test_order_is_permutation_and_reduces_travel(curve):
+    rnd = random.Random(3)
+    paths = []
+    for _ in range(2000):
+        start = complex(rnd.uniform(0, 300), rnd.uniform(0, 200))
+        paths.append(DummyPath(start, start + complex(rnd.uniform(-1, 1), rnd.uniform(-1, 1))))
+    optimizer = SpaceFillingCurveOrder(curve=curve)
+    ordered = optimizer.optimize_order(paths)
+    assert sorted(map(id, ordered)) == sorted(map(id, paths))
+    assert abs(optimizer.metrics["travel_before"] - _travel(ordered)) < 1e-6
+    assert _travel(ordered) < 0.2 * _travel(paths)
+
+
+def test_centroid_key_uses_segment_vertices():
+    from svgpathtools import Path, Line
+    # Cuadrado cerrado que empieza lejos de su centro
+    square = Path(Line(0j, 10 + 0j), Line(10 + 0j, 10 + 10j), Line(10 + 10j, 10j), Line(10j, 0j))
+    centroid = SpaceFillingCurveOrder()._vertex_mean([seg.start for seg in square], np.array([0.0, 0.0]))
+    assert centroid.tolist() == [5.0, 5.0]
+
+
+def test_invalid_arguments_and_empty_input():
+    with pytest.raises(ValueError):
+        SpaceFillingCurveOrder(curve="peano")
+    with pytest.raises(ValueError):
+        SpaceFillingCurveOrder(key="end")
+    assert SpaceFillingCurveOrder().optimize_order([object()]) == []
+
+
+def test_is_a_trajectory_optimizer_strategy():
+    assert isinstance(SpaceFillingCurveOrder(), TrajectoryOptimizer)
@@ -0,0 +1,82 @@
+import pytest
+
+from domain.entities.point import Point
+from domain.compression_config import CompressionConfig
+from domain.compression_metrics import CompressionMetrics
+from domain.gcode.gcode_border_filter import GCodeBorderFilter
+from domain.gcode.gcode_border_rectangle_detector import GCodeBorderRectangleDetector
+from domain.services.compression.line_compressor import LineCompressor
+from adapters.output.gcode_builder_helper import GCodeBuilderHelper
+from infrastructure.factories.gcode_compression_factory import create_gcode_compression_service
+from utils.gcode_writer import escribir_gcode
+from utils.gcode_offset import aplicar_offset_y_a_gcode, iterar_offset_y_a_gcode
+
+
+def _strokes(count):
+    return [[Point(k, 0), Point(k, 1), Point(k + 0.5, 1)] for k in range(count)]
+
+
+def test_iter_lines_matches_build_and_yields_in_chunks():
+    helper = GCodeBuilderHelper(cmd_down="M3", cmd_up="M5", dwell_ms=100)
+    helper.CHUNK_COMMANDS = 20
+    feed_fn = lambda prev, curr, nxt, future: 1000.0
+    lines, metrics = helper.build(_strokes(30), feed_fn)
+    assert metrics == {}
+    # Con bloques de 20 comandos el programa sale en varios tramos, idénticos a build()
+    assert list(helper.iter_lines(_strokes(30), feed_fn)) == lines
+    assert lines[-1] == "(End)"
+
+
+def test_line_compressor_stream_matches_compress():
+    lines = ["G0 X0.000 Y0.000", "G1 X1.000 Y0.000 F1000.0", "G1 X2.000 Y0.0001", "G1 X3.000 Y0.000",
+             "G1 X3.000 Y1.000", "M5", "G1 X4.000 Y1.000", "G1 X5.000 Y1.000 F800"]
+    compressed, metrics = LineCompressor().compress(lines, 0.01)
+    stream_metrics = CompressionMetrics(original_lines=0, compressed_lines=0)
+    assert list(LineCompressor().compress_stream(iter(lines), 0.01, stream_metrics)) == compressed
+    assert compressed[1] == "G1 X3.000 Y0.000 F1000"
+    assert stream_metrics.redundancies_removed == metrics.redundancies_removed == 3
+
+
+def test_compression_service_stream_fills_metrics_and_fails_lazily():
+    service = create_gcode_compression_service()
+    lines = ["G1 X0.000 Y0.000", "G1 X1.000 Y0.000", "G1 X2.000 Y0.000", "M5"]
+    expected, expected_metrics = service.compress(lines, CompressionConfig())
+    stream, metrics = service.compress_stream(iter(lines), CompressionConfig())
+    assert metrics.original_lines == 0
+    assert list(stream) == expected
+    assert (metrics.original_lines, metrics.compressed_lines) == (expected_metrics.original_lines, expected_metrics.compressed_lines)
+    stream, _ = service.compress_stream(iter(["G0 X0 Y0", "BASURA"]), CompressionConfig())
+    assert next(stream) == "G0 X0 Y0"
+    with pytest.raises(ValueError):
+        list(stream)
+    with pytest.raises(ValueError):
+        list(service.compress_stream(iter([]), CompressionConfig())[0])
+
+
+def test_border_filter_lines_matches_filter():
+    border = ["G0 X0 Y0", "G4 P0.1", "G0 X0 Y0", "G4 P0.1", "M3", "G4 P0.1",
+              "G1 X10 Y0", "G1 X10 Y10", "G1 X0 Y10", "G1 X0 Y0", "G4 P0.1", "M5", "G4 P0.1"]
+    body = ["G0 X1 Y1", "G91\nG1 X1.000 Y0.000\nG90", "M5"] * 10
+    border_filter = GCodeBorderFilter(GCodeBorderRectangleDetector())
+    expected = border_filter.filter("\n".join(border + body)).split("\n")
+    assert list(border_filter.filter_lines(iter(border + body))) == expected
+    assert expected[0] == "G0 X1 Y1"
+
+
+def test_escribir_gcode_streams_to_file_and_keeps_target_on_error(tmp_path):
+    target = tmp_path / "out.gcode"
+    lines = [f"G1 X{k}.000 Y0.000" for k in range(25)]
+    assert escribir_gcode(target, iter(lines)) == 25
+    assert target.read_text(encoding="utf-8") == "\n".join(lines)
+    def failing():
+        yield "G0 X0 Y0"
+        raise ValueError("flujo inválido")
+    with pytest.raises(ValueError):
+        escribir_gcode(target, failing())
+    assert target.read_text(encoding="utf-8") == "\n".join(lines)
+    assert not (tmp_path / "out.gcode.part").exists()
+
+
+def test_iterar_offset_y_matches_list_version():
+    lines = ["G0 X1.000 Y2.000", "G2 X1 Y1 I0 J1", "M5"]
+    assert list(iterar_offset_y_a_gcode(iter(lines), 10.0)) == aplicar_offset_y_a_gcode(lines, 10.0)
@@ -0,0 +1,104 @@
+"""
+Tests unitarios para StrokeBuffer (geometría muestreada en arrays contiguos).
+"""
+import numpy as np
+import pytest
+from svgpathtools import Path, Line, CubicBezier
+
+from domain.entities.point import Point
+from domain.entities.stroke_buffer import StrokeBuffer, PointArray
+from domain.ports.path_sampler_port import PathSamplerPort
+from domain.ports.transform_manager_port import NullTransformManager
+from domain.services.path_transform_strategies import VerticalFlipStrategy
+from infrastructure.transform_manager import TransformManager
+from adapters.input.path_sampler import PathSampler
+from adapters.output.sample_transform_pipeline import SampleTransformPipeline
+from adapters.output.gcode_builder_helper import GCodeBuilderHelper
+
+
+class ListSampler(PathSamplerPort):
+    " Muestreador mínimo: solo implementa sample() (usa el sample_buffer por defecto del puerto). "
+    def sample(self, path):
+        for seg in path:
+            yield Point(seg.start.real, seg.start.imag)
+            yield Point(seg.end.real, seg.end.imag)
+
+
+def test_stroke_buffer_round_trip_and_views():
+    strokes = [[Point(0, 0), Point(1, 2)], [], [Point(3, 4)]]
+    buffer = StrokeBuffer.from_point_lists(strokes)
+    assert len(buffer) == 3
+    assert buffer.point_count == 3
+    assert buffer.coords.dtype == np.float64 and buffer.coords.flags['C_CONTIGUOUS']
+    assert buffer.offsets.tolist() == [0, 2, 2, 3]
+    assert isinstance(buffer[0], PointArray)
+    assert buffer[0][1] == Point(1.0, 2.0)
+    assert len(buffer[1]) == 0
+    assert list(buffer[-1]) == [Point(3.0, 4.0)]
+    assert buffer.to_point_lists() == strokes
+    assert buffer.bounds() == (0.0, 3.0, 0.0, 4.0)
+    assert StrokeBuffer.empty(2).bounds() is None
+
+
+def test_stroke_buffer_rejects_inconsistent_offsets():
+    with pytest.raises(ValueError):
+        StrokeBuffer(np.zeros((3, 2)), [0, 2])
+    with pytest.raises(ValueError):
+        StrokeBuffer(np.zeros((3, 2)), [0, 3, 2, 3])
+    with pytest.raises(IndexError):
+        StrokeBuffer.empty(1)[1]
+
+
+def test_scaled_keeps_strokes():
+    buffer = StrokeBuffer.from_arrays([np.array([[1.0, 2.0], [3.0, 4.0]]), np.array([[5.0, 6.0]])])
+    scaled = buffer.scaled(0.5)
+    assert scaled.offsets is buffer.offsets
+    assert scaled.coords.tolist() == [[0.5, 1.0], [1.5, 2.0], [2.5, 3.0]]
+
+
+def test_sample_buffer_matches_sample_per_path():
+    paths = [Path(Line(0j, 10 + 0j)), Path(), Path(CubicBezier(0j, 5j, 10 + 5j, 10 + 0j))]
+    buffer = PathSampler(0.7).sample_buffer(paths)
+    assert len(buffer) == len(paths)
+    for stroke, path in zip(buffer, paths):
+        assert list(stroke) == list(PathSampler(0.7).sample(path))
+    # Implementación por defecto del puerto
+    default = ListSampler().sample_buffer(paths)
+    assert default.offsets.tolist() == [0, 2, 2, 4]
+
+
+def test_transform_managers_apply_buffer():
+    buffer = StrokeBuffer.from_arrays([np.array([[1.0, 1.0], [2.0, 3.0]])])
+    assert NullTransformManager().apply_buffer(buffer) is buffer
+    flipped = TransformManager([VerticalFlipStrategy(5.0)]).apply_buffer(buffer)
+    assert flipped.coords.tolist() == [[1.0, 9.0], [2.0, 7.0]]
+    assert flipped.offsets is buffer.offsets
+
+
+def test_pipeline_returns_stroke_buffer():
+    pipeline = SampleTransformPipeline(ListSampler(), NullTransformManager(), 2.0)
+    result = pipeline.process([Path(Line(1 + 1j, 3 + 1j))])
+    assert isinstance(result, StrokeBuffer)
+    assert result.coords.tolist() == [[2.0, 2.0], [6.0, 2.0]]
+    assert pipeline.bounds == (2.0, 6.0, 2.0, 2.0)
+
+
+def test_builder_accepts_buffer_and_point_lists_identically():
+    strokes = [[Point(0, 0), Point(0, 0), Point(1, 0), Point(1, 1)], [], [Point(5, 5), Point(6, 5)]]
+    helper = GCodeBuilderHelper(cmd_down="M3", cmd_up="M5", dwell_ms=100)
+    feed_fn = lambda prev, curr, nxt, future: 1000.0
+    from_lists, _ = helper.build(strokes, feed_fn)
+    from_buffer, _ = helper.build(StrokeBuffer.from_point_lists(strokes), feed_fn)
+    assert from_lists == from_buffer
+    # El punto repetido del primer trazo se descarta
+    assert sum(1 for line in from_buffer if line.startswith("G1")) == 3
+
+
+def test_snapped_rounds_to_grid_and_drops_repeated_points():
+    buffer = StrokeBuffer.from_arrays([np.array([[0.0, 0.0], [0.0004, -0.0004], [1.0002, 0.0], [1.0004, 0.0]]),
+                                       np.empty((0, 2)), np.array([[1.0, 0.0], [1.0, 0.0001]])])
+    snapped = buffer.snapped(3)
+    assert snapped.offsets.tolist() == [0, 2, 2, 3]
+    assert snapped.coords.tolist() == [[0.0, 0.0], [1.0, 0.0], [1.0, 0.0]]
+    # Sin -0.0 en la grilla
+    assert not np.signbit(snapped.coords).any()
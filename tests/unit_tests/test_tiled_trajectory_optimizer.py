@@ -0,0 +1,119 @@
+"""
+Tests unitarios para TiledTrajectoryOptimizer (orden jerárquico por tiles).
+"""
+import random
+import pytest
+from domain.services.optimization.tiled_trajectory_optimizer import TiledTrajectoryOptimizer
+
+
+class DummyPath:
+    def __init__(self, start, end):
+        self.start_point = start
+        self.end_point = end
+
+
+def _grid_paths(n, seed, cols=3, rows=2, tile=100.0):
+    " Trazos dentro de tiles de `tile` mm; las esquinas fijan el bbox en (0, 0)-(cols*tile, rows*tile). "
+    rnd = random.Random(seed)
+    paths = [DummyPath(0j, 1 + 0j), DummyPath(complex(cols * tile, rows * tile), complex(cols * tile - 1, rows * tile))]
+    for _ in range(n):
+        cx = (rnd.randrange(cols) + 0.5) * tile
+        cy = (rnd.randrange(rows) + 0.5) * tile
+        start = complex(cx + rnd.uniform(-40, 40), cy + rnd.uniform(-40, 40))
+        paths.append(DummyPath(start, start + complex(rnd.uniform(-2, 2), rnd.uniform(-2, 2))))
+    return paths
+
+
+def _tile_of(path, tile=100.0):
+    return min(int(path.start_point.real // tile), 2), min(int(path.start_point.imag // tile), 1)
+
+
+def _runs(ordered):
+    tiles = [_tile_of(p) for p in ordered]
+    return [t for k, t in enumerate(tiles) if k == 0 or t != tiles[k - 1]]
+
+
+@pytest.mark.parametrize("tile_order", TiledTrajectoryOptimizer.TILE_ORDERS)
+def test_visits_each_tile_once(tile_order):
+    paths = _grid_paths(1500, seed=1)
+    optimizer = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=100, tile_order=tile_order)
+    ordered = optimizer.optimize_order(paths)
+    assert sorted(map(id, ordered)) == sorted(map(id, paths))
+    runs = _runs(ordered)
+    assert len(runs) == len(set(runs)) == optimizer.metrics["tiles"] == 6
+
+
+def test_serpentine_alternates_row_direction():
+    paths = _grid_paths(1500, seed=2)
+    ordered = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=100).optimize_order(paths)
+    assert _runs(ordered) == [(0, 0), (1, 0), (2, 0), (2, 1), (1, 1), (0, 1)]
+
+
+def test_tile_size_follows_fit_scale():
+    # Dibujo de 30x20 unidades que se escalará a 300x200 mm: tiles de 100 mm = 10 unidades
+    paths = [DummyPath(p.start_point / 10, p.end_point / 10) for p in _grid_paths(300, seed=4)]
+    optimizer = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=100)
+    optimizer.optimize_order(paths)
+    assert optimizer.metrics["tiles"] == 6
+
+
+def test_progress_and_travel():
+    paths = _grid_paths(2000, seed=3)
+    calls = []
+    optimizer = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=50)
+    optimizer.optimize_order(paths, progress_callback=lambda c, t: calls.append((c, t)))
+    assert calls[-1] == (2002, 2002)
+    # Mucho menos que el orden de entrada (aleatorio)
+    random_travel = sum(abs(b.start_point - a.end_point) for a, b in zip(paths, paths[1:]))
+    assert optimizer.metrics["travel_before"] < 0.1 * random_travel
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        TiledTrajectoryOptimizer(tile_order="spiral")
+    with pytest.raises(ValueError):
+        TiledTrajectoryOptimizer(tile_mm=0)
+    assert TiledTrajectoryOptimizer().optimize_order([]) == []
+
+
+def test_each_tile_starts_nearest_to_the_previous_tile_exit():
+    paths = _grid_paths(600, seed=6)
+    ordered = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=100).optimize_order(paths)
+    tiles = [_tile_of(p) for p in ordered]
+    for k in range(1, len(ordered)):
+        if tiles[k] != tiles[k - 1]:
+            members = [p for p, t in zip(ordered, tiles) if t == tiles[k]]
+            exit_point = ordered[k - 1].end_point
+            assert ordered[k] is min(members, key=lambda p: abs(p.start_point - exit_point))
+
+
+def test_pool_failure_falls_back_to_serial_and_is_reported(monkeypatch):
+    def broken_pool(*args, **kwargs):
+        raise OSError("sin procesos")
+    monkeypatch.setattr("domain.services.optimization.tiled_trajectory_optimizer.ProcessPoolExecutor", broken_pool)
+    paths = _grid_paths(300, seed=7)
+    serial = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=100).optimize_order(paths)
+    optimizer = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=100, workers=2)
+    assert optimizer.optimize_order(paths) == serial
+    assert "sin procesos" in optimizer.metrics["parallel_fallback"]
+
+
+def test_process_pool_orders_each_tile_once_from_the_previous_tile_center():
+    paths = _grid_paths(300, seed=5)
+    serial = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=100)
+    serial_order = serial.optimize_order(paths)
+    optimizer = TiledTrajectoryOptimizer(area_mm=(300, 200), tile_mm=100, workers=2)
+    pooled = optimizer.optimize_order(paths)
+    assert "parallel_fallback" not in optimizer.metrics
+    # El pool devuelve copias de los paths: se comparan por punto de inicio
+    key = lambda p: (p.start_point.real, p.start_point.imag)
+    assert _runs(pooled) == _runs(serial_order) and sorted(map(key, pooled)) == sorted(map(key, paths))
+    tiles = [_tile_of(p) for p in pooled]
+    for k in range(1, len(pooled)):
+        if tiles[k] != tiles[k - 1]:
+            members = [p for p, t in zip(pooled, tiles) if t == tiles[k]]
+            col, row = tiles[k - 1]
+            center = complex((col + 0.5) * 100, (row + 0.5) * 100)
+            assert pooled[k].start_point == min(members, key=lambda p: abs(p.start_point - center)).start_point
+    # Solo cambian las uniones entre tiles
+    assert optimizer.metrics["travel_before"] < 1.1 * serial.metrics["travel_before"]
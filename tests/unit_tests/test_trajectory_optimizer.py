@@ -0,0 +1,138 @@
+"""
+Tests unitarios para TrajectoryOptimizer y su índice espacial (SpatialGridIndex).
+"""
+import random
+from domain.services.optimization.trajectory_optimizer import TrajectoryOptimizer
+from domain.services.optimization.spatial_grid_index import SpatialGridIndex
+
+
+class DummyPath:
+    def __init__(self, start, end):
+        self.start_point = start
+        self.end_point = end
+
+
+def _greedy_reference(paths):
+    " Implementación lineal O(n²) de referencia (comportamiento histórico). "
+    optimizer = TrajectoryOptimizer()
+    remaining = paths[1:]
+    current = paths[0]
+    ordered = [current]
+    while remaining:
+        last = current.end_point
+        idx, current = min(enumerate(remaining), key=lambda x: optimizer._distance(last, x[1].start_point))
+        ordered.append(current)
+        remaining.pop(idx)
+    return ordered
+
+
+def _random_paths(n, seed, clustered=False):
+    rnd = random.Random(seed)
+    def point():
+        if clustered:
+            cx, cy = rnd.choice([(10, 10), (250, 180), (100, 50)])
+            return complex(rnd.gauss(cx, 2), rnd.gauss(cy, 2))
+        return complex(rnd.uniform(0, 300), rnd.uniform(0, 200))
+    return [DummyPath(point(), point()) for _ in range(n)]
+
+
+def test_matches_linear_greedy_uniform():
+    paths = _random_paths(800, seed=1)
+    assert TrajectoryOptimizer().optimize_order(paths) == _greedy_reference(paths)
+
+
+def test_matches_linear_greedy_clustered():
+    paths = _random_paths(800, seed=2, clustered=True)
+    assert TrajectoryOptimizer().optimize_order(paths) == _greedy_reference(paths)
+
+
+def test_ties_keep_original_order():
+    # Todos los inicios en el mismo punto: el orden original debe preservarse
+    paths = [DummyPath(0j, 0j) for _ in range(10)]
+    assert TrajectoryOptimizer().optimize_order(paths) == paths
+
+
+def test_invalid_paths_are_skipped_and_progress_reported():
+    paths = [DummyPath(0j, 1 + 0j), object(), DummyPath(5 + 0j, 6 + 0j), DummyPath(1 + 0j, 2 + 0j)]
+    calls = []
+    ordered = TrajectoryOptimizer().optimize_order(paths, progress_callback=lambda c, t: calls.append((c, t)))
+    assert ordered == [paths[0], paths[3], paths[2]]
+    assert calls[-1] == (2, 3)
+
+
+def test_empty_input():
+    assert TrajectoryOptimizer().optimize_order([]) == []
+
+
+def test_spatial_grid_index_nearest_with_removals():
+    rnd = random.Random(7)
+    xs = [rnd.uniform(-50, 50) for _ in range(500)]
+    ys = [rnd.uniform(0, 10) for _ in range(500)]
+    index = SpatialGridIndex(xs, ys)
+    alive = set(range(500))
+    for _ in range(450):
+        qx, qy = rnd.uniform(-80, 80), rnd.uniform(-20, 30)
+        expected = min(alive, key=lambda i: ((xs[i] - qx) ** 2 + (ys[i] - qy) ** 2, i))
+        found = index.nearest(qx, qy)
+        assert found == expected
+        index.remove(found)
+        alive.discard(found)
+    assert len(index) == 50
+
+
+def test_reversal_flips_open_paths():
+    from svgpathtools import Path, Line
+    first = Path(Line(0j, 10 + 0j))
+    # Su final (10.5) está junto al final del primero: conviene recorrerlo al revés
+    second = Path(Line(30 + 0j, 10.5 + 0j))
+    ordered = TrajectoryOptimizer(allow_reversal=True).optimize_order([first, second])
+    assert ordered[0] is first
+    assert ordered[1].start == 10.5 + 0j
+    assert ordered[1].end == 30 + 0j
+
+
+def test_reversal_rotates_closed_paths_to_nearest_vertex():
+    from svgpathtools import Path, Line
+    first = Path(Line(0j, 20 + 0j))
+    # Contorno cerrado que empieza lejos; su vértice (21, 1) es el más cercano a (20, 0)
+    square = Path(Line(40 + 10j, 21 + 10j), Line(21 + 10j, 21 + 1j),
+                  Line(21 + 1j, 40 + 1j), Line(40 + 1j, 40 + 10j))
+    ordered = TrajectoryOptimizer(allow_reversal=True).optimize_order([first, square])
+    rotated = ordered[1]
+    assert rotated.isclosed()
+    assert rotated.start == 21 + 1j
+    assert len(rotated) == 4
+
+
+def test_reversal_of_segment_lists_keeps_list_type():
+    from tests.mocks.mock_geometry import DummySegment
+
+    class ReversibleSegment(DummySegment):
+        def reversed(self):
+            return ReversibleSegment((self.end.real, self.end.imag), (self.start.real, self.start.imag))
+
+    first = [ReversibleSegment((0, 0), (5, 0))]
+    second = [ReversibleSegment((20, 0), (12, 0)), ReversibleSegment((12, 0), (6, 0))]
+    ordered = TrajectoryOptimizer(allow_reversal=True).optimize_order([first, second])
+    assert isinstance(ordered[1], list)
+    assert ordered[1][0].start == 6 + 0j
+    assert ordered[1][-1].end == 20 + 0j
+
+
+def test_reversal_disabled_by_default():
+    from svgpathtools import Path, Line
+    first = Path(Line(0j, 10 + 0j))
+    second = Path(Line(30 + 0j, 10.5 + 0j))
+    ordered = TrajectoryOptimizer().optimize_order([first, second])
+    assert ordered[1] is second
+
+
+def test_improvement_budget_reduces_travel_and_reports_metrics():
+    paths = _random_paths(300, seed=5)
+    optimizer = TrajectoryOptimizer(improvement_budget_s=5.0)
+    ordered = optimizer.optimize_order(paths)
+    assert sorted(map(id, ordered)) == sorted(map(id, paths))
+    assert ordered[0] is paths[0]
+    travel = sum(optimizer._distance(a.end_point, b.start_point) for a, b in zip(ordered, ordered[1:]))
+    assert abs(travel - optimizer.metrics["travel_after"]) < 1e-6
+    assert optimizer.metrics["travel_after"] < optimizer.metrics["travel_before"]
@@ -0,0 +1,38 @@
+"""
+Path: tools/benchmark_path_planner.py
+Mide el tiempo de PathPlannerOptimizer.optimize sobre trazos sintéticos de distintos tamaños.
+Uso: python -m tools.benchmark_path_planner [n1 n2 ...]   (por defecto: 1000 5000 10000 20000)
+"""
+import random
+import sys
+import time
+from domain.gcode.commands.move_command import MoveCommand
+from domain.services.optimization.path_planner_optimizer import PathPlannerOptimizer
+
+
+def build_commands(n_strokes: int, seed: int = 0, points_per_stroke: int = 4):
+    " Genera n_strokes trazos aleatorios (G0 + varios G1) sobre un área A4. "
+    rnd = random.Random(seed)
+    commands = []
+    for _ in range(n_strokes):
+        x, y = rnd.uniform(0, 297), rnd.uniform(0, 210)
+        commands.append(MoveCommand(x, y, rapid=True))
+        for _ in range(points_per_stroke):
+            x += rnd.uniform(-2, 2)
+            y += rnd.uniform(-2, 2)
+            commands.append(MoveCommand(x, y, feed=1000, rapid=False))
+    return commands
+
+
+def main(sizes):
+    optimizer = PathPlannerOptimizer()
+    print(f"{'trazos':>8}  {'segundos':>9}")
+    for n in sizes:
+        commands = build_commands(n)
+        t0 = time.perf_counter()
+        optimizer.optimize(commands)
+        print(f"{n:>8}  {time.perf_counter() - t0:>9.2f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1000, 5000, 10000, 20000])
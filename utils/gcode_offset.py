@@ -18,6 +18,7 @@ def calcular_offset_y(plotter_max_area_mm, target_write_area_mm):
 def aplicar_offset_y_a_gcode_linea(linea, offset_y):
     """
     Si la línea es un comando G0 o G1 con coordenada Y, suma el offset a Y.
+    También ajusta las líneas modales del G-code compacto (sin palabra G, empiezan con X o Y).
     Args:
         linea (str): línea de G-code.
         offset_y (float): offset a sumar en Y.
@@ -25,7 +26,8 @@ def aplicar_offset_y_a_gcode_linea(linea, offset_y):
         str: línea modificada (o igual si no aplica)
     """
     import re
-    match_g0g1 = re.match(r'^(G0|G1)(.*)', linea.strip(), re.IGNORECASE)
+    # La alternativa vacía (?=[XY]) captura las líneas modales con cmd = ''
+    match_g0g1 = re.match(r'^(G0|G1|(?=[XY]))(.*)', linea.strip(), re.IGNORECASE)
     match_g2g3 = re.match(r'^(G2|G3)(.*)', linea.strip(), re.IGNORECASE)
     if match_g0g1:
         cmd, params = match_g0g1.groups()
@@ -48,10 +50,33 @@ def aplicar_offset_y_a_gcode_linea(linea, offset_y):
 def aplicar_offset_y_a_gcode(gcode_lines, offset_y):
     """
     Aplica el offset Y a una lista de líneas de G-code.
+    Las líneas dentro de un bloque G91 (desplazamientos relativos) no se modifican.
     Args:
         gcode_lines (list[str]): líneas de G-code.
         offset_y (float): offset a sumar en Y.
     Returns:
         list[str]: líneas modificadas
     """
-    return [aplicar_offset_y_a_gcode_linea(linea, offset_y) for linea in gcode_lines]
+    return list(iterar_offset_y_a_gcode(gcode_lines, offset_y))
+
+
+def iterar_offset_y_a_gcode(gcode_lines, offset_y):
+    """
+    Versión perezosa de aplicar_offset_y_a_gcode: aplica el offset Y línea a línea sobre un iterable.
+    Args:
+        gcode_lines (iterable[str]): líneas de G-code.
+        offset_y (float): offset a sumar en Y.
+    Yields:
+        str: líneas modificadas
+    """
+    relativo = False
+    for linea in gcode_lines:
+        comando = linea.strip().upper()
+        if comando.startswith('G91'):
+            # G91 suelto, o bloque G91/G90 completo en un solo elemento
+            relativo = not comando.endswith('G90')
+        elif comando.startswith('G90'):
+            relativo = False
+        elif not relativo:
+            linea = aplicar_offset_y_a_gcode_linea(linea, offset_y)
+        yield linea
@@ -0,0 +1,40 @@
+"""
+Utilidad para escribir G-code en disco de forma incremental.
+Las líneas se escriben por bloques a medida que llegan (por ejemplo, desde un generador), en un archivo
+temporal junto al destino que reemplaza al archivo final solo cuando la escritura terminó bien.
+"""
+import os
+from itertools import islice
+
+BLOQUE_LINEAS = 10000
+
+
+def escribir_gcode(ruta, gcode_lines, encoding="utf-8"):
+    """
+    Escribe las líneas de G-code separadas por '\\n' (sin salto de línea final, como "\\n".join).
+    Args:
+        ruta (str | Path): archivo de destino.
+        gcode_lines (iterable[str]): líneas de G-code; puede ser un iterador perezoso.
+        encoding (str): codificación del archivo.
+    Returns:
+        int: cantidad de líneas escritas.
+    Si el iterable lanza una excepción, se borra el archivo temporal y el destino queda intacto.
+    """
+    ruta = os.fspath(ruta)
+    temporal = ruta + ".part"
+    lineas = iter(gcode_lines)
+    total = 0
+    try:
+        with open(temporal, "w", encoding=encoding) as f:
+            while True:
+                bloque = list(islice(lineas, BLOQUE_LINEAS))
+                if not bloque:
+                    break
+                f.write(("\n" if total else "") + "\n".join(bloque))
+                total += len(bloque)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return total